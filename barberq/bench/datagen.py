@@ -0,0 +1,99 @@
+"""Synthetic BarberQ data: businesses with services, working hours and bookings.
+
+Every business works MON-SAT 09:00-13:00 and 14:00-18:00. Bookings fill
+random hour-long cells from ``history_days`` ago to the end of the booking
+horizon, so they never overlap; future ones also hold their slot locks,
+exactly as create_booking leaves them.
+"""
+import random
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+import boto3
+
+from barberq_common.booking_writes import booking_item, end_ttl, lock_slots
+from barberq_common.directory import directory_item
+from barberq_common.records import Service
+from barberq_common.schedule import Schedule
+from barberq_common.slot_reads import HORIZON_DAYS
+
+from stand_in import REGION, TABLES
+
+WEEKLY = {day: ((540, 780), (840, 1080)) for day in ("MON", "TUE", "WED", "THU", "FRI", "SAT")}
+CELL_STARTS = (540, 600, 660, 720, 840, 900, 960, 1020)
+DURATIONS = (15, 30, 45, 60)
+NAMES = ("Sharp", "Fade", "Clipper", "Razor", "Crown", "Comb", "Gentry", "Barbers", "Studio", "Corner")
+
+
+class Dataset:
+    def __init__(self):
+        self.businesses = []
+        self.services = {}
+        self.durations = {}
+        self.clients = []
+        self.names = []
+
+
+def generate(businesses: int, services: int, bookings: int, history_days: int, clients: int = 200, seed: int = 1) -> Dataset:
+    """Write the data set and return the ids the scenarios draw from.
+
+    ``bookings`` is per business, capped at the free cells in the window.
+    """
+    rng = random.Random(seed)
+    dynamodb = boto3.resource("dynamodb", region_name=REGION)
+    data = Dataset()
+    data.clients = [f"client-{i:05d}" for i in range(clients)]
+
+    today = date.today()
+    first_day = today - timedelta(days=history_days)
+    cells = [
+        (first_day + timedelta(days=i), start)
+        for i in range(history_days + HORIZON_DAYS + 1)
+        if (first_day + timedelta(days=i)).weekday() < 6
+        for start in CELL_STARTS
+    ]
+
+    with dynamodb.Table(TABLES["BARBERS_TABLE"]).batch_writer() as barbers, \
+            dynamodb.Table(TABLES["SERVICES_TABLE"]).batch_writer() as services_out, \
+            dynamodb.Table(TABLES["SCHEDULES_TABLE"]).batch_writer() as schedules, \
+            dynamodb.Table(TABLES["BUSINESS_META_TABLE"]).batch_writer() as meta, \
+            dynamodb.Table(TABLES["BOOKINGS_TABLE"]).batch_writer() as bookings_out, \
+            dynamodb.Table(TABLES["SLOT_LOCKS_TABLE"]).batch_writer() as locks_out:
+        for b in range(businesses):
+            business_id = str(uuid.UUID(int=rng.getrandbits(128)))
+            name = f"{rng.choice(NAMES)} {rng.choice(NAMES)} {b}"
+            data.businesses.append(business_id)
+            data.names.append(name)
+            barbers.put_item(Item=directory_item(business_id, name, f"owner{b}@example.com"))
+            schedules.put_item(Item=Schedule(WEEKLY, {}, 1).to_item(business_id))
+            meta.put_item(Item={"businessId": business_id, "servicesVersion": 1})
+
+            business_services = []
+            for s in range(services):
+                service = {
+                    "businessId": business_id,
+                    "serviceId": str(uuid.UUID(int=rng.getrandbits(128))),
+                    "name": f"Service {s}",
+                    "price": str(Decimal(rng.randrange(1000, 6000)) / 100),
+                    "durationMinutes": rng.choice(DURATIONS),
+                }
+                services_out.put_item(Item=service)
+                business_services.append(Service(service["serviceId"], service["name"], float(service["price"]), service["durationMinutes"]))
+                data.durations[(business_id, service["serviceId"])] = service["durationMinutes"]
+            data.services[business_id] = [s.service_id for s in business_services]
+
+            for day, start in rng.sample(cells, min(bookings, len(cells))):
+                service = rng.choice(business_services)
+                date_str = day.strftime("%Y-%m-%d")
+                booking = booking_item(business_id, rng.choice(data.clients), service, date_str, start)
+                bookings_out.put_item(Item=booking)
+                if day > today:
+                    for slot in lock_slots(date_str, start, start + service.duration):
+                        locks_out.put_item(Item={
+                            "businessId": business_id,
+                            "slot": slot,
+                            "bookingId": booking["bookingId"],
+                            "ttl": end_ttl(date_str, booking["endTime"]),
+                        })
+    return data
@@ -0,0 +1,195 @@
+"""Load-test the real handlers against the local stand-in and compare with a baseline.
+
+Generates a synthetic data set, then drives each scenario from a thread
+pool and reports p50/p95/p99 latency, throughput, DynamoDB calls per
+request and response status counts, followed by a cost report: read and
+write units per request and, for queries, items scanned versus returned,
+per table or index:
+
+    python bench/run.py --businesses 20 --services 6 --bookings 150 --requests 200 --concurrency 8
+    python bench/run.py --save main           # write bench/baselines/main.json
+    python bench/run.py --compare main        # exit 1 on a regression beyond --max-regression
+
+Needs moto and cryptography (pip install moto cryptography). Latency is
+measured against moto, whose index queries scan the whole table, so it is
+only comparable between runs on the same machine with the same data set;
+calls and read units per request are the portable numbers. moto reports no
+consumed capacity for transactions, so booking writes show 0 WCU here.
+"""
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import stand_in as local  # noqa: E402
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def run_scenario(scenario, data, stand_in, counter, args) -> dict:
+    rng = random.Random(f"{args.seed}-{scenario.name}")
+    handler = local.load_handler(scenario.handler_path).handler
+
+    # Build events up front so token signing is not timed
+    warmup = [scenario.make_event(rng, data, stand_in) for _ in range(args.warmup)]
+    events = [scenario.make_event(rng, data, stand_in) for _ in range(args.requests)]
+
+    for event in warmup:
+        handler(event, None)
+    counter.take()
+
+    def call(event):
+        started = time.perf_counter()
+        response = handler(event, None)
+        return time.perf_counter() - started, response["statusCode"]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        outcomes = list(pool.map(call, events))
+    elapsed = time.perf_counter() - started
+
+    calls, tables = counter.take()
+    latencies = sorted(seconds * 1000 for seconds, _ in outcomes)
+    return {
+        "requests": len(events),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "throughput_rps": round(len(events) / elapsed, 1),
+        "calls_per_request": {op: round(n / len(events), 3) for op, n in sorted(calls.items())},
+        "rcu_per_request": round(sum(u.rcu for u in tables.values()) / len(events), 3),
+        "wcu_per_request": round(sum(u.wcu for u in tables.values()) / len(events), 3),
+        "tables": {
+            name: {
+                "rcu_per_request": round(u.rcu / len(events), 3),
+                "wcu_per_request": round(u.wcu / len(events), 3),
+                "pages_per_request": round(u.pages / len(events), 3),
+                "scanned_per_returned": round(u.scanned / u.returned, 2) if u.returned else None,
+            }
+            for name, u in sorted(tables.items())
+        },
+        "statuses": dict(sorted(Counter(str(status) for _, status in outcomes).items())),
+    }
+
+
+def print_results(results: dict) -> None:
+    print(f"{'scenario':<24}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}  calls/request  statuses")
+    for name, r in results.items():
+        calls = ", ".join(f"{op} {n:g}" for op, n in r["calls_per_request"].items()) or "-"
+        statuses = ", ".join(f"{s}x{n}" for s, n in r["statuses"].items())
+        print(f"{name:<24}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['throughput_rps']:>9.1f}  {calls}  {statuses}")
+
+    print(f"\n{'cost per request':<24}{'RCU':>8}{'WCU':>8}  {'table or index':<48}{'RCU':>8}{'WCU':>8}{'pages':>7}{'scan/ret':>9}")
+    for name, r in results.items():
+        first = f"{name:<24}{r['rcu_per_request']:>8.2f}{r['wcu_per_request']:>8.2f}"
+        for i, (table, t) in enumerate(r["tables"].items()):
+            ratio = f"{t['scanned_per_returned']:.2f}" if t["scanned_per_returned"] is not None else "-"
+            print(f"{first if i == 0 else '':<40}  {table:<48}{t['rcu_per_request']:>8.2f}{t['wcu_per_request']:>8.2f}"
+                  f"{t['pages_per_request']:>7.2f}{ratio:>9}")
+        if not r["tables"]:
+            print(first)
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> list:
+    """Print changes against the baseline and return the regressions beyond the limit."""
+    regressions = []
+    print(f"\n{'vs baseline':<24}{'p50':>9}{'p95':>9}{'p99':>9}{'req/s':>9}  calls/request  RCU/request")
+    for name, r in results.items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<24}  (not in baseline)")
+            continue
+        changes = [change(r[k], base[k]) for k in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps")]
+        calls = sum(r["calls_per_request"].values())
+        base_calls = sum(base["calls_per_request"].values())
+        rcu, base_rcu = r.get("rcu_per_request", 0), base.get("rcu_per_request", 0)
+        print(f"{name:<24}" + "".join(f"{c:>+8.1f}%" for c in changes) + f"  {base_calls:g} -> {calls:g}  {base_rcu:g} -> {rcu:g}")
+        if changes[1] > max_regression:
+            regressions.append(f"{name}: p95 {base['p95_ms']:.2f} -> {r['p95_ms']:.2f} ms")
+        if base_calls and change(calls, base_calls) > max_regression:
+            regressions.append(f"{name}: DynamoDB calls/request {base_calls:g} -> {calls:g}")
+        if base_rcu and change(rcu, base_rcu) > max_regression:
+            regressions.append(f"{name}: RCU/request {base_rcu:g} -> {rcu:g}")
+    return regressions
+
+
+def change(value: float, base: float) -> float:
+    return (value - base) / base * 100 if base else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--businesses", type=int, default=20)
+    parser.add_argument("--services", type=int, default=6, help="services per business")
+    parser.add_argument("--bookings", type=int, default=150, help="bookings per business")
+    parser.add_argument("--history-days", type=int, default=60, help="days of past bookings")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=200, help="timed requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="untimed requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--scenario", action="append", help="run only these (repeatable)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save", metavar="NAME", help="save results as bench/baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="compare with bench/baselines/NAME.json")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="percent; fail --compare beyond this")
+    args = parser.parse_args()
+
+    stand_in = local.start()
+    counter = local.CallCounter().install()
+
+    from datagen import generate
+    from scenarios import SCENARIOS
+
+    scenarios = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+    if not scenarios:
+        parser.error(f"no such scenario; choose from {', '.join(s.name for s in SCENARIOS)}")
+
+    started = time.perf_counter()
+    data = generate(args.businesses, args.services, args.bookings, args.history_days, args.clients, args.seed)
+    print(f"generated {args.businesses} businesses in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    results = {}
+    for scenario in scenarios:
+        # Handlers log a line per request; keep the report readable
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            results[scenario.name] = run_scenario(scenario, data, stand_in, counter, args)
+    stand_in.stop()
+
+    print_results(results)
+    config = {k: v for k, v in vars(args).items() if k not in ("save", "compare", "scenario", "max_regression")}
+
+    if args.save:
+        os.makedirs(BASELINES, exist_ok=True)
+        path = os.path.join(BASELINES, f"{args.save}.json")
+        with open(path, "w") as f:
+            json.dump({"config": config, "results": results}, f, indent=2)
+        print(f"\nsaved {path}")
+
+    if args.compare:
+        with open(os.path.join(BASELINES, f"{args.compare}.json")) as f:
+            baseline = json.load(f)
+        if baseline["config"] != config:
+            print("\nwarning: baseline was recorded with different options", file=sys.stderr)
+        regressions = compare(results, baseline, args.max_regression)
+        if regressions:
+            print("\nregressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
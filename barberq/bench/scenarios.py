@@ -0,0 +1,122 @@
+"""One scenario per handler: which module to load and how to build a request.
+
+Each event builder gets a random.Random, the Dataset and the StandIn and
+returns an API Gateway proxy event, so a run is reproducible for a given seed.
+"""
+import json
+from datetime import date, timedelta
+
+from barberq_common.slot_engine import MINUTE_LABELS
+from barberq_common.slot_reads import HORIZON_DAYS
+
+from datagen import CELL_STARTS
+
+
+class Scenario:
+    def __init__(self, name: str, handler_path: str, make_event):
+        self.name = name
+        self.handler_path = handler_path
+        self.make_event = make_event
+
+
+def future_day(rng, days_ahead: int = HORIZON_DAYS) -> str:
+    return (date.today() + timedelta(days=rng.randint(1, days_ahead))).strftime("%Y-%m-%d")
+
+
+def business_and_service(rng, data):
+    business_id = rng.choice(data.businesses)
+    return business_id, rng.choice(data.services[business_id])
+
+
+def get_barbers(rng, data, stand_in):
+    params = {"limit": "20"}
+    if rng.random() < 0.5:
+        params["q"] = rng.choice(data.names)[:3].lower()
+    return {"queryStringParameters": params}
+
+
+def get_business_services(rng, data, stand_in):
+    return {"pathParameters": {"businessId": rng.choice(data.businesses)}}
+
+
+def get_barber_slots(rng, data, stand_in):
+    business_id, service_id = business_and_service(rng, data)
+    return {
+        "pathParameters": {"businessId": business_id},
+        "queryStringParameters": {"serviceId": service_id, "from": future_day(rng, HORIZON_DAYS - 7), "days": "7"},
+    }
+
+
+def get_slots_batch(rng, data, stand_in):
+    pairs = ",".join(f"{b}:{s}" for b, s in (business_and_service(rng, data) for _ in range(5)))
+    return {"queryStringParameters": {"pairs": pairs, "days": "7"}}
+
+
+def get_availability(rng, data, stand_in):
+    return {"headers": {"Authorization": stand_in.token(rng.choice(data.businesses), "BUSINESS")}}
+
+
+def list_business_bookings(rng, data, stand_in):
+    return {
+        "headers": {"Authorization": stand_in.token(rng.choice(data.businesses), "BUSINESS")},
+        "queryStringParameters": {"limit": "50"},
+    }
+
+
+def list_client_bookings(rng, data, stand_in):
+    return {
+        "headers": {"Authorization": stand_in.token(rng.choice(data.clients), "CLIENTS")},
+        "queryStringParameters": {"when": rng.choice(("upcoming", "past"))},
+    }
+
+
+def get_business_stats(rng, data, stand_in):
+    return {
+        "headers": {"Authorization": stand_in.token(rng.choice(data.businesses), "BUSINESS")},
+        "queryStringParameters": {"granularity": rng.choice(("day", "month"))},
+    }
+
+
+def create_booking(rng, data, stand_in):
+    business_id, service_id = business_and_service(rng, data)
+    start = rng.choice(CELL_STARTS)
+    # The end time must match the service's duration or the handler answers 400
+    duration = data.durations[(business_id, service_id)]
+    return {
+        "headers": {"Authorization": stand_in.token(rng.choice(data.clients), "CLIENTS")},
+        "body": json.dumps({
+            "businessId": business_id,
+            "serviceId": service_id,
+            "date": future_day(rng),
+            "startTime": MINUTE_LABELS[start],
+            "endTime": MINUTE_LABELS[start + duration],
+        }),
+    }
+
+
+def create_bookings_batch(rng, data, stand_in):
+    business_id, service_id = business_and_service(rng, data)
+    return {
+        "headers": {"Authorization": stand_in.token(rng.choice(data.clients), "CLIENTS")},
+        "body": json.dumps({
+            "businessId": business_id,
+            "serviceId": service_id,
+            "date": future_day(rng, HORIZON_DAYS - 28),
+            "startTime": MINUTE_LABELS[rng.choice(CELL_STARTS)],
+            "repeat": {"count": 4},
+        }),
+    }
+
+
+SCENARIOS = [
+    Scenario("get_barbers", "bookings/get_barbers.py", get_barbers),
+    Scenario("get_business_services", "bookings/get_business_services.py", get_business_services),
+    Scenario("get_barber_slots", "bookings/get_barber_slots.py", get_barber_slots),
+    Scenario("get_slots_batch", "bookings/get_slots_batch.py", get_slots_batch),
+    Scenario("get_availability", "availability/get_availability.py", get_availability),
+    Scenario("list_business_bookings", "bookings/list_business_bookings.py", list_business_bookings),
+    Scenario("list_client_bookings", "bookings/list_client_bookings.py", list_client_bookings),
+    Scenario("get_business_stats", "bookings/get_business_stats.py", get_business_stats),
+    Scenario("create_booking", "bookings/create_booking.py", create_booking),
+    Scenario("create_bookings_batch", "bookings/create_bookings_batch.py", create_bookings_batch),
+]
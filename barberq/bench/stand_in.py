@@ -0,0 +1,266 @@
+"""Local DynamoDB and Cognito stand-in for running the real handlers offline.
+
+start() must run before any handler module is loaded: it sets the same
+environment Terraform gives the functions, starts moto's in-memory AWS and
+creates the tables as infra/dynamodb.tf defines them. The handlers only
+verify Cognito access tokens, so Cognito is stood in for by a local RSA key:
+it signs the tokens and is installed into the handlers' verifiers in place
+of each pool's JWKS.
+"""
+import base64
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+BARBERQ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAMBDAS = os.path.join(BARBERQ, "lambdas")
+REGION = "eu-north-1"
+
+TABLES = {
+    "SERVICES_TABLE": "barberq-services",
+    "AVAILABILITY_TABLE": "barberq-availability",
+    "SCHEDULES_TABLE": "barberq-schedules",
+    "BOOKINGS_TABLE": "barberq-bookings",
+    "SLOT_CALENDAR_TABLE": "barberq-slot-calendar",
+    "SLOT_LOCKS_TABLE": "barberq-slot-locks",
+    "BARBERS_TABLE": "barberq-barbers",
+    "BUSINESS_META_TABLE": "barberq-business-meta",
+    "BUSINESS_STATS_TABLE": "barberq-business-stats",
+}
+
+# (hash key, range key, [(index, hash key, range key, projection)]), as in infra/dynamodb.tf
+KEY_SCHEMAS = {
+    "barberq-services": ("businessId", "serviceId", []),
+    "barberq-availability": ("businessId", "day", []),
+    "barberq-schedules": ("businessId", None, []),
+    "barberq-bookings": ("businessId", "bookingId", [
+        ("businessId-statusSlot-index", "businessId", "statusSlot", {
+            "ProjectionType": "INCLUDE",
+            "NonKeyAttributes": ["date", "startTime", "endTime", "status", "serviceName", "clientId"],
+        }),
+        ("clientId-slot-index", "clientId", "slot", {
+            "ProjectionType": "INCLUDE",
+            "NonKeyAttributes": ["date", "startTime", "endTime", "status", "serviceName"],
+        }),
+    ]),
+    "barberq-slot-calendar": ("businessId", "date", []),
+    "barberq-slot-locks": ("businessId", "slot", []),
+    "barberq-barbers": ("businessId", None, [
+        ("listing-nameKey-index", "listing", "nameKey", {
+            "ProjectionType": "INCLUDE",
+            "NonKeyAttributes": ["name"],
+        }),
+    ]),
+    "barberq-business-meta": ("businessId", None, []),
+    "barberq-business-stats": ("businessId", "period", []),
+}
+
+POOLS = ("CLIENTS", "BUSINESS")
+
+
+class StandIn:
+    def __init__(self, mock, private_key, pools):
+        self.mock = mock
+        self.private_key = private_key
+        self.pools = pools
+        self.kid = "bench"
+
+    def token(self, sub: str, pool: str) -> str:
+        """A Bearer header value the handlers accept for ``sub`` in ``pool``."""
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import padding
+
+        user_pool_id, client_id = self.pools[pool]
+        header = b64url(json.dumps({"alg": "RS256", "kid": self.kid}).encode())
+        payload = b64url(json.dumps({
+            "sub": sub,
+            "iss": f"https://cognito-idp.{REGION}.amazonaws.com/{user_pool_id}",
+            "token_use": "access",
+            "client_id": client_id,
+            "exp": int(time.time()) + 3600,
+        }).encode())
+        signature = self.private_key.sign(f"{header}.{payload}".encode(), padding.PKCS1v15(), hashes.SHA256())
+        return f"Bearer {header}.{payload}.{b64url(signature)}"
+
+    def stop(self):
+        self.mock.stop()
+
+
+def start() -> StandIn:
+    os.environ.update({
+        "AWS_REGION": REGION,
+        "AWS_DEFAULT_REGION": REGION,
+        "AWS_ACCESS_KEY_ID": "bench",
+        "AWS_SECRET_ACCESS_KEY": "bench",
+        "ALLOWED_ORIGIN": "http://localhost",
+        **TABLES,
+    })
+    sys.path.insert(0, os.path.join(LAMBDAS, "layer", "python"))
+
+    import boto3
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from moto import mock_aws
+
+    serialize_dynamodb()
+    snapshot_tables_cheaply()
+    mock = mock_aws()
+    mock.start()
+
+    dynamodb = boto3.client("dynamodb", region_name=REGION)
+    for name, (hash_key, range_key, indexes) in KEY_SCHEMAS.items():
+        create_table(dynamodb, name, hash_key, range_key, indexes)
+
+    pools = {}
+    for pool in POOLS:
+        user_pool_id, client_id = f"{REGION}_bench{pool.title()}", f"bench-{pool.lower()}-app"
+        os.environ[f"{pool}_USER_POOL_ID"] = user_pool_id
+        os.environ[f"{pool}_APP_CLIENT_ID"] = client_id
+        pools[pool] = (user_pool_id, client_id)
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    stand_in = StandIn(mock, private_key, pools)
+
+    from barberq_common import auth
+    numbers = private_key.public_key().public_numbers()
+    for pool in POOLS:
+        v = auth.verifier(pool)
+        v.keys = {stand_in.kid: (numbers.n, numbers.e)}
+        v.keys_fetched_at = time.time()
+    return stand_in
+
+
+def serialize_dynamodb():
+    """Let one request at a time into moto's DynamoDB backend.
+
+    Its tables are plain dicts that transactions deep-copy, so concurrent
+    writers from the load driver would corrupt them. Handler code still runs
+    in parallel; only the stand-in's own request handling is serialized.
+    """
+    from moto.dynamodb.responses import DynamoHandler
+
+    call_action = DynamoHandler.call_action
+    if getattr(call_action, "serialized", False):
+        return
+    lock = threading.Lock()
+
+    def serialized(self):
+        with lock:
+            return call_action(self)
+
+    serialized.serialized = True
+    DynamoHandler.call_action = serialized
+
+
+def snapshot_tables_cheaply():
+    """Make moto's transaction rollback snapshot O(keys) instead of a deep copy.
+
+    moto deep-copies every table a transaction touches, so a booking write
+    against a few thousand locks takes about half a second and the benchmark
+    would measure moto. Copying the item maps is enough to roll back the
+    handlers' transactions: they only Put, and a Put replaces the item object.
+    """
+    import copy
+    from moto.dynamodb import models
+    from moto.dynamodb.models.table import Table
+
+    class TableSnapshots:
+        def __getattr__(self, name):
+            return getattr(copy, name)
+
+        def deepcopy(self, obj, memo=None):
+            if not isinstance(obj, Table):
+                return copy.deepcopy(obj, memo)
+            snapshot = copy.copy(obj)
+            snapshot.items = type(obj.items)(obj.items.default_factory, {
+                key: dict(value) if isinstance(value, dict) else value
+                for key, value in obj.items.items()
+            })
+            return snapshot
+
+    models.copy = TableSnapshots()
+
+
+def create_table(dynamodb, name, hash_key, range_key, indexes):
+    key_schema = [{"AttributeName": hash_key, "KeyType": "HASH"}]
+    attributes = {hash_key}
+    if range_key:
+        key_schema.append({"AttributeName": range_key, "KeyType": "RANGE"})
+        attributes.add(range_key)
+    kwargs = {}
+    if indexes:
+        kwargs["GlobalSecondaryIndexes"] = [
+            {
+                "IndexName": index,
+                "KeySchema": [
+                    {"AttributeName": index_hash, "KeyType": "HASH"},
+                    {"AttributeName": index_range, "KeyType": "RANGE"},
+                ],
+                "Projection": projection,
+            }
+            for index, index_hash, index_range, projection in indexes
+        ]
+        for _, index_hash, index_range, _ in indexes:
+            attributes |= {index_hash, index_range}
+    dynamodb.create_table(
+        TableName=name,
+        BillingMode="PAY_PER_REQUEST",
+        KeySchema=key_schema,
+        AttributeDefinitions=[{"AttributeName": a, "AttributeType": "S"} for a in sorted(attributes)],
+        **kwargs,
+    )
+
+
+def load_handler(relative_path: str):
+    """Import a handler module from lambdas/, e.g. "bookings/get_barber_slots.py"."""
+    name = "bench_" + os.path.splitext(relative_path)[0].replace("/", "_")
+    spec = importlib.util.spec_from_file_location(name, os.path.join(LAMBDAS, relative_path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class CallCounter:
+    """Counts DynamoDB calls and their consumed capacity per table, via the handlers' botocore session.
+
+    Must be installed before the handlers build their clients, since clients
+    copy the session's event handlers when they are created.
+    """
+
+    def __init__(self):
+        self.calls = Counter()
+        self.tables = {}
+        self.lock = threading.Lock()
+
+    def install(self):
+        from barberq_common import aws
+        session = aws.session()
+        session.register("before-call.dynamodb", self._count)
+        session.register("after-call.dynamodb", self._capacity)
+        return self
+
+    def _count(self, model, **kwargs):
+        with self.lock:
+            self.calls[model.name] += 1
+
+    def _capacity(self, model, context, parsed=None, **kwargs):
+        from barberq_common import capacity
+        if not parsed:
+            return
+        with self.lock:
+            for name, usage in capacity.usage(model.name, context, parsed).items():
+                self.tables.setdefault(name, capacity.TableUsage()).add(usage)
+
+    def take(self):
+        """(calls by operation, TableUsage by table) counted since the last take()."""
+        with self.lock:
+            calls, self.calls = self.calls, Counter()
+            tables, self.tables = self.tables, {}
+        return calls, tables
+
+
+def b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
@@ -43,6 +43,9 @@ resource "aws_cognito_user_pool_client" "clients_app" {
     "ALLOW_USER_PASSWORD_AUTH",
     "ALLOW_REFRESH_TOKEN_AUTH",
   ]
+
+  # Lets the logout handlers revoke refresh tokens
+  enable_token_revocation = true
 }
 
 # --- Business user pool ---
@@ -74,6 +77,11 @@ resource "aws_cognito_user_pool" "business" {
     mutable             = true
   }
 
+  # Adds each confirmed business to the barber directory
+  lambda_config {
+    post_confirmation = aws_lambda_function.post_confirmation_business.arn
+  }
+
   schema {
     name                = "business_name"
     attribute_data_type = "String"
@@ -97,4 +105,7 @@ resource "aws_cognito_user_pool_client" "business_app" {
     "ALLOW_USER_PASSWORD_AUTH",
     "ALLOW_REFRESH_TOKEN_AUTH",
   ]
+
+  # Lets the logout handlers revoke refresh tokens
+  enable_token_revocation = true
 }
@@ -1,8 +1,10 @@
 resource "aws_dynamodb_table" "services" {
-  name         = "barberq-services"
-  billing_mode = "PAY_PER_REQUEST"
-  hash_key     = "businessId"
-  range_key    = "serviceId"
+  name             = "barberq-services"
+  billing_mode     = "PAY_PER_REQUEST"
+  hash_key         = "businessId"
+  range_key        = "serviceId"
+  stream_enabled   = true
+  stream_view_type = "KEYS_ONLY"
 
   attribute {
     name = "businessId"
@@ -15,11 +17,15 @@ resource "aws_dynamodb_table" "services" {
   }
 }
 
+# Legacy one-row-per-weekday hours, superseded by schedules.
+# Copy with tools/migrate_availability_schedules.py, then remove.
 resource "aws_dynamodb_table" "availability" {
-  name         = "barberq-availability"
-  billing_mode = "PAY_PER_REQUEST"
-  hash_key     = "businessId"
-  range_key    = "day"
+  name             = "barberq-availability"
+  billing_mode     = "PAY_PER_REQUEST"
+  hash_key         = "businessId"
+  range_key        = "day"
+  stream_enabled   = true
+  stream_view_type = "KEYS_ONLY"
 
   attribute {
     name = "businessId"
@@ -32,11 +38,84 @@ resource "aws_dynamodb_table" "availability" {
   }
 }
 
+# One item per business: weekly hours and date overrides as minute offsets, versioned
+resource "aws_dynamodb_table" "schedules" {
+  name             = "barberq-schedules"
+  billing_mode     = "PAY_PER_REQUEST"
+  hash_key         = "businessId"
+  stream_enabled   = true
+  stream_view_type = "KEYS_ONLY"
+
+  attribute {
+    name = "businessId"
+    type = "S"
+  }
+}
+
 resource "aws_dynamodb_table" "bookings" {
-  name         = "barberq-bookings"
+  name             = "barberq-bookings"
+  billing_mode     = "PAY_PER_REQUEST"
+  hash_key         = "businessId"
+  range_key        = "bookingId"
+  stream_enabled   = true
+  stream_view_type = "NEW_AND_OLD_IMAGES"
+
+  attribute {
+    name = "businessId"
+    type = "S"
+  }
+
+  attribute {
+    name = "bookingId"
+    type = "S"
+  }
+
+  attribute {
+    name = "statusSlot"
+    type = "S"
+  }
+
+  attribute {
+    name = "clientId"
+    type = "S"
+  }
+
+  attribute {
+    name = "slot"
+    type = "S"
+  }
+
+  # statusSlot = "<status>#<date>#<startTime>", so a status and date range is
+  # a key-range query that comes back in chronological order
+  global_secondary_index {
+    name               = "businessId-statusSlot-index"
+    hash_key           = "businessId"
+    range_key          = "statusSlot"
+    projection_type    = "INCLUDE"
+    non_key_attributes = ["date", "startTime", "endTime", "status", "serviceName", "clientId"]
+  }
+
+  # slot = "<date>#<startTime>": a client's bookings in time order, for their history
+  global_secondary_index {
+    name               = "clientId-slot-index"
+    hash_key           = "clientId"
+    range_key          = "slot"
+    projection_type    = "INCLUDE"
+    non_key_attributes = ["date", "startTime", "endTime", "status", "serviceName"]
+  }
+
+  ttl {
+    attribute_name = "ttl"
+    enabled        = true
+  }
+}
+
+# Precomputed free slots per business per day, maintained from the streams above
+resource "aws_dynamodb_table" "slot_calendar" {
+  name         = "barberq-slot-calendar"
   billing_mode = "PAY_PER_REQUEST"
   hash_key     = "businessId"
-  range_key    = "bookingId"
+  range_key    = "date"
 
   attribute {
     name = "businessId"
@@ -44,7 +123,100 @@ resource "aws_dynamodb_table" "bookings" {
   }
 
   attribute {
-    name = "bookingId"
+    name = "date"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "ttl"
+    enabled        = true
+  }
+}
+
+# One item per booked LOCK_BLOCK_MINUTES block; written in the same transaction as the booking.
+# Bookings made before this table existed have no locks: run tools/backfill_slot_locks.py
+# after the deploy that creates it.
+resource "aws_dynamodb_table" "slot_locks" {
+  name         = "barberq-slot-locks"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "businessId"
+  range_key    = "slot"
+
+  attribute {
+    name = "businessId"
+    type = "S"
+  }
+
+  attribute {
+    name = "slot"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "ttl"
+    enabled        = true
+  }
+}
+
+# Public barber directory, filled by the business pool's post-confirmation trigger
+resource "aws_dynamodb_table" "barbers" {
+  name         = "barberq-barbers"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "businessId"
+
+  attribute {
+    name = "businessId"
+    type = "S"
+  }
+
+  attribute {
+    name = "listing"
+    type = "S"
+  }
+
+  attribute {
+    name = "nameKey"
+    type = "S"
+  }
+
+  # Ordered, prefix-searchable listing by lower-cased business name
+  global_secondary_index {
+    name               = "listing-nameKey-index"
+    hash_key           = "listing"
+    range_key          = "nameKey"
+    projection_type    = "INCLUDE"
+    non_key_attributes = ["name"]
+  }
+}
+
+# Per-business data version counters; bumped on writes, checked by warm read caches
+resource "aws_dynamodb_table" "business_meta" {
+  name         = "barberq-business-meta"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "businessId"
+
+  attribute {
+    name = "businessId"
+    type = "S"
+  }
+}
+
+# Booking counters per business and day ("D#<date>") or month ("M#<yyyy-mm>"),
+# kept by aggregate_booking_stats from the bookings stream. Its "E#<eventID>"
+# markers of applied stream records expire through the ttl attribute.
+resource "aws_dynamodb_table" "business_stats" {
+  name         = "barberq-business-stats"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "businessId"
+  range_key    = "period"
+
+  attribute {
+    name = "businessId"
+    type = "S"
+  }
+
+  attribute {
+    name = "period"
     type = "S"
   }
 
@@ -28,16 +28,11 @@ resource "aws_iam_role_policy" "lambda_cognito" {
     Statement = [
       {
         Effect = "Allow"
-        Action = ["cognito-idp:SignUp", "cognito-idp:InitiateAuth"]
+        Action = ["cognito-idp:SignUp", "cognito-idp:InitiateAuth", "cognito-idp:RevokeToken"]
         Resource = [
           aws_cognito_user_pool.clients.arn,
           aws_cognito_user_pool.business.arn,
         ]
-      },
-      {
-        Effect   = "Allow"
-        Action   = ["cognito-idp:ListUsers"]
-        Resource = [aws_cognito_user_pool.business.arn]
       }
     ]
   })
@@ -52,16 +47,121 @@ resource "aws_iam_role_policy" "lambda_dynamodb" {
     Version = "2012-10-17"
     Statement = [{
       Effect   = "Allow"
-      Action   = ["dynamodb:PutItem", "dynamodb:Query", "dynamodb:GetItem"]
+      Action   = ["dynamodb:PutItem", "dynamodb:Query", "dynamodb:GetItem", "dynamodb:UpdateItem", "dynamodb:BatchWriteItem", "dynamodb:BatchGetItem"]
       Resource = [
         aws_dynamodb_table.services.arn,
-        aws_dynamodb_table.availability.arn,
+        aws_dynamodb_table.schedules.arn,
         aws_dynamodb_table.bookings.arn,
+        "${aws_dynamodb_table.bookings.arn}/index/*",
+        aws_dynamodb_table.slot_calendar.arn,
+        aws_dynamodb_table.slot_locks.arn,
+        aws_dynamodb_table.barbers.arn,
+        "${aws_dynamodb_table.barbers.arn}/index/*",
+        aws_dynamodb_table.business_meta.arn,
+        aws_dynamodb_table.business_stats.arn,
+      ]
+    }]
+  })
+}
+
+# Allow the slot materializer to read table streams
+resource "aws_iam_role_policy" "lambda_dynamodb_streams" {
+  name = "barberq-lambda-dynamodb-streams-policy"
+  role = aws_iam_role.lambda_auth.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [{
+      Effect = "Allow"
+      Action = [
+        "dynamodb:DescribeStream",
+        "dynamodb:GetRecords",
+        "dynamodb:GetShardIterator",
+        "dynamodb:ListStreams",
+      ]
+      Resource = [
+        aws_dynamodb_table.services.stream_arn,
+        aws_dynamodb_table.schedules.stream_arn,
+        aws_dynamodb_table.bookings.stream_arn,
       ]
     }]
   })
 }
 
+# Stream records that still fail after their retries are described on this queue
+resource "aws_sqs_queue" "stream_failures" {
+  name                      = "barberq-stream-failures"
+  message_retention_seconds = 1209600
+}
+
+resource "aws_iam_role_policy" "lambda_stream_failures" {
+  name = "barberq-lambda-stream-failures-policy"
+  role = aws_iam_role.lambda_auth.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [{
+      Effect   = "Allow"
+      Action   = ["sqs:SendMessage"]
+      Resource = aws_sqs_queue.stream_failures.arn
+    }]
+  })
+}
+
+# --- Shared code layer ---
+
+locals {
+  # Wraps the real handler and logs per-module import times on cold start
+  coldstart_handler = "barberq_common.coldstart.handler"
+
+  layers = [aws_lambda_layer_version.barberq_common.arn, aws_lambda_layer_version.deps.arn]
+}
+
+data "archive_file" "barberq_common_layer" {
+  type        = "zip"
+  source_dir  = "${path.module}/../lambdas/layer"
+  output_path = "${path.module}/../lambdas/barberq_common_layer.zip"
+  excludes    = ["**/__pycache__/**"]
+}
+
+resource "aws_lambda_layer_version" "barberq_common" {
+  layer_name          = "barberq-common"
+  filename            = data.archive_file.barberq_common_layer.output_path
+  source_code_hash    = data.archive_file.barberq_common_layer.output_base64sha256
+  compatible_runtimes = ["python3.12"]
+}
+
+# --- Third-party packages layer ---
+
+# archive_file cannot run pip, so lambdas/deps/requirements.txt is installed for
+# the Lambda platform (python3.12, x86_64) by this step whenever it changes. On a
+# checkout without lambdas/deps/build, run: terraform apply -replace=terraform_data.layer_deps
+resource "terraform_data" "layer_deps" {
+  triggers_replace = filesha256("${path.module}/../lambdas/deps/requirements.txt")
+
+  provisioner "local-exec" {
+    working_dir = "${path.module}/../lambdas/deps"
+    command     = "rm -rf build && python3 -m pip install -r requirements.txt --target build/python --platform manylinux2014_x86_64 --implementation cp --python-version 3.12 --only-binary=:all:"
+  }
+}
+
+data "archive_file" "layer_deps" {
+  type        = "zip"
+  source_dir  = "${path.module}/../lambdas/deps/build"
+  output_path = "${path.module}/../lambdas/deps_layer.zip"
+  excludes    = ["**/__pycache__/**"]
+
+  depends_on = [terraform_data.layer_deps]
+}
+
+resource "aws_lambda_layer_version" "deps" {
+  layer_name               = "barberq-deps"
+  filename                 = data.archive_file.layer_deps.output_path
+  source_code_hash         = data.archive_file.layer_deps.output_base64sha256
+  compatible_runtimes      = ["python3.12"]
+  compatible_architectures = ["x86_64"]
+}
+
 # --- Add service Lambda ---
 
 data "archive_file" "add_service" {
@@ -71,17 +171,25 @@ data "archive_file" "add_service" {
 }
 
 resource "aws_lambda_function" "add_service" {
+  count = var.deployment_mode == "functions" ? 1 : 0
+
   function_name    = "barberq-add-service"
   role             = aws_iam_role.lambda_auth.arn
   runtime          = "python3.12"
-  handler          = "add_service.handler"
+  handler          = var.coldstart_profiling ? local.coldstart_handler : "add_service.handler"
   filename         = data.archive_file.add_service.output_path
   source_code_hash = data.archive_file.add_service.output_base64sha256
+  layers           = local.layers
 
   environment {
     variables = {
-      SERVICES_TABLE = aws_dynamodb_table.services.name
-      ALLOWED_ORIGIN = var.allowed_origin
+      SERVICES_TABLE         = aws_dynamodb_table.services.name
+      BUSINESS_META_TABLE    = aws_dynamodb_table.business_meta.name
+      BUSINESS_USER_POOL_ID  = aws_cognito_user_pool.business.id
+      BUSINESS_APP_CLIENT_ID = aws_cognito_user_pool_client.business_app.id
+      METRICS_SAMPLE_RATE    = var.metrics_sample_rate
+      ALLOWED_ORIGIN         = var.allowed_origin
+      ROUTE_PREFIX           = var.route_prefix
     }
   }
 }
@@ -95,17 +203,24 @@ data "archive_file" "list_services" {
 }
 
 resource "aws_lambda_function" "list_services" {
+  count = var.deployment_mode == "functions" ? 1 : 0
+
   function_name    = "barberq-list-services"
   role             = aws_iam_role.lambda_auth.arn
   runtime          = "python3.12"
-  handler          = "list_services.handler"
+  handler          = var.coldstart_profiling ? local.coldstart_handler : "list_services.handler"
   filename         = data.archive_file.list_services.output_path
   source_code_hash = data.archive_file.list_services.output_base64sha256
+  layers           = local.layers
 
   environment {
     variables = {
-      SERVICES_TABLE = aws_dynamodb_table.services.name
-      ALLOWED_ORIGIN = var.allowed_origin
+      SERVICES_TABLE         = aws_dynamodb_table.services.name
+      BUSINESS_USER_POOL_ID  = aws_cognito_user_pool.business.id
+      BUSINESS_APP_CLIENT_ID = aws_cognito_user_pool_client.business_app.id
+      METRICS_SAMPLE_RATE    = var.metrics_sample_rate
+      ALLOWED_ORIGIN         = var.allowed_origin
+      ROUTE_PREFIX           = var.route_prefix
     }
   }
 }
@@ -119,17 +234,24 @@ data "archive_file" "get_availability" {
 }
 
 resource "aws_lambda_function" "get_availability" {
+  count = var.deployment_mode == "functions" ? 1 : 0
+
   function_name    = "barberq-get-availability"
   role             = aws_iam_role.lambda_auth.arn
   runtime          = "python3.12"
-  handler          = "get_availability.handler"
+  handler          = var.coldstart_profiling ? local.coldstart_handler : "get_availability.handler"
   filename         = data.archive_file.get_availability.output_path
   source_code_hash = data.archive_file.get_availability.output_base64sha256
+  layers           = local.layers
 
   environment {
     variables = {
-      AVAILABILITY_TABLE = aws_dynamodb_table.availability.name
-      ALLOWED_ORIGIN     = var.allowed_origin
+      SCHEDULES_TABLE        = aws_dynamodb_table.schedules.name
+      BUSINESS_USER_POOL_ID  = aws_cognito_user_pool.business.id
+      BUSINESS_APP_CLIENT_ID = aws_cognito_user_pool_client.business_app.id
+      METRICS_SAMPLE_RATE    = var.metrics_sample_rate
+      ALLOWED_ORIGIN         = var.allowed_origin
+      ROUTE_PREFIX           = var.route_prefix
     }
   }
 }
@@ -143,17 +265,24 @@ data "archive_file" "set_availability" {
 }
 
 resource "aws_lambda_function" "set_availability" {
+  count = var.deployment_mode == "functions" ? 1 : 0
+
   function_name    = "barberq-set-availability"
   role             = aws_iam_role.lambda_auth.arn
   runtime          = "python3.12"
-  handler          = "set_availability.handler"
+  handler          = var.coldstart_profiling ? local.coldstart_handler : "set_availability.handler"
   filename         = data.archive_file.set_availability.output_path
   source_code_hash = data.archive_file.set_availability.output_base64sha256
+  layers           = local.layers
 
   environment {
     variables = {
-      AVAILABILITY_TABLE = aws_dynamodb_table.availability.name
-      ALLOWED_ORIGIN     = var.allowed_origin
+      SCHEDULES_TABLE        = aws_dynamodb_table.schedules.name
+      BUSINESS_USER_POOL_ID  = aws_cognito_user_pool.business.id
+      BUSINESS_APP_CLIENT_ID = aws_cognito_user_pool_client.business_app.id
+      METRICS_SAMPLE_RATE    = var.metrics_sample_rate
+      ALLOWED_ORIGIN         = var.allowed_origin
+      ROUTE_PREFIX           = var.route_prefix
     }
   }
 }
@@ -168,16 +297,21 @@ data "archive_file" "register_client" {
 }
 
 resource "aws_lambda_function" "register_client" {
+  count = var.deployment_mode == "functions" ? 1 : 0
+
   function_name    = "barberq-register-client"
   role             = aws_iam_role.lambda_auth.arn
   runtime          = "python3.12"
-  handler          = "register_client.handler"
+  handler          = var.coldstart_profiling ? local.coldstart_handler : "register_client.handler"
   filename         = data.archive_file.register_client.output_path
   source_code_hash = data.archive_file.register_client.output_base64sha256
+  layers           = local.layers
 
   environment {
     variables = {
-      APP_CLIENT_ID = aws_cognito_user_pool_client.clients_app.id
+      CLIENTS_APP_CLIENT_ID = aws_cognito_user_pool_client.clients_app.id
+      METRICS_SAMPLE_RATE   = var.metrics_sample_rate
+      ALLOWED_ORIGIN        = var.allowed_origin
     }
   }
 }
@@ -191,16 +325,22 @@ data "archive_file" "register_business" {
 }
 
 resource "aws_lambda_function" "register_business" {
+  count = var.deployment_mode == "functions" ? 1 : 0
+
   function_name    = "barberq-register-business"
   role             = aws_iam_role.lambda_auth.arn
   runtime          = "python3.12"
-  handler          = "register_business.handler"
+  handler          = var.coldstart_profiling ? local.coldstart_handler : "register_business.handler"
   filename         = data.archive_file.register_business.output_path
   source_code_hash = data.archive_file.register_business.output_base64sha256
+  layers           = local.layers
 
   environment {
     variables = {
-      APP_CLIENT_ID = aws_cognito_user_pool_client.business_app.id
+      BUSINESS_APP_CLIENT_ID = aws_cognito_user_pool_client.business_app.id
+      METRICS_SAMPLE_RATE    = var.metrics_sample_rate
+      ALLOWED_ORIGIN         = var.allowed_origin
+      ROUTE_PREFIX           = var.route_prefix
     }
   }
 }
@@ -214,17 +354,22 @@ data "archive_file" "login_business" {
 }
 
 resource "aws_lambda_function" "login_business" {
+  count = var.deployment_mode == "functions" ? 1 : 0
+
   function_name    = "barberq-login-business"
   role             = aws_iam_role.lambda_auth.arn
   runtime          = "python3.12"
-  handler          = "login_business.handler"
+  handler          = var.coldstart_profiling ? local.coldstart_handler : "login_business.handler"
   filename         = data.archive_file.login_business.output_path
   source_code_hash = data.archive_file.login_business.output_base64sha256
+  layers           = local.layers
 
   environment {
     variables = {
-      APP_CLIENT_ID  = aws_cognito_user_pool_client.business_app.id
-      ALLOWED_ORIGIN = var.allowed_origin
+      BUSINESS_APP_CLIENT_ID = aws_cognito_user_pool_client.business_app.id
+      METRICS_SAMPLE_RATE    = var.metrics_sample_rate
+      ALLOWED_ORIGIN         = var.allowed_origin
+      ROUTE_PREFIX           = var.route_prefix
     }
   }
 }
@@ -238,17 +383,135 @@ data "archive_file" "login_client" {
 }
 
 resource "aws_lambda_function" "login_client" {
+  count = var.deployment_mode == "functions" ? 1 : 0
+
   function_name    = "barberq-login-client"
   role             = aws_iam_role.lambda_auth.arn
   runtime          = "python3.12"
-  handler          = "login_client.handler"
+  handler          = var.coldstart_profiling ? local.coldstart_handler : "login_client.handler"
   filename         = data.archive_file.login_client.output_path
   source_code_hash = data.archive_file.login_client.output_base64sha256
+  layers           = local.layers
+
+  environment {
+    variables = {
+      CLIENTS_APP_CLIENT_ID = aws_cognito_user_pool_client.clients_app.id
+      METRICS_SAMPLE_RATE   = var.metrics_sample_rate
+      ALLOWED_ORIGIN        = var.allowed_origin
+    }
+  }
+}
+
+# --- Business token refresh Lambda ---
+
+data "archive_file" "refresh_business" {
+  type        = "zip"
+  source_file = "${path.module}/../lambdas/auth/refresh_business.py"
+  output_path = "${path.module}/../lambdas/auth/refresh_business.zip"
+}
+
+resource "aws_lambda_function" "refresh_business" {
+  count = var.deployment_mode == "functions" ? 1 : 0
+
+  function_name    = "barberq-refresh-business"
+  role             = aws_iam_role.lambda_auth.arn
+  runtime          = "python3.12"
+  handler          = var.coldstart_profiling ? local.coldstart_handler : "refresh_business.handler"
+  filename         = data.archive_file.refresh_business.output_path
+  source_code_hash = data.archive_file.refresh_business.output_base64sha256
+  layers           = local.layers
+
+  environment {
+    variables = {
+      BUSINESS_APP_CLIENT_ID = aws_cognito_user_pool_client.business_app.id
+      METRICS_SAMPLE_RATE    = var.metrics_sample_rate
+      ALLOWED_ORIGIN         = var.allowed_origin
+      ROUTE_PREFIX           = var.route_prefix
+    }
+  }
+}
+
+# --- Business logout Lambda ---
+
+data "archive_file" "logout_business" {
+  type        = "zip"
+  source_file = "${path.module}/../lambdas/auth/logout_business.py"
+  output_path = "${path.module}/../lambdas/auth/logout_business.zip"
+}
+
+resource "aws_lambda_function" "logout_business" {
+  count = var.deployment_mode == "functions" ? 1 : 0
+
+  function_name    = "barberq-logout-business"
+  role             = aws_iam_role.lambda_auth.arn
+  runtime          = "python3.12"
+  handler          = var.coldstart_profiling ? local.coldstart_handler : "logout_business.handler"
+  filename         = data.archive_file.logout_business.output_path
+  source_code_hash = data.archive_file.logout_business.output_base64sha256
+  layers           = local.layers
+
+  environment {
+    variables = {
+      BUSINESS_APP_CLIENT_ID = aws_cognito_user_pool_client.business_app.id
+      METRICS_SAMPLE_RATE    = var.metrics_sample_rate
+      ALLOWED_ORIGIN         = var.allowed_origin
+      ROUTE_PREFIX           = var.route_prefix
+    }
+  }
+}
+
+# --- Client token refresh Lambda ---
+
+data "archive_file" "refresh_client" {
+  type        = "zip"
+  source_file = "${path.module}/../lambdas/auth/refresh_client.py"
+  output_path = "${path.module}/../lambdas/auth/refresh_client.zip"
+}
+
+resource "aws_lambda_function" "refresh_client" {
+  count = var.deployment_mode == "functions" ? 1 : 0
+
+  function_name    = "barberq-refresh-client"
+  role             = aws_iam_role.lambda_auth.arn
+  runtime          = "python3.12"
+  handler          = var.coldstart_profiling ? local.coldstart_handler : "refresh_client.handler"
+  filename         = data.archive_file.refresh_client.output_path
+  source_code_hash = data.archive_file.refresh_client.output_base64sha256
+  layers           = local.layers
+
+  environment {
+    variables = {
+      CLIENTS_APP_CLIENT_ID = aws_cognito_user_pool_client.clients_app.id
+      METRICS_SAMPLE_RATE   = var.metrics_sample_rate
+      ALLOWED_ORIGIN        = var.allowed_origin
+    }
+  }
+}
+
+# --- Client logout Lambda ---
+
+data "archive_file" "logout_client" {
+  type        = "zip"
+  source_file = "${path.module}/../lambdas/auth/logout_client.py"
+  output_path = "${path.module}/../lambdas/auth/logout_client.zip"
+}
+
+resource "aws_lambda_function" "logout_client" {
+  count = var.deployment_mode == "functions" ? 1 : 0
+
+  function_name    = "barberq-logout-client"
+  role             = aws_iam_role.lambda_auth.arn
+  runtime          = "python3.12"
+  handler          = var.coldstart_profiling ? local.coldstart_handler : "logout_client.handler"
+  filename         = data.archive_file.logout_client.output_path
+  source_code_hash = data.archive_file.logout_client.output_base64sha256
+  layers           = local.layers
 
   environment {
     variables = {
-      APP_CLIENT_ID  = aws_cognito_user_pool_client.clients_app.id
-      ALLOWED_ORIGIN = var.allowed_origin
+      CLIENTS_APP_CLIENT_ID = aws_cognito_user_pool_client.clients_app.id
+      METRICS_SAMPLE_RATE   = var.metrics_sample_rate
+      ALLOWED_ORIGIN        = var.allowed_origin
     }
   }
 }
@@ -262,21 +525,57 @@ data "archive_file" "get_barbers" {
 }
 
 resource "aws_lambda_function" "get_barbers" {
+  count = var.deployment_mode == "functions" ? 1 : 0
+
   function_name    = "barberq-get-barbers"
   role             = aws_iam_role.lambda_auth.arn
   runtime          = "python3.12"
-  handler          = "get_barbers.handler"
+  handler          = var.coldstart_profiling ? local.coldstart_handler : "get_barbers.handler"
   filename         = data.archive_file.get_barbers.output_path
   source_code_hash = data.archive_file.get_barbers.output_base64sha256
+  layers           = local.layers
+
+  environment {
+    variables = {
+      BARBERS_TABLE       = aws_dynamodb_table.barbers.name
+      METRICS_SAMPLE_RATE = var.metrics_sample_rate
+      ALLOWED_ORIGIN      = var.allowed_origin
+    }
+  }
+}
+
+# --- Business post-confirmation trigger Lambda ---
+
+data "archive_file" "post_confirmation_business" {
+  type        = "zip"
+  source_file = "${path.module}/../lambdas/auth/post_confirmation_business.py"
+  output_path = "${path.module}/../lambdas/auth/post_confirmation_business.zip"
+}
+
+resource "aws_lambda_function" "post_confirmation_business" {
+  function_name    = "barberq-post-confirmation-business"
+  role             = aws_iam_role.lambda_auth.arn
+  runtime          = "python3.12"
+  handler          = var.coldstart_profiling ? local.coldstart_handler : "post_confirmation_business.handler"
+  filename         = data.archive_file.post_confirmation_business.output_path
+  source_code_hash = data.archive_file.post_confirmation_business.output_base64sha256
+  layers           = local.layers
 
   environment {
     variables = {
-      BUSINESS_POOL_ID = aws_cognito_user_pool.business.id
-      ALLOWED_ORIGIN   = var.allowed_origin
+      BARBERS_TABLE = aws_dynamodb_table.barbers.name
     }
   }
 }
 
+resource "aws_lambda_permission" "post_confirmation_business" {
+  statement_id  = "AllowCognitoInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.post_confirmation_business.function_name
+  principal     = "cognito-idp.amazonaws.com"
+  source_arn    = aws_cognito_user_pool.business.arn
+}
+
 # --- Get business services Lambda ---
 
 data "archive_file" "get_business_services" {
@@ -286,17 +585,22 @@ data "archive_file" "get_business_services" {
 }
 
 resource "aws_lambda_function" "get_business_services" {
+  count = var.deployment_mode == "functions" ? 1 : 0
+
   function_name    = "barberq-get-business-services"
   role             = aws_iam_role.lambda_auth.arn
   runtime          = "python3.12"
-  handler          = "get_business_services.handler"
+  handler          = var.coldstart_profiling ? local.coldstart_handler : "get_business_services.handler"
   filename         = data.archive_file.get_business_services.output_path
   source_code_hash = data.archive_file.get_business_services.output_base64sha256
+  layers           = local.layers
 
   environment {
     variables = {
-      SERVICES_TABLE = aws_dynamodb_table.services.name
-      ALLOWED_ORIGIN = var.allowed_origin
+      SERVICES_TABLE      = aws_dynamodb_table.services.name
+      BUSINESS_META_TABLE = aws_dynamodb_table.business_meta.name
+      METRICS_SAMPLE_RATE = var.metrics_sample_rate
+      ALLOWED_ORIGIN      = var.allowed_origin
     }
   }
 }
@@ -310,19 +614,175 @@ data "archive_file" "get_barber_slots" {
 }
 
 resource "aws_lambda_function" "get_barber_slots" {
+  count = var.deployment_mode == "functions" ? 1 : 0
+
   function_name    = "barberq-get-barber-slots"
   role             = aws_iam_role.lambda_auth.arn
   runtime          = "python3.12"
-  handler          = "get_barber_slots.handler"
+  handler          = var.coldstart_profiling ? local.coldstart_handler : "get_barber_slots.handler"
   filename         = data.archive_file.get_barber_slots.output_path
   source_code_hash = data.archive_file.get_barber_slots.output_base64sha256
+  layers           = local.layers
+
+  environment {
+    variables = {
+      SERVICES_TABLE      = aws_dynamodb_table.services.name
+      SCHEDULES_TABLE     = aws_dynamodb_table.schedules.name
+      BOOKINGS_TABLE      = aws_dynamodb_table.bookings.name
+      SLOT_CALENDAR_TABLE = aws_dynamodb_table.slot_calendar.name
+      BUSINESS_META_TABLE = aws_dynamodb_table.business_meta.name
+      METRICS_SAMPLE_RATE = var.metrics_sample_rate
+      ALLOWED_ORIGIN      = var.allowed_origin
+    }
+  }
+}
+
+# --- Batch slots Lambda ---
+
+data "archive_file" "get_slots_batch" {
+  type        = "zip"
+  source_file = "${path.module}/../lambdas/bookings/get_slots_batch.py"
+  output_path = "${path.module}/../lambdas/bookings/get_slots_batch.zip"
+}
+
+resource "aws_lambda_function" "get_slots_batch" {
+  count = var.deployment_mode == "functions" ? 1 : 0
+
+  function_name    = "barberq-get-slots-batch"
+  role             = aws_iam_role.lambda_auth.arn
+  runtime          = "python3.12"
+  handler          = var.coldstart_profiling ? local.coldstart_handler : "get_slots_batch.handler"
+  filename         = data.archive_file.get_slots_batch.output_path
+  source_code_hash = data.archive_file.get_slots_batch.output_base64sha256
+  layers           = local.layers
+
+  environment {
+    variables = {
+      SERVICES_TABLE      = aws_dynamodb_table.services.name
+      SCHEDULES_TABLE     = aws_dynamodb_table.schedules.name
+      BOOKINGS_TABLE      = aws_dynamodb_table.bookings.name
+      METRICS_SAMPLE_RATE = var.metrics_sample_rate
+      ALLOWED_ORIGIN      = var.allowed_origin
+    }
+  }
+}
+
+# --- Slot calendar materializer Lambda ---
+
+data "archive_file" "materialize_slots" {
+  type        = "zip"
+  source_file = "${path.module}/../lambdas/bookings/materialize_slots.py"
+  output_path = "${path.module}/../lambdas/bookings/materialize_slots.zip"
+}
+
+resource "aws_lambda_function" "materialize_slots" {
+  function_name    = "barberq-materialize-slots"
+  role             = aws_iam_role.lambda_auth.arn
+  runtime          = "python3.12"
+  handler          = var.coldstart_profiling ? local.coldstart_handler : "materialize_slots.handler"
+  filename         = data.archive_file.materialize_slots.output_path
+  source_code_hash = data.archive_file.materialize_slots.output_base64sha256
+  layers           = local.layers
+  timeout          = 60
+
+  environment {
+    variables = {
+      SERVICES_TABLE      = aws_dynamodb_table.services.name
+      SCHEDULES_TABLE     = aws_dynamodb_table.schedules.name
+      BOOKINGS_TABLE      = aws_dynamodb_table.bookings.name
+      SLOT_CALENDAR_TABLE = aws_dynamodb_table.slot_calendar.name
+    }
+  }
+}
+
+resource "aws_lambda_event_source_mapping" "materialize_slots_bookings" {
+  event_source_arn                   = aws_dynamodb_table.bookings.stream_arn
+  function_name                      = aws_lambda_function.materialize_slots.arn
+  starting_position                  = "LATEST"
+  batch_size                         = 100
+  maximum_batching_window_in_seconds = 1
+
+  # A failing batch is halved until the bad record is alone; after the retries
+  # its position goes to the queue and the shard moves on instead of blocking
+  bisect_batch_on_function_error = true
+  maximum_retry_attempts         = 5
+
+  destination_config {
+    on_failure {
+      destination_arn = aws_sqs_queue.stream_failures.arn
+    }
+  }
+}
+
+resource "aws_lambda_event_source_mapping" "materialize_slots_schedules" {
+  event_source_arn  = aws_dynamodb_table.schedules.stream_arn
+  function_name     = aws_lambda_function.materialize_slots.arn
+  starting_position = "LATEST"
+
+  bisect_batch_on_function_error = true
+  maximum_retry_attempts         = 5
+
+  destination_config {
+    on_failure {
+      destination_arn = aws_sqs_queue.stream_failures.arn
+    }
+  }
+}
+
+resource "aws_lambda_event_source_mapping" "materialize_slots_services" {
+  event_source_arn  = aws_dynamodb_table.services.stream_arn
+  function_name     = aws_lambda_function.materialize_slots.arn
+  starting_position = "LATEST"
+
+  bisect_batch_on_function_error = true
+  maximum_retry_attempts         = 5
+
+  destination_config {
+    on_failure {
+      destination_arn = aws_sqs_queue.stream_failures.arn
+    }
+  }
+}
+
+# --- Booking stats aggregator Lambda ---
+
+data "archive_file" "aggregate_booking_stats" {
+  type        = "zip"
+  source_file = "${path.module}/../lambdas/bookings/aggregate_booking_stats.py"
+  output_path = "${path.module}/../lambdas/bookings/aggregate_booking_stats.zip"
+}
+
+resource "aws_lambda_function" "aggregate_booking_stats" {
+  function_name    = "barberq-aggregate-booking-stats"
+  role             = aws_iam_role.lambda_auth.arn
+  runtime          = "python3.12"
+  handler          = var.coldstart_profiling ? local.coldstart_handler : "aggregate_booking_stats.handler"
+  filename         = data.archive_file.aggregate_booking_stats.output_path
+  source_code_hash = data.archive_file.aggregate_booking_stats.output_base64sha256
+  layers           = local.layers
+  timeout          = 30
 
   environment {
     variables = {
-      SERVICES_TABLE     = aws_dynamodb_table.services.name
-      AVAILABILITY_TABLE = aws_dynamodb_table.availability.name
-      BOOKINGS_TABLE     = aws_dynamodb_table.bookings.name
-      ALLOWED_ORIGIN     = var.allowed_origin
+      BUSINESS_STATS_TABLE = aws_dynamodb_table.business_stats.name
+    }
+  }
+}
+
+# The second (and last advisable) reader of the bookings stream, after materialize_slots
+resource "aws_lambda_event_source_mapping" "aggregate_booking_stats" {
+  event_source_arn                   = aws_dynamodb_table.bookings.stream_arn
+  function_name                      = aws_lambda_function.aggregate_booking_stats.arn
+  starting_position                  = "LATEST"
+  batch_size                         = 100
+  maximum_batching_window_in_seconds = 5
+
+  bisect_batch_on_function_error = true
+  maximum_retry_attempts         = 5
+
+  destination_config {
+    on_failure {
+      destination_arn = aws_sqs_queue.stream_failures.arn
     }
   }
 }
@@ -336,18 +796,61 @@ data "archive_file" "create_booking" {
 }
 
 resource "aws_lambda_function" "create_booking" {
+  count = var.deployment_mode == "functions" ? 1 : 0
+
   function_name    = "barberq-create-booking"
   role             = aws_iam_role.lambda_auth.arn
   runtime          = "python3.12"
-  handler          = "create_booking.handler"
+  handler          = var.coldstart_profiling ? local.coldstart_handler : "create_booking.handler"
   filename         = data.archive_file.create_booking.output_path
   source_code_hash = data.archive_file.create_booking.output_base64sha256
+  layers           = local.layers
 
   environment {
     variables = {
-      SERVICES_TABLE = aws_dynamodb_table.services.name
-      BOOKINGS_TABLE = aws_dynamodb_table.bookings.name
-      ALLOWED_ORIGIN = var.allowed_origin
+      SERVICES_TABLE        = aws_dynamodb_table.services.name
+      BOOKINGS_TABLE        = aws_dynamodb_table.bookings.name
+      SLOT_LOCKS_TABLE      = aws_dynamodb_table.slot_locks.name
+      BUSINESS_META_TABLE   = aws_dynamodb_table.business_meta.name
+      CLIENTS_USER_POOL_ID  = aws_cognito_user_pool.clients.id
+      CLIENTS_APP_CLIENT_ID = aws_cognito_user_pool_client.clients_app.id
+      METRICS_SAMPLE_RATE   = var.metrics_sample_rate
+      ALLOWED_ORIGIN        = var.allowed_origin
+    }
+  }
+}
+
+# --- Batch/recurring bookings Lambda ---
+
+data "archive_file" "create_bookings_batch" {
+  type        = "zip"
+  source_file = "${path.module}/../lambdas/bookings/create_bookings_batch.py"
+  output_path = "${path.module}/../lambdas/bookings/create_bookings_batch.zip"
+}
+
+resource "aws_lambda_function" "create_bookings_batch" {
+  count = var.deployment_mode == "functions" ? 1 : 0
+
+  function_name    = "barberq-create-bookings-batch"
+  role             = aws_iam_role.lambda_auth.arn
+  runtime          = "python3.12"
+  handler          = var.coldstart_profiling ? local.coldstart_handler : "create_bookings_batch.handler"
+  filename         = data.archive_file.create_bookings_batch.output_path
+  source_code_hash = data.archive_file.create_bookings_batch.output_base64sha256
+  layers           = local.layers
+  timeout          = 10
+
+  environment {
+    variables = {
+      SERVICES_TABLE        = aws_dynamodb_table.services.name
+      SCHEDULES_TABLE       = aws_dynamodb_table.schedules.name
+      BOOKINGS_TABLE        = aws_dynamodb_table.bookings.name
+      SLOT_LOCKS_TABLE      = aws_dynamodb_table.slot_locks.name
+      BUSINESS_META_TABLE   = aws_dynamodb_table.business_meta.name
+      CLIENTS_USER_POOL_ID  = aws_cognito_user_pool.clients.id
+      CLIENTS_APP_CLIENT_ID = aws_cognito_user_pool_client.clients_app.id
+      METRICS_SAMPLE_RATE   = var.metrics_sample_rate
+      ALLOWED_ORIGIN        = var.allowed_origin
     }
   }
 }
@@ -361,17 +864,165 @@ data "archive_file" "list_business_bookings" {
 }
 
 resource "aws_lambda_function" "list_business_bookings" {
+  count = var.deployment_mode == "functions" ? 1 : 0
+
   function_name    = "barberq-list-business-bookings"
   role             = aws_iam_role.lambda_auth.arn
   runtime          = "python3.12"
-  handler          = "list_business_bookings.handler"
+  handler          = var.coldstart_profiling ? local.coldstart_handler : "list_business_bookings.handler"
   filename         = data.archive_file.list_business_bookings.output_path
   source_code_hash = data.archive_file.list_business_bookings.output_base64sha256
+  layers           = local.layers
+
+  environment {
+    variables = {
+      BOOKINGS_TABLE         = aws_dynamodb_table.bookings.name
+      BUSINESS_USER_POOL_ID  = aws_cognito_user_pool.business.id
+      BUSINESS_APP_CLIENT_ID = aws_cognito_user_pool_client.business_app.id
+      METRICS_SAMPLE_RATE    = var.metrics_sample_rate
+      ALLOWED_ORIGIN         = var.allowed_origin
+      ROUTE_PREFIX           = var.route_prefix
+    }
+  }
+}
+
+# --- List client bookings Lambda ---
+
+data "archive_file" "list_client_bookings" {
+  type        = "zip"
+  source_file = "${path.module}/../lambdas/bookings/list_client_bookings.py"
+  output_path = "${path.module}/../lambdas/bookings/list_client_bookings.zip"
+}
+
+resource "aws_lambda_function" "list_client_bookings" {
+  count = var.deployment_mode == "functions" ? 1 : 0
+
+  function_name    = "barberq-list-client-bookings"
+  role             = aws_iam_role.lambda_auth.arn
+  runtime          = "python3.12"
+  handler          = var.coldstart_profiling ? local.coldstart_handler : "list_client_bookings.handler"
+  filename         = data.archive_file.list_client_bookings.output_path
+  source_code_hash = data.archive_file.list_client_bookings.output_base64sha256
+  layers           = local.layers
+
+  environment {
+    variables = {
+      BOOKINGS_TABLE        = aws_dynamodb_table.bookings.name
+      CLIENTS_USER_POOL_ID  = aws_cognito_user_pool.clients.id
+      CLIENTS_APP_CLIENT_ID = aws_cognito_user_pool_client.clients_app.id
+      METRICS_SAMPLE_RATE   = var.metrics_sample_rate
+      ALLOWED_ORIGIN        = var.allowed_origin
+    }
+  }
+}
+
+# --- Business stats Lambda ---
+
+data "archive_file" "get_business_stats" {
+  type        = "zip"
+  source_file = "${path.module}/../lambdas/bookings/get_business_stats.py"
+  output_path = "${path.module}/../lambdas/bookings/get_business_stats.zip"
+}
+
+resource "aws_lambda_function" "get_business_stats" {
+  count = var.deployment_mode == "functions" ? 1 : 0
+
+  function_name    = "barberq-get-business-stats"
+  role             = aws_iam_role.lambda_auth.arn
+  runtime          = "python3.12"
+  handler          = var.coldstart_profiling ? local.coldstart_handler : "get_business_stats.handler"
+  filename         = data.archive_file.get_business_stats.output_path
+  source_code_hash = data.archive_file.get_business_stats.output_base64sha256
+  layers           = local.layers
+
+  environment {
+    variables = {
+      BUSINESS_STATS_TABLE   = aws_dynamodb_table.business_stats.name
+      SCHEDULES_TABLE        = aws_dynamodb_table.schedules.name
+      BUSINESS_USER_POOL_ID  = aws_cognito_user_pool.business.id
+      BUSINESS_APP_CLIENT_ID = aws_cognito_user_pool_client.business_app.id
+      METRICS_SAMPLE_RATE    = var.metrics_sample_rate
+      ALLOWED_ORIGIN         = var.allowed_origin
+      ROUTE_PREFIX           = var.route_prefix
+    }
+  }
+}
+
+# --- Router Lambda (deployment_mode = "router") ---
+
+locals {
+  # Every API handler, zipped flat next to router.py
+  router_handlers = {
+    "add_service.py"            = "services/add_service.py"
+    "list_services.py"          = "services/list_services.py"
+    "get_availability.py"       = "availability/get_availability.py"
+    "set_availability.py"       = "availability/set_availability.py"
+    "register_client.py"        = "auth/register_client.py"
+    "register_business.py"      = "auth/register_business.py"
+    "login_business.py"         = "auth/login_business.py"
+    "login_client.py"           = "auth/login_client.py"
+    "refresh_business.py"       = "auth/refresh_business.py"
+    "refresh_client.py"         = "auth/refresh_client.py"
+    "logout_business.py"        = "auth/logout_business.py"
+    "logout_client.py"          = "auth/logout_client.py"
+    "get_barbers.py"            = "bookings/get_barbers.py"
+    "get_business_services.py"  = "bookings/get_business_services.py"
+    "get_barber_slots.py"       = "bookings/get_barber_slots.py"
+    "get_slots_batch.py"        = "bookings/get_slots_batch.py"
+    "create_booking.py"         = "bookings/create_booking.py"
+    "create_bookings_batch.py"  = "bookings/create_bookings_batch.py"
+    "list_business_bookings.py" = "bookings/list_business_bookings.py"
+    "list_client_bookings.py"   = "bookings/list_client_bookings.py"
+    "get_business_stats.py"     = "bookings/get_business_stats.py"
+    "router.py"                 = "router/router.py"
+  }
+}
+
+data "archive_file" "router" {
+  count = var.deployment_mode == "router" ? 1 : 0
+
+  type        = "zip"
+  output_path = "${path.module}/../lambdas/router/router.zip"
+
+  dynamic "source" {
+    for_each = local.router_handlers
+    content {
+      content  = file("${path.module}/../lambdas/${source.value}")
+      filename = source.key
+    }
+  }
+}
+
+resource "aws_lambda_function" "router" {
+  count = var.deployment_mode == "router" ? 1 : 0
+
+  function_name    = "barberq-router"
+  role             = aws_iam_role.lambda_auth.arn
+  runtime          = "python3.12"
+  handler          = var.coldstart_profiling ? local.coldstart_handler : "router.handler"
+  filename         = data.archive_file.router[0].output_path
+  source_code_hash = data.archive_file.router[0].output_base64sha256
+  layers           = local.layers
+  memory_size      = 512
+  timeout          = 10
 
   environment {
     variables = {
-      BOOKINGS_TABLE = aws_dynamodb_table.bookings.name
-      ALLOWED_ORIGIN = var.allowed_origin
+      SERVICES_TABLE         = aws_dynamodb_table.services.name
+      SCHEDULES_TABLE        = aws_dynamodb_table.schedules.name
+      BOOKINGS_TABLE         = aws_dynamodb_table.bookings.name
+      SLOT_LOCKS_TABLE       = aws_dynamodb_table.slot_locks.name
+      SLOT_CALENDAR_TABLE    = aws_dynamodb_table.slot_calendar.name
+      BARBERS_TABLE          = aws_dynamodb_table.barbers.name
+      BUSINESS_META_TABLE    = aws_dynamodb_table.business_meta.name
+      BUSINESS_STATS_TABLE   = aws_dynamodb_table.business_stats.name
+      CLIENTS_USER_POOL_ID   = aws_cognito_user_pool.clients.id
+      CLIENTS_APP_CLIENT_ID  = aws_cognito_user_pool_client.clients_app.id
+      BUSINESS_USER_POOL_ID  = aws_cognito_user_pool.business.id
+      BUSINESS_APP_CLIENT_ID = aws_cognito_user_pool_client.business_app.id
+      METRICS_SAMPLE_RATE    = var.metrics_sample_rate
+      ALLOWED_ORIGIN         = var.allowed_origin
+      ROUTE_PREFIX           = var.route_prefix
     }
   }
 }
@@ -1,4 +1,7 @@
 terraform {
+  # terraform_data (the layer_deps build step) needs 1.4
+  required_version = ">= 1.4"
+
   required_providers {
     aws = {
       source  = "hashicorp/aws"
@@ -10,12 +10,22 @@ output "client_pool_client_id" {
 
 output "register_client_lambda_arn" {
   description = "Client registration Lambda ARN — use when wiring API Gateway manually"
-  value       = aws_lambda_function.register_client.arn
+  value       = one(aws_lambda_function.register_client[*].arn)
 }
 
 output "login_client_lambda_arn" {
   description = "Client login Lambda ARN — use when wiring API Gateway manually"
-  value       = aws_lambda_function.login_client.arn
+  value       = one(aws_lambda_function.login_client[*].arn)
+}
+
+output "refresh_client_lambda_arn" {
+  description = "Client token refresh Lambda ARN — use when wiring API Gateway manually"
+  value       = one(aws_lambda_function.refresh_client[*].arn)
+}
+
+output "logout_client_lambda_arn" {
+  description = "Client logout Lambda ARN — use when wiring API Gateway manually"
+  value       = one(aws_lambda_function.logout_client[*].arn)
 }
 
 output "business_pool_id" {
@@ -30,55 +40,100 @@ output "business_pool_client_id" {
 
 output "register_business_lambda_arn" {
   description = "Business registration Lambda ARN — use when wiring API Gateway manually"
-  value       = aws_lambda_function.register_business.arn
+  value       = one(aws_lambda_function.register_business[*].arn)
 }
 
 output "login_business_lambda_arn" {
   description = "Business login Lambda ARN — use when wiring API Gateway manually"
-  value       = aws_lambda_function.login_business.arn
+  value       = one(aws_lambda_function.login_business[*].arn)
+}
+
+output "refresh_business_lambda_arn" {
+  description = "Business token refresh Lambda ARN — use when wiring API Gateway manually"
+  value       = one(aws_lambda_function.refresh_business[*].arn)
+}
+
+output "logout_business_lambda_arn" {
+  description = "Business logout Lambda ARN — use when wiring API Gateway manually"
+  value       = one(aws_lambda_function.logout_business[*].arn)
 }
 
 output "add_service_lambda_arn" {
   description = "Add service Lambda ARN — use when wiring API Gateway manually"
-  value       = aws_lambda_function.add_service.arn
+  value       = one(aws_lambda_function.add_service[*].arn)
 }
 
 output "list_services_lambda_arn" {
   description = "List services Lambda ARN — use when wiring API Gateway manually"
-  value       = aws_lambda_function.list_services.arn
+  value       = one(aws_lambda_function.list_services[*].arn)
 }
 
 output "get_availability_lambda_arn" {
   description = "Get availability Lambda ARN — use when wiring API Gateway manually"
-  value       = aws_lambda_function.get_availability.arn
+  value       = one(aws_lambda_function.get_availability[*].arn)
 }
 
 output "set_availability_lambda_arn" {
   description = "Set availability Lambda ARN — use when wiring API Gateway manually"
-  value       = aws_lambda_function.set_availability.arn
+  value       = one(aws_lambda_function.set_availability[*].arn)
 }
 
 output "get_barbers_lambda_arn" {
   description = "Get barbers Lambda ARN — use when wiring API Gateway manually"
-  value       = aws_lambda_function.get_barbers.arn
+  value       = one(aws_lambda_function.get_barbers[*].arn)
 }
 
 output "get_business_services_lambda_arn" {
   description = "Get business services Lambda ARN — use when wiring API Gateway manually"
-  value       = aws_lambda_function.get_business_services.arn
+  value       = one(aws_lambda_function.get_business_services[*].arn)
 }
 
 output "get_barber_slots_lambda_arn" {
   description = "Get barber slots Lambda ARN — use when wiring API Gateway manually"
-  value       = aws_lambda_function.get_barber_slots.arn
+  value       = one(aws_lambda_function.get_barber_slots[*].arn)
+}
+
+output "get_slots_batch_lambda_arn" {
+  description = "Batch slots Lambda ARN — use when wiring API Gateway manually"
+  value       = one(aws_lambda_function.get_slots_batch[*].arn)
+}
+
+output "materialize_slots_lambda_arn" {
+  description = "Slot calendar materializer Lambda ARN — invoke with {\"action\": \"rebuild\", \"businessId\": ...} to rebuild a calendar"
+  value       = aws_lambda_function.materialize_slots.arn
 }
 
 output "create_booking_lambda_arn" {
   description = "Create booking Lambda ARN — use when wiring API Gateway manually"
-  value       = aws_lambda_function.create_booking.arn
+  value       = one(aws_lambda_function.create_booking[*].arn)
+}
+
+output "create_bookings_batch_lambda_arn" {
+  description = "Batch/recurring bookings Lambda ARN — use when wiring API Gateway manually"
+  value       = one(aws_lambda_function.create_bookings_batch[*].arn)
 }
 
 output "list_business_bookings_lambda_arn" {
   description = "List business bookings Lambda ARN — use when wiring API Gateway manually"
-  value       = aws_lambda_function.list_business_bookings.arn
+  value       = one(aws_lambda_function.list_business_bookings[*].arn)
+}
+
+output "list_client_bookings_lambda_arn" {
+  description = "List client bookings Lambda ARN — use when wiring API Gateway manually"
+  value       = one(aws_lambda_function.list_client_bookings[*].arn)
+}
+
+output "get_business_stats_lambda_arn" {
+  description = "Business dashboard stats Lambda ARN — use when wiring API Gateway manually"
+  value       = one(aws_lambda_function.get_business_stats[*].arn)
+}
+
+output "router_lambda_arn" {
+  description = "Router Lambda ARN (deployment_mode = \"router\") — point a catch-all API Gateway route at it"
+  value       = one(aws_lambda_function.router[*].arn)
+}
+
+output "stream_failures_queue_url" {
+  description = "Queue of stream batches the slot materializer and stats aggregator gave up on — replay or rebuild from it"
+  value       = aws_sqs_queue.stream_failures.url
 }
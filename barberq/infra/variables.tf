@@ -2,3 +2,37 @@ variable "allowed_origin" {
   description = "Allowed CORS origin for Lambda responses"
   type        = string
 }
+
+variable "coldstart_profiling" {
+  description = "Route every Lambda through the cold-start profiler (logs init and import times on the first invocation)"
+  type        = bool
+  default     = false
+}
+
+variable "deployment_mode" {
+  description = "\"functions\" deploys one Lambda per API route; \"router\" deploys a single Lambda that serves every route"
+  type        = string
+  default     = "functions"
+
+  validation {
+    condition     = contains(["functions", "router"], var.deployment_mode)
+    error_message = "deployment_mode must be \"functions\" or \"router\"."
+  }
+}
+
+variable "metrics_sample_rate" {
+  description = "Share of warm invocations that log embedded-metric timings (0-1); cold starts are always logged"
+  type        = number
+  default     = 1
+
+  validation {
+    condition     = var.metrics_sample_rate >= 0 && var.metrics_sample_rate <= 1
+    error_message = "metrics_sample_rate must be between 0 and 1."
+  }
+}
+
+variable "route_prefix" {
+  description = "Path prefix the router strips before matching routes; the frontend calls /api/..., so an API that forwards it unchanged needs \"/api\" (\"\" when the API strips it)"
+  type        = string
+  default     = "/api"
+}
@@ -1,22 +1,24 @@
-import json
 import os
-import boto3
 from botocore.exceptions import ClientError
+from barberq_common import aws
+from barberq_common.auth import REFRESH_COOKIE, REFRESH_COOKIE_MAX_AGE
+from barberq_common.http import json_body, respond, set_cookie
+from barberq_common.metrics import instrument
 
-cognito = boto3.client("cognito-idp")
+cognito = aws.lazy_client("cognito-idp")
 
-APP_CLIENT_ID = os.environ["APP_CLIENT_ID"]
-ALLOWED_ORIGIN = os.environ["ALLOWED_ORIGIN"]
+APP_CLIENT_ID = os.environ["CLIENTS_APP_CLIENT_ID"]
 
 
+@instrument
 def handler(event, context):
     try:
-        body = json.loads(event.get("body", "{}"))
+        body = json_body(event)
         email = body.get("email")
         password = body.get("password")
 
         if not all([email, password]):
-            return response(400, {"message": "Missing required fields."})
+            return respond(400, {"message": "Missing required fields."})
 
         result = cognito.initiate_auth(
             AuthFlow="USER_PASSWORD_AUTH",
@@ -28,25 +30,14 @@ def handler(event, context):
         )
 
         tokens = result["AuthenticationResult"]
-        refresh_token = tokens["RefreshToken"]
-        access_token = tokens["AccessToken"]
+        cookie = set_cookie(REFRESH_COOKIE, tokens["RefreshToken"], REFRESH_COOKIE_MAX_AGE)
 
-        cookie = (
-            f"refreshToken={refresh_token}; "
-            "HttpOnly; Secure; SameSite=None; Path=/; Max-Age=2592000"
+        return respond(
+            200,
+            {"accessToken": tokens["AccessToken"], "expiresIn": tokens["ExpiresIn"]},
+            headers={"Set-Cookie": cookie, "Cache-Control": "no-store"},
         )
 
-        return {
-            "statusCode": 200,
-            "headers": {
-                "Content-Type": "application/json",
-                "Access-Control-Allow-Origin": ALLOWED_ORIGIN,
-                "Access-Control-Allow-Credentials": "true",
-                "Set-Cookie": cookie,
-            },
-            "body": json.dumps({"accessToken": access_token}),
-        }
-
     except ClientError as e:
         return handle_cognito_error(e)
 
@@ -54,21 +45,9 @@ def handler(event, context):
 def handle_cognito_error(e: ClientError) -> dict:
     code = e.response["Error"]["Code"]
     if code == "NotAuthorizedException":
-        return response(401, {"message": "Incorrect email or password."})
+        return respond(401, {"message": "Incorrect email or password."})
     if code == "UserNotConfirmedException":
-        return response(403, {"message": "Please verify your email before logging in."})
+        return respond(403, {"message": "Please verify your email before logging in."})
     if code == "UserNotFoundException":
-        return response(401, {"message": "Incorrect email or password."})
-    return response(500, {"message": "Something went wrong. Please try again."})
-
-
-def response(status_code: int, body: dict) -> dict:
-    return {
-        "statusCode": status_code,
-        "headers": {
-            "Content-Type": "application/json",
-            "Access-Control-Allow-Origin": ALLOWED_ORIGIN,
-            "Access-Control-Allow-Credentials": "true",
-        },
-        "body": json.dumps(body),
-    }
+        return respond(401, {"message": "Incorrect email or password."})
+    return respond(500, {"message": "Something went wrong. Please try again."})
@@ -0,0 +1,30 @@
+import os
+from botocore.exceptions import ClientError
+from barberq_common import aws
+from barberq_common.auth import REFRESH_COOKIE
+from barberq_common.http import cookie, respond, set_cookie
+from barberq_common.metrics import instrument
+
+cognito = aws.lazy_client("cognito-idp")
+
+APP_CLIENT_ID = os.environ["BUSINESS_APP_CLIENT_ID"]
+
+
+@instrument
+def handler(event, context):
+    """Revoke the refresh-token cookie's token and clear the cookie.
+
+    Revoking also invalidates the access tokens issued from it at Cognito,
+    though a container that already verified one keeps accepting it until it
+    expires.
+    """
+    refresh_token = cookie(event, REFRESH_COOKIE)
+    if refresh_token:
+        try:
+            cognito.revoke_token(Token=refresh_token, ClientId=APP_CLIENT_ID)
+        except ClientError as e:
+            # An expired or unknown token cannot be used anyway
+            if e.response["Error"]["Code"] not in ("NotAuthorizedException", "UnsupportedTokenTypeException"):
+                return respond(500, {"message": "Something went wrong. Please try again."})
+
+    return respond(200, {"message": "Logged out."}, headers={"Set-Cookie": set_cookie(REFRESH_COOKIE, "", 0)})
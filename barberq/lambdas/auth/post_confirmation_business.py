@@ -0,0 +1,21 @@
+import os
+from barberq_common import aws
+from barberq_common.directory import directory_item
+
+table = aws.table(os.environ["BARBERS_TABLE"])
+
+
+def handler(event, context):
+    """Cognito post-confirmation trigger — add the new business to the barber directory."""
+    if event.get("triggerSource") != "PostConfirmation_ConfirmSignUp":
+        return event
+
+    business_id = event["userName"]
+    attributes = event["request"]["userAttributes"]
+    email = attributes.get("email", business_id)
+    name = attributes.get("custom:business_name") or email
+
+    table.put_item(Item=directory_item(business_id, name, email, attributes.get("name")))
+
+    return event
+
@@ -0,0 +1,45 @@
+import os
+from botocore.exceptions import ClientError
+from barberq_common import aws
+from barberq_common.auth import REFRESH_COOKIE, REFRESH_COOKIE_MAX_AGE
+from barberq_common.http import cookie, respond, set_cookie
+from barberq_common.metrics import instrument
+
+cognito = aws.lazy_client("cognito-idp")
+
+APP_CLIENT_ID = os.environ["BUSINESS_APP_CLIENT_ID"]
+
+
+@instrument
+def handler(event, context):
+    """A fresh access token from the refresh-token cookie, so an expired session needs no password.
+
+    Cognito only returns a new refresh token when the app client rotates
+    them; the cookie is replaced then and otherwise left to run out.
+    """
+    refresh_token = cookie(event, REFRESH_COOKIE)
+    if not refresh_token:
+        return respond(401, {"message": "Not logged in."})
+
+    try:
+        result = cognito.initiate_auth(
+            AuthFlow="REFRESH_TOKEN_AUTH",
+            AuthParameters={"REFRESH_TOKEN": refresh_token},
+            ClientId=APP_CLIENT_ID,
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "NotAuthorizedException":
+            # Expired or revoked; drop the cookie so the app asks for a password
+            return respond(
+                401,
+                {"message": "Session expired. Please log in again."},
+                headers={"Set-Cookie": set_cookie(REFRESH_COOKIE, "", 0)},
+            )
+        return respond(500, {"message": "Something went wrong. Please try again."})
+
+    tokens = result["AuthenticationResult"]
+    headers = {"Cache-Control": "no-store"}
+    if tokens.get("RefreshToken"):
+        headers["Set-Cookie"] = set_cookie(REFRESH_COOKIE, tokens["RefreshToken"], REFRESH_COOKIE_MAX_AGE)
+
+    return respond(200, {"accessToken": tokens["AccessToken"], "expiresIn": tokens["ExpiresIn"]}, headers=headers)
@@ -1,22 +1,24 @@
-import json
 import os
-import boto3
 from botocore.exceptions import ClientError
+from barberq_common import aws
+from barberq_common.http import json_body, respond
+from barberq_common.metrics import instrument
 
-cognito = boto3.client("cognito-idp")
+cognito = aws.lazy_client("cognito-idp")
 
-APP_CLIENT_ID = os.environ["APP_CLIENT_ID"]
+APP_CLIENT_ID = os.environ["CLIENTS_APP_CLIENT_ID"]
 
 
+@instrument
 def handler(event, context):
     try:
-        body = json.loads(event.get("body", "{}"))
+        body = json_body(event)
         email = body.get("email")
         password = body.get("password")
         name = body.get("name")
 
         if not all([email, password, name]):
-            return response(400, {"message": "Missing required fields."})
+            return respond(400, {"message": "Missing required fields."})
 
         cognito.sign_up(
             ClientId=APP_CLIENT_ID,
@@ -28,7 +30,7 @@ def handler(event, context):
             ],
         )
 
-        return response(201, {"message": "Registration successful. Please check your email to verify your account."})
+        return respond(201, {"message": "Registration successful. Please check your email to verify your account."})
 
     except ClientError as e:
         return handle_cognito_error(e)
@@ -37,20 +39,9 @@ def handler(event, context):
 def handle_cognito_error(e: ClientError) -> dict:
     code = e.response["Error"]["Code"]
     if code == "UsernameExistsException":
-        return response(409, {"message": "An account with this email already exists."})
+        return respond(409, {"message": "An account with this email already exists."})
     if code == "InvalidPasswordException":
-        return response(400, {"message": "Password does not meet requirements."})
+        return respond(400, {"message": "Password does not meet requirements."})
     if code == "InvalidParameterException":
-        return response(400, {"message": "Invalid input."})
-    return response(500, {"message": "Something went wrong. Please try again."})
-
-
-def response(status_code: int, body: dict) -> dict:
-    return {
-        "statusCode": status_code,
-        "headers": {
-            "Content-Type": "application/json",
-            "Access-Control-Allow-Origin": "*",
-        },
-        "body": json.dumps(body),
-    }
+        return respond(400, {"message": "Invalid input."})
+    return respond(500, {"message": "Something went wrong. Please try again."})
@@ -1,61 +1,44 @@
-import json
 import os
-import base64
-import boto3
-from boto3.dynamodb.conditions import Key
 from botocore.exceptions import ClientError
+from barberq_common import aws
+from barberq_common.auth import BUSINESS, extract_sub
+from barberq_common.http import respond
+from barberq_common.metrics import instrument
+from barberq_common.schedule import Schedule, format_intervals
+from barberq_common.slot_engine import DAY_KEYS, MINUTE_LABELS
 
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table(os.environ["AVAILABILITY_TABLE"])
-ALLOWED_ORIGIN = os.environ["ALLOWED_ORIGIN"]
+table = aws.table(os.environ["SCHEDULES_TABLE"])
 
 
+@instrument
 def handler(event, context):
     try:
-        business_id = extract_sub(event)
+        business_id = extract_sub(event, BUSINESS)
         if not business_id:
             return respond(401, {"message": "Unauthorized."})
 
-        result = table.query(
-            KeyConditionExpression=Key("businessId").eq(business_id)
+        schedule = Schedule.from_item(
+            table.get_item(Key={"businessId": business_id}).get("Item")
         )
 
-        schedule = [
+        # One row per working day (outer hours) for clients of the older format
+        days = [
             {
-                "day": item["day"],
-                "startTime": item["startTime"],
-                "endTime": item["endTime"],
-                "isAvailable": bool(item["isAvailable"]),
+                "day": day,
+                "startTime": MINUTE_LABELS[schedule.weekly[day][0][0]],
+                "endTime": MINUTE_LABELS[schedule.weekly[day][-1][1]],
+                "isAvailable": True,
             }
-            for item in result.get("Items", [])
+            for day in DAY_KEYS
+            if schedule.weekly.get(day)
         ]
 
-        return respond(200, {"schedule": schedule})
+        return respond(200, {
+            "schedule": days,
+            "weekly": {day: format_intervals(intervals) for day, intervals in schedule.weekly.items()},
+            "overrides": {d: format_intervals(intervals) for d, intervals in sorted(schedule.overrides.items())},
+            "version": schedule.version,
+        })
 
     except ClientError:
         return respond(500, {"message": "Something went wrong. Please try again."})
-
-
-def extract_sub(event):
-    """Decode the JWT from the Authorization header and return the sub claim."""
-    try:
-        auth = event.get("headers", {}).get("Authorization", "")
-        token = auth.removeprefix("Bearer ")
-        payload_b64 = token.split(".")[1]
-        payload_b64 += "=" * (-len(payload_b64) % 4)
-        payload = json.loads(base64.urlsafe_b64decode(payload_b64))
-        return payload.get("sub")
-    except Exception:
-        return None
-
-
-def respond(status_code: int, body: dict) -> dict:
-    return {
-        "statusCode": status_code,
-        "headers": {
-            "Content-Type": "application/json",
-            "Access-Control-Allow-Origin": ALLOWED_ORIGIN,
-            "Access-Control-Allow-Credentials": "true",
-        },
-        "body": json.dumps(body),
-    }
@@ -1,71 +1,135 @@
-import json
 import os
-import base64
-import boto3
 from botocore.exceptions import ClientError
+from datetime import date
+from barberq_common import aws
+from barberq_common.auth import BUSINESS, extract_sub
+from barberq_common.http import json_body, respond
+from barberq_common.metrics import instrument
+from barberq_common.schedule import MAX_OVERRIDES, Schedule, parse_intervals, parse_time
+from barberq_common.slot_reads import parse_date
 
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table(os.environ["AVAILABILITY_TABLE"])
-ALLOWED_ORIGIN = os.environ["ALLOWED_ORIGIN"]
+table = aws.table(os.environ["SCHEDULES_TABLE"])
 
 VALID_DAYS = {"MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN"}
 
 
+@instrument
 def handler(event, context):
+    """Save a business's working hours.
+
+    Accepts the weekly form {"weekly": {"MON": [{"startTime", "endTime"}, ...]}}
+    and/or {"overrides": {"YYYY-MM-DD": [...]}}, each replacing what is stored.
+    The older {"schedule": [{"day", "startTime", "endTime", "isAvailable"}]}
+    form updates only the listed days, one interval each.
+    """
     try:
-        business_id = extract_sub(event)
+        business_id = extract_sub(event, BUSINESS)
         if not business_id:
             return respond(401, {"message": "Unauthorized."})
 
-        body = json.loads(event.get("body", "{}"))
-        schedule = body.get("schedule", [])
-
-        if not schedule:
+        body = json_body(event)
+        if not any(body.get(k) is not None for k in ("schedule", "weekly", "overrides")):
             return respond(400, {"message": "Missing schedule."})
 
-        for entry in schedule:
-            day = entry.get("day")
-            start_time = entry.get("startTime")
-            end_time = entry.get("endTime")
-            is_available = entry.get("isAvailable", False)
+        stored = Schedule.from_item(
+            table.get_item(Key={"businessId": business_id}).get("Item")
+        )
+
+        # Validate everything before writing anything
+        weekly = dict(stored.weekly)
+        overrides = dict(stored.overrides)
+        try:
+            if body.get("schedule") is not None:
+                weekly = apply_day_entries(weekly, body["schedule"])
+            elif body.get("weekly") is not None:
+                weekly = parse_weekly(body["weekly"])
+            if body.get("overrides") is not None:
+                overrides = parse_overrides(body["overrides"])
+        except ValueError as e:
+            return respond(400, {"message": str(e)})
 
-            if day not in VALID_DAYS or not start_time or not end_time:
-                return respond(400, {"message": f"Invalid entry for day: {day}"})
+        schedule = Schedule(weekly, overrides, stored.version).without_past_overrides(date.today())
+        changed = schedule.changes_from(stored)
+        if not changed:
+            return respond(200, {"message": "Availability saved.", "version": stored.version, "changed": 0})
 
-            table.put_item(Item={
-                "businessId": business_id,
-                "day": day,
-                "startTime": start_time,
-                "endTime": end_time,
-                "isAvailable": bool(is_available),
-            })
+        schedule.version = stored.version + 1
+        try:
+            save(business_id, schedule, stored.version)
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return respond(409, {"message": "Availability was changed elsewhere. Please try again."})
+            raise
 
-        return respond(200, {"message": "Availability saved."})
+        return respond(200, {"message": "Availability saved.", "version": schedule.version, "changed": changed})
 
     except ClientError:
         return respond(500, {"message": "Something went wrong. Please try again."})
 
 
-def extract_sub(event):
-    """Decode the JWT from the Authorization header and return the sub claim."""
-    try:
-        auth = event.get("headers", {}).get("Authorization", "")
-        token = auth.removeprefix("Bearer ")
-        payload_b64 = token.split(".")[1]
-        payload_b64 += "=" * (-len(payload_b64) % 4)
-        payload = json.loads(base64.urlsafe_b64decode(payload_b64))
-        return payload.get("sub")
-    except Exception:
-        return None
-
-
-def respond(status_code: int, body: dict) -> dict:
-    return {
-        "statusCode": status_code,
-        "headers": {
-            "Content-Type": "application/json",
-            "Access-Control-Allow-Origin": ALLOWED_ORIGIN,
-            "Access-Control-Allow-Credentials": "true",
-        },
-        "body": json.dumps(body),
-    }
+def apply_day_entries(weekly: dict, entries) -> dict:
+    """Apply the single-interval-per-day form on top of the stored weekly hours."""
+    if not isinstance(entries, list) or not entries:
+        raise ValueError("Missing schedule.")
+    weekly = dict(weekly)
+    seen = set()
+    for entry in entries:
+        day = entry.get("day") if isinstance(entry, dict) else None
+        if day not in VALID_DAYS or day in seen:
+            raise ValueError(f"Invalid entry for day: {day}")
+        seen.add(day)
+        try:
+            start, end = parse_time(entry.get("startTime")), parse_time(entry.get("endTime"))
+        except ValueError:
+            raise ValueError(f"Invalid entry for day: {day}")
+
+        if not entry.get("isAvailable"):
+            weekly.pop(day, None)
+            continue
+        if start >= end:
+            raise ValueError(f"Invalid entry for day: {day}")
+        # This form can only express the outer hours; keep stored breaks if those are unchanged
+        current = weekly.get(day)
+        if not current or (current[0][0], current[-1][1]) != (start, end):
+            weekly[day] = ((start, end),)
+    return weekly
+
+
+def parse_weekly(raw) -> dict:
+    if not isinstance(raw, dict) or not set(raw) <= VALID_DAYS:
+        raise ValueError("Invalid weekly hours.")
+    weekly = {}
+    for day, intervals in raw.items():
+        try:
+            parsed = parse_intervals(intervals or [])
+        except ValueError:
+            raise ValueError(f"Invalid hours for {day}.")
+        if parsed:
+            weekly[day] = parsed
+    return weekly
+
+
+def parse_overrides(raw) -> dict:
+    if not isinstance(raw, dict) or len(raw) > MAX_OVERRIDES:
+        raise ValueError("Invalid overrides.")
+    overrides = {}
+    for date_str, intervals in raw.items():
+        try:
+            # Keys are compared and pruned as strings, so only the canonical form is stored
+            parse_date(date_str)
+            overrides[date_str] = parse_intervals(intervals or [])
+        except ValueError:
+            raise ValueError(f"Invalid hours for {date_str}.")
+    return overrides
+
+
+def save(business_id: str, schedule: Schedule, expected_version: int) -> None:
+    """Put the schedule only if nobody saved since we read version expected_version."""
+    if expected_version:
+        condition = {
+            "ConditionExpression": "version = :expected",
+            "ExpressionAttributeValues": {":expected": expected_version},
+        }
+    else:
+        condition = {"ConditionExpression": "attribute_not_exists(businessId)"}
+    table.put_item(Item=schedule.to_item(business_id), **condition)
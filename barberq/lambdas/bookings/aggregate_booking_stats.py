@@ -0,0 +1,114 @@
+import os
+import time
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.exceptions import ClientError
+from collections import defaultdict
+from barberq_common import aws
+from barberq_common.booking_stats import COUNTERS, applied_key, changes
+from barberq_common.booking_writes import MAX_TRANSACT_ITEMS, failed_conditions
+
+stats_table = aws.table(os.environ["BUSINESS_STATS_TABLE"])
+
+# DynamoDB's own deletes (TTL expiry) carry this principal
+TTL_PRINCIPAL = "dynamodb.amazonaws.com"
+# Longer than the stream keeps a record (24 hours), so any redelivery finds its marker
+APPLIED_MARKER_SECONDS = 2 * 86400
+
+deserializer = TypeDeserializer()
+
+
+def handler(event, context):
+    """Fold bookings-stream records into per-business day and month counters.
+
+    A booking's records all belong to one business, so each business's
+    records are written in as few transactions as fit: one applied-marker
+    per record, put only if absent, and one ADD per stats item it touches.
+    Sequence numbers are only ordered within a shard, and a business's
+    bookings span shards, so the markers rather than a sequence number make
+    a retried batch idempotent: records whose marker exists were applied by
+    an earlier attempt and are dropped before the rest are written again.
+    Bookings removed by the table's TTL have ended, not been cancelled, so
+    they stay counted.
+    """
+    by_business = defaultdict(list)
+    for record in event.get("Records", []):
+        if (record.get("userIdentity") or {}).get("principalId") == TTL_PRINCIPAL:
+            continue
+        ddb = record["dynamodb"]
+        deltas = changes(unmarshal(ddb.get("OldImage")), unmarshal(ddb.get("NewImage")))
+        if deltas:
+            by_business[ddb["Keys"]["businessId"]["S"]].append((record["eventID"], deltas))
+
+    records = applied = 0
+    for business_id, pending in by_business.items():
+        for chunk in transaction_chunks(pending):
+            records += len(chunk)
+            applied += apply(business_id, chunk)
+    return {"records": records, "applied": applied}
+
+
+def transaction_chunks(pending: list):
+    """Split [(eventID, deltas)] so each chunk's markers and stats items fit one transaction."""
+    chunk, periods = [], set()
+    for event_id, deltas in pending:
+        touched = periods | set(deltas)
+        if chunk and len(chunk) + 1 + len(touched) > MAX_TRANSACT_ITEMS:
+            yield chunk
+            chunk, touched = [], set(deltas)
+        chunk.append((event_id, deltas))
+        periods = touched
+    if chunk:
+        yield chunk
+
+
+def apply(business_id: str, chunk: list) -> int:
+    """Write a chunk's markers and summed deltas in one transaction; returns how many records were new."""
+    while chunk:
+        try:
+            stats_table.meta.client.transact_write_items(TransactItems=transact_items(business_id, chunk))
+            return len(chunk)
+        except ClientError as e:
+            # Markers come first, so a failed condition's index is the record's
+            seen = set(failed_conditions(e))
+            if not seen:
+                raise
+            chunk = [entry for i, entry in enumerate(chunk) if i not in seen]
+    return 0
+
+
+def transact_items(business_id: str, chunk: list) -> list:
+    expires = int(time.time()) + APPLIED_MARKER_SECONDS
+    totals = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+    for _, deltas in chunk:
+        for (_, period), values in deltas.items():
+            for name, value in values.items():
+                totals[period][name] += value
+
+    items = [
+        {
+            "Put": {
+                "TableName": stats_table.name,
+                "Item": {"businessId": business_id, "period": applied_key(event_id), "ttl": expires},
+                "ConditionExpression": "attribute_not_exists(period)",
+            }
+        }
+        for event_id, _ in chunk
+    ]
+    for period, values in totals.items():
+        if not any(values.values()):
+            continue
+        items.append({
+            "Update": {
+                "TableName": stats_table.name,
+                "Key": {"businessId": business_id, "period": period},
+                "UpdateExpression": "ADD " + ", ".join(f"{name} :{name}" for name in values),
+                "ExpressionAttributeValues": {f":{name}": value for name, value in values.items()},
+            }
+        })
+    return items
+
+
+def unmarshal(image):
+    if not image:
+        return None
+    return {k: deserializer.deserialize(v) for k, v in image.items()}
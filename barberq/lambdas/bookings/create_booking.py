@@ -1,25 +1,31 @@
-import json
 import os
-import base64
-import uuid
-import boto3
-from boto3.dynamodb.conditions import Key, Attr
 from botocore.exceptions import ClientError
-from datetime import datetime, timezone
+from barberq_common import aws
+from barberq_common.auth import CLIENTS, extract_sub
+from barberq_common.booking_writes import MAX_TRANSACT_ITEMS, booking_item, failed_conditions, lock_slots, transact_items
+from barberq_common.http import json_body, respond
+from barberq_common.metrics import instrument, phase
+from barberq_common.read_cache import load_services, log_stats, meta_version, shared_cache
+from barberq_common.schedule import parse_time
+from barberq_common.slot_engine import MINUTE_LABELS, MINUTES_PER_DAY
+from barberq_common.slot_reads import parse_date
 
-dynamodb = boto3.resource("dynamodb")
-bookings_table = dynamodb.Table(os.environ["BOOKINGS_TABLE"])
-services_table = dynamodb.Table(os.environ["SERVICES_TABLE"])
-ALLOWED_ORIGIN = os.environ["ALLOWED_ORIGIN"]
+bookings_table = aws.table(os.environ["BOOKINGS_TABLE"])
+SERVICES_TABLE = os.environ["SERVICES_TABLE"]
+meta_table = aws.table(os.environ["BUSINESS_META_TABLE"])
+SLOT_LOCKS_TABLE = os.environ["SLOT_LOCKS_TABLE"]
 
+services_cache = shared_cache("services", load_services(SERVICES_TABLE), meta_version(meta_table, "servicesVersion"))
 
+
+@instrument
 def handler(event, context):
     try:
-        client_id = extract_sub(event)
+        client_id = extract_sub(event, CLIENTS)
         if not client_id:
             return respond(401, {"message": "Unauthorized."})
 
-        body = json.loads(event.get("body") or "{}")
+        body = json_body(event)
         business_id = body.get("businessId")
         service_id = body.get("serviceId")
         date = body.get("date")
@@ -28,72 +34,44 @@ def handler(event, context):
 
         if not all([business_id, service_id, date, start_time, end_time]):
             return respond(400, {"message": "Missing required fields."})
+        if not isinstance(business_id, str) or not isinstance(service_id, str):
+            return respond(400, {"message": "Invalid businessId or serviceId."})
 
-        # Check slot not already taken
-        existing = bookings_table.query(
-            KeyConditionExpression=Key("businessId").eq(business_id),
-            FilterExpression=Attr("date").eq(date)
-            & Attr("startTime").eq(start_time)
-            & Attr("status").eq("confirmed"),
-        )
-        if existing.get("Count", 0) > 0:
-            return respond(409, {"message": "This slot is already booked."})
+        try:
+            start_minutes = parse_time(start_time)
+            parse_date(date)
+        except ValueError:
+            return respond(400, {"message": "Invalid date or time."})
 
         # Fetch service name
-        svc_result = services_table.get_item(
-            Key={"businessId": business_id, "serviceId": service_id}
-        )
-        svc = svc_result.get("Item")
+        svc = services_cache.get(business_id).get(service_id)
+        log_stats(services_cache)
         if not svc:
             return respond(404, {"message": "Service not found."})
 
-        # Compute TTL — expire at the appointment's end time
-        end_dt = datetime.strptime(f"{date} {end_time}", "%Y-%m-%d %H:%M").replace(tzinfo=timezone.utc)
-        ttl = int(end_dt.timestamp())
+        duration = svc.duration
+        end_minutes = start_minutes + duration
+        if end_minutes > MINUTES_PER_DAY or MINUTE_LABELS[end_minutes] != end_time:
+            return respond(400, {"message": "Slot does not match the service duration."})
+
+        booking = booking_item(business_id, client_id, svc, date, start_minutes)
+        locks = lock_slots(date, start_minutes, end_minutes)
+        if len(locks) + 1 > MAX_TRANSACT_ITEMS:
+            return respond(400, {"message": "Service is too long to book."})
 
-        booking_id = str(uuid.uuid4())
-        bookings_table.put_item(
-            Item={
-                "businessId": business_id,
-                "bookingId": booking_id,
-                "clientId": client_id,
-                "serviceId": service_id,
-                "serviceName": svc["name"],
-                "date": date,
-                "startTime": start_time,
-                "endTime": end_time,
-                "durationMinutes": int(svc["durationMinutes"]),
-                "status": "confirmed",
-                "createdAt": datetime.now(timezone.utc).isoformat(),
-                "ttl": ttl,
-            }
-        )
+        # The lock conditions make the write itself the conflict check
+        try:
+            with phase("write"):
+                bookings_table.meta.client.transact_write_items(
+                    TransactItems=transact_items(booking, locks, SLOT_LOCKS_TABLE, bookings_table.name),
+                )
+        except ClientError as e:
+            if failed_conditions(e):
+                return respond(409, {"message": "This slot is already booked."})
+            raise
 
-        return respond(201, {"bookingId": booking_id})
+        return respond(201, {"bookingId": booking["bookingId"]})
 
     except ClientError:
         return respond(500, {"message": "Something went wrong. Please try again."})
 
-
-def extract_sub(event):
-    try:
-        auth = event.get("headers", {}).get("Authorization", "")
-        token = auth.removeprefix("Bearer ")
-        payload_b64 = token.split(".")[1]
-        payload_b64 += "=" * (-len(payload_b64) % 4)
-        payload = json.loads(base64.urlsafe_b64decode(payload_b64))
-        return payload.get("sub")
-    except Exception:
-        return None
-
-
-def respond(status_code: int, body: dict) -> dict:
-    return {
-        "statusCode": status_code,
-        "headers": {
-            "Content-Type": "application/json",
-            "Access-Control-Allow-Origin": ALLOWED_ORIGIN,
-            "Access-Control-Allow-Credentials": "true",
-        },
-        "body": json.dumps(body),
-    }
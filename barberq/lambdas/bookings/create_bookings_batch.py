@@ -0,0 +1,217 @@
+import os
+import uuid
+from botocore.exceptions import ClientError
+from datetime import date, timedelta
+from barberq_common import aws, repository
+from barberq_common.auth import CLIENTS, extract_sub
+from barberq_common.booking_writes import MAX_TRANSACT_ITEMS, booking_item, failed_conditions, lock_slots, transact_items
+from barberq_common.http import json_body, respond
+from barberq_common.metrics import instrument, phase
+from barberq_common.read_cache import load_services, log_stats, meta_version, shared_cache, shared_schedule_cache
+from barberq_common.schedule import parse_time
+from barberq_common.slot_engine import Horizon, MINUTE_LABELS, MINUTES_PER_DAY
+from barberq_common.slot_reads import HORIZON_DAYS, parse_date
+
+BOOKINGS_TABLE = os.environ["BOOKINGS_TABLE"]
+SERVICES_TABLE = os.environ["SERVICES_TABLE"]
+SCHEDULES_TABLE = os.environ["SCHEDULES_TABLE"]
+bookings_table = aws.table(BOOKINGS_TABLE)
+meta_table = aws.table(os.environ["BUSINESS_META_TABLE"])
+SLOT_LOCKS_TABLE = os.environ["SLOT_LOCKS_TABLE"]
+
+MAX_SLOTS = 50
+MAX_REPEAT_EVERY_WEEKS = 4
+
+services_cache = shared_cache("services", load_services(SERVICES_TABLE), meta_version(meta_table, "servicesVersion"))
+schedule_cache = shared_schedule_cache(SCHEDULES_TABLE)
+
+
+@instrument
+def handler(event, context):
+    """Book several slots of one service in a single request.
+
+    Takes either an explicit list, {"slots": [{"date", "startTime"}, ...]},
+    or a weekly pattern, {"date", "startTime", "repeat": {"count", "everyWeeks"}}.
+    Every slot is checked against the working hours and existing bookings
+    before anything is written, and gets its own status in the response:
+    "booked", "conflict", "unavailable", "error", or "skipped". With
+    {"atomic": true} either every slot is booked or none is.
+    """
+    try:
+        client_id = extract_sub(event, CLIENTS)
+        if not client_id:
+            return respond(401, {"message": "Unauthorized."})
+
+        body = json_body(event)
+        business_id = body.get("businessId")
+        service_id = body.get("serviceId")
+        atomic = body.get("atomic") is True
+
+        if not business_id or not service_id:
+            return respond(400, {"message": "Missing required fields."})
+        if not isinstance(business_id, str) or not isinstance(service_id, str):
+            return respond(400, {"message": "Invalid businessId or serviceId."})
+
+        try:
+            requested = parse_slots(body)
+        except ValueError as e:
+            return respond(400, {"message": str(e)})
+
+        svc = services_cache.get(business_id).get(service_id)
+        if not svc:
+            log_stats(services_cache, schedule_cache)
+            return respond(404, {"message": "Service not found."})
+        duration = svc.duration
+        schedule = schedule_cache.get(business_id)
+        log_stats(services_cache, schedule_cache)
+
+        today = date.today()
+        horizon_start = today + timedelta(days=1)
+        horizon_end = today + timedelta(days=HORIZON_DAYS)
+        series_id = str(uuid.uuid4())
+
+        # One bookings query covers every requested date inside the horizon; dates
+        # outside it are unavailable anyway and must not stretch the span
+        bookable = [day for day, _ in requested if horizon_start <= day <= horizon_end]
+        if bookable:
+            first_day = min(bookable)
+            last_day = max(bookable)
+            days = (last_day - first_day).days + 1
+            with phase("bookings"):
+                busy = repository.booked_intervals(BOOKINGS_TABLE, business_id, first_day.strftime("%Y-%m-%d"), last_day.strftime("%Y-%m-%d"))
+            hours = Horizon(first_day, days, schedule.weekly, None, schedule.overrides)
+            free = Horizon(first_day, days, schedule.weekly, busy, schedule.overrides)
+
+        # Check every slot in memory; slots in this request may not overlap each other either
+        results = []
+        pending = []
+        claimed = set()
+        for day, start in requested:
+            date_str = day.strftime("%Y-%m-%d")
+            result = {"date": date_str, "startTime": MINUTE_LABELS[start]}
+            if start + duration <= MINUTES_PER_DAY:
+                result["endTime"] = MINUTE_LABELS[start + duration]
+            results.append(result)
+
+            if not horizon_start <= day <= horizon_end or not hours.fits(day, start, duration):
+                result["status"] = "unavailable"
+                continue
+            locks = lock_slots(date_str, start, start + duration)
+            if not free.fits(day, start, duration) or claimed.intersection(locks):
+                result["status"] = "conflict"
+                continue
+            claimed.update(locks)
+            booking = booking_item(business_id, client_id, svc, date_str, start, seriesId=series_id)
+            pending.append((result, transact_items(booking, locks, SLOT_LOCKS_TABLE, bookings_table.name), booking))
+
+        if atomic:
+            if len(pending) < len(results):
+                return all_or_nothing_failed(results)
+            if sum(len(items) for _, items, _ in pending) > MAX_TRANSACT_ITEMS:
+                return respond(400, {"message": "Too many slots to book atomically."})
+            batches = [pending]
+        else:
+            batches = pack(pending)
+
+        with phase("write"):
+            for batch in batches:
+                write_batch(batch, atomic)
+        if atomic and any(r.get("status") != "booked" for r in results):
+            return all_or_nothing_failed(results)
+
+        booked = sum(1 for r in results if r["status"] == "booked")
+        return respond(201 if booked else 409, {"seriesId": series_id, "booked": booked, "results": results})
+
+    except ClientError:
+        return respond(500, {"message": "Something went wrong. Please try again."})
+
+
+def parse_slots(body: dict) -> list:
+    """[(date, start minute), ...] from an explicit slot list or a weekly repeat."""
+    try:
+        if body.get("repeat") is not None:
+            repeat = body["repeat"]
+            count = repeat.get("count")
+            every = repeat.get("everyWeeks", 1)
+            if not isinstance(count, int) or not 1 <= count <= MAX_SLOTS:
+                raise ValueError(f"repeat.count must be between 1 and {MAX_SLOTS}.")
+            if not isinstance(every, int) or not 1 <= every <= MAX_REPEAT_EVERY_WEEKS:
+                raise ValueError(f"repeat.everyWeeks must be between 1 and {MAX_REPEAT_EVERY_WEEKS}.")
+            first = parse_slot(body)
+            return [(first[0] + timedelta(weeks=i * every), first[1]) for i in range(count)]
+
+        slots = body.get("slots")
+        if not isinstance(slots, list) or not slots:
+            raise ValueError("Missing slots or repeat.")
+        if len(slots) > MAX_SLOTS:
+            raise ValueError(f"At most {MAX_SLOTS} slots per request.")
+        return [parse_slot(slot) for slot in slots]
+    except (AttributeError, TypeError, OverflowError):
+        raise ValueError("Invalid slots.")
+
+
+def parse_slot(slot: dict) -> tuple:
+    try:
+        day = parse_date(slot["date"])
+        start = parse_time(slot["startTime"])
+    except (KeyError, ValueError):
+        raise ValueError("Invalid date or time.")
+    if day is None or start >= MINUTES_PER_DAY:
+        raise ValueError("Invalid date or time.")
+    return day, start
+
+
+def pack(pending: list) -> list:
+    """Group bookings into transactions of at most MAX_TRANSACT_ITEMS writes."""
+    batches = []
+    batch = []
+    size = 0
+    for entry in pending:
+        n = len(entry[1])
+        if batch and size + n > MAX_TRANSACT_ITEMS:
+            batches.append(batch)
+            batch, size = [], 0
+        batch.append(entry)
+        size += n
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def write_batch(batch: list, atomic: bool) -> None:
+    """Commit a batch, setting each result's status.
+
+    A cancelled transaction writes nothing, so after a conflict the bookings
+    that did not conflict are sent again on their own (unless atomic).
+    """
+    while batch:
+        owners = [entry for entry in batch for _ in entry[1]]
+        try:
+            bookings_table.meta.client.transact_write_items(
+                TransactItems=[item for _, items, _ in batch for item in items],
+            )
+        except ClientError as e:
+            conflicts = {id(owners[i]) for i in failed_conditions(e)}
+            if not conflicts:
+                if atomic:
+                    raise
+                for result, _, _ in batch:
+                    result["status"] = "error"
+                return
+            for entry in batch:
+                if id(entry) in conflicts:
+                    entry[0]["status"] = "conflict"
+            if atomic:
+                return
+            batch = [entry for entry in batch if id(entry) not in conflicts]
+            continue
+        for result, _, booking in batch:
+            result["status"] = "booked"
+            result["bookingId"] = booking["bookingId"]
+        return
+
+
+def all_or_nothing_failed(results: list):
+    for result in results:
+        result.setdefault("status", "skipped")
+    return respond(409, {"message": "Some slots cannot be booked; nothing was booked.", "results": results})
@@ -1,17 +1,26 @@
-import json
 import os
-import boto3
-from boto3.dynamodb.conditions import Key
 from botocore.exceptions import ClientError
-from datetime import date, timedelta
+from barberq_common import aws, repository
+from barberq_common.http import cache_control, respond, respond_cached
+from barberq_common.metrics import instrument, phase
+from barberq_common.read_cache import load_services, log_stats, meta_version, shared_cache, shared_schedule_cache
+from barberq_common.slot_engine import Horizon
+from barberq_common.slot_reads import parse_step, resolve_window
 
-dynamodb = boto3.resource("dynamodb")
-services_table = dynamodb.Table(os.environ["SERVICES_TABLE"])
-availability_table = dynamodb.Table(os.environ["AVAILABILITY_TABLE"])
-bookings_table = dynamodb.Table(os.environ["BOOKINGS_TABLE"])
-ALLOWED_ORIGIN = os.environ["ALLOWED_ORIGIN"]
+SERVICES_TABLE = os.environ["SERVICES_TABLE"]
+SCHEDULES_TABLE = os.environ["SCHEDULES_TABLE"]
+BOOKINGS_TABLE = os.environ["BOOKINGS_TABLE"]
+SLOT_CALENDAR_TABLE = os.environ["SLOT_CALENDAR_TABLE"]
+meta_table = aws.table(os.environ["BUSINESS_META_TABLE"])
 
+# Short: a booking elsewhere can take a slot at any moment (create_booking still re-checks)
+CACHE_CONTROL = cache_control(15, stale_while_revalidate=45)
 
+services_cache = shared_cache("services", load_services(SERVICES_TABLE), meta_version(meta_table, "servicesVersion"))
+schedule_cache = shared_schedule_cache(SCHEDULES_TABLE)
+
+
+@instrument
 def handler(event, context):
     try:
         path_params = event.get("pathParameters") or {}
@@ -22,82 +31,50 @@ def handler(event, context):
         if not business_id or not service_id:
             return respond(400, {"message": "Missing businessId or serviceId."})
 
-        # Fetch service duration
-        svc_result = services_table.get_item(
-            Key={"businessId": business_id, "serviceId": service_id}
-        )
-        svc = svc_result.get("Item")
+        # Resolve the requested window, clamped to the booking horizon
+        try:
+            step = parse_step(query_params.get("step"))
+            first_day, last_day, page = resolve_window(query_params)
+        except ValueError as e:
+            return respond(400, {"message": str(e)})
+        if first_day > last_day:
+            return respond_cached({"slots": [], **page}, event, CACHE_CONTROL)
+
+        # Serve from the materialized calendar when every day in the window is there
+        if step is None:
+            days = (last_day - first_day).days + 1
+            with phase("calendar"):
+                available = read_calendar(business_id, service_id, page["from"], page["to"], days)
+            if available is not None:
+                return respond_cached({"slots": available, **page}, event, CACHE_CONTROL)
+
+        # Fetch service duration and working hours (cached across warm invocations)
+        with phase("cache"):
+            svc = services_cache.get(business_id).get(service_id)
+            schedule = schedule_cache.get(business_id) if svc else None
+        log_stats(services_cache, schedule_cache)
         if not svc:
             return respond(404, {"message": "Service not found."})
-        duration = int(svc["durationMinutes"])
-
-        # Fetch weekly schedule
-        avail_result = availability_table.query(
-            KeyConditionExpression=Key("businessId").eq(business_id)
-        )
-        schedule = {
-            item["day"]: item
-            for item in avail_result.get("Items", [])
-        }
-
-        # Fetch all existing bookings for this business
-        bookings_result = bookings_table.query(
-            KeyConditionExpression=Key("businessId").eq(business_id)
-        )
-        bookings = bookings_result.get("Items", [])
-
-        # Compute available slots for the next 90 days
-        today = date.today()
-        available = []
-
-        for i in range(1, 91):
-            d = today + timedelta(days=i)
-            day_key = d.strftime("%a").upper()[:3]
-
-            avail = schedule.get(day_key)
-            if not avail or not avail.get("isAvailable"):
-                continue
-
-            start_h, start_m = map(int, str(avail["startTime"]).split(":"))
-            end_h, end_m = map(int, str(avail["endTime"]).split(":"))
-            start_minutes = start_h * 60 + start_m
-            end_minutes = end_h * 60 + end_m
-
-            date_str = d.strftime("%Y-%m-%d")
-            booked_starts = {
-                b["startTime"]
-                for b in bookings
-                if b.get("date") == date_str and b.get("status") == "confirmed"
-            }
-
-            t = start_minutes
-            while t + duration <= end_minutes:
-                slot_start = f"{t // 60:02d}:{t % 60:02d}"
-                slot_end_min = t + duration
-                slot_end = f"{slot_end_min // 60:02d}:{slot_end_min % 60:02d}"
+        duration = svc.duration
 
-                if slot_start not in booked_starts:
-                    available.append({
-                        "date": date_str,
-                        "startTime": slot_start,
-                        "endTime": slot_end,
-                    })
+        # Fetch confirmed bookings inside the slot window, indexed by date
+        with phase("bookings"):
+            busy = repository.booked_intervals(BOOKINGS_TABLE, business_id, page["from"], page["to"])
 
-                t += duration
+        # Compute available slots for the requested window only
+        with phase("compute"):
+            horizon = Horizon(first_day, (last_day - first_day).days + 1, schedule.weekly, busy, schedule.overrides)
+            available = horizon.slots(duration, step)
 
-        return respond(200, {"slots": available})
+        return respond_cached({"slots": available, **page}, event, CACHE_CONTROL)
 
     except ClientError:
         return respond(500, {"message": "Something went wrong. Please try again."})
 
 
-def respond(status_code: int, body: dict) -> dict:
-    return {
-        "statusCode": status_code,
-        "headers": {
-            "Content-Type": "application/json",
-            "Access-Control-Allow-Origin": ALLOWED_ORIGIN,
-            "Access-Control-Allow-Credentials": "true",
-        },
-        "body": json.dumps(body),
-    }
+def read_calendar(business_id: str, service_id: str, first_date: str, last_date: str, days: int):
+    """Slots from the precomputed calendar, or None if any day is missing."""
+    rows = repository.availability_days(SLOT_CALENDAR_TABLE, business_id, service_id, first_date, last_date)
+    if len(rows) != days or None in rows:
+        return None
+    return [slot for row in rows for slot in row.slots()]
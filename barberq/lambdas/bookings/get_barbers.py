@@ -1,39 +1,59 @@
-import json
 import os
-import boto3
+from boto3.dynamodb.conditions import Key
 from botocore.exceptions import ClientError
+from barberq_common import aws
+from barberq_common.directory import BARBERS_NAME_INDEX, LISTING
+from barberq_common.http import cache_control, decode_cursor, encode_cursor, respond, respond_cached
+from barberq_common.metrics import instrument
 
-cognito = boto3.client("cognito-idp")
-BUSINESS_POOL_ID = os.environ["BUSINESS_POOL_ID"]
-ALLOWED_ORIGIN = os.environ["ALLOWED_ORIGIN"]
+table = aws.table(os.environ["BARBERS_TABLE"])
 
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
 
+# The directory changes only when a business signs up
+CACHE_CONTROL = cache_control(60, stale_while_revalidate=300)
+
+
+@instrument
 def handler(event, context):
     try:
-        barbers = []
-        paginator = cognito.get_paginator("list_users")
-        for page in paginator.paginate(UserPoolId=BUSINESS_POOL_ID):
-            for user in page["Users"]:
-                user_id = user["Username"]
-                email = next(
-                    (a["Value"] for a in user["Attributes"] if a["Name"] == "email"),
-                    user_id,
-                )
-                barbers.append({"businessId": user_id, "name": email})
-
-        return respond(200, {"barbers": barbers})
+        query_params = event.get("queryStringParameters") or {}
+        search = (query_params.get("q") or "").strip().lower()
+        try:
+            limit = int(query_params.get("limit") or DEFAULT_LIMIT)
+            start_key = decode_cursor(query_params.get("cursor"))
+        except ValueError:
+            return respond(400, {"message": "Invalid limit or cursor."})
+        if not 1 <= limit <= MAX_LIMIT:
+            return respond(400, {"message": f"limit must be between 1 and {MAX_LIMIT}."})
+        if start_key and start_key.get("listing") != LISTING:
+            return respond(400, {"message": "Invalid cursor."})
 
-    except ClientError:
-        return respond(500, {"message": "Something went wrong. Please try again."})
+        key_condition = Key("listing").eq(LISTING)
+        if search:
+            key_condition &= Key("nameKey").begins_with(search)
 
+        kwargs = {
+            "IndexName": BARBERS_NAME_INDEX,
+            "KeyConditionExpression": key_condition,
+            "ProjectionExpression": "businessId, #n",
+            "ExpressionAttributeNames": {"#n": "name"},
+            "Limit": limit,
+        }
+        if start_key:
+            kwargs["ExclusiveStartKey"] = start_key
+        result = table.query(**kwargs)
 
-def respond(status_code: int, body: dict) -> dict:
-    return {
-        "statusCode": status_code,
-        "headers": {
-            "Content-Type": "application/json",
-            "Access-Control-Allow-Origin": ALLOWED_ORIGIN,
-            "Access-Control-Allow-Credentials": "true",
-        },
-        "body": json.dumps(body),
-    }
+        barbers = [
+            {"businessId": item["businessId"], "name": item["name"]}
+            for item in result.get("Items", [])
+        ]
+
+        return respond_cached({
+            "barbers": barbers,
+            "nextCursor": encode_cursor(result.get("LastEvaluatedKey")),
+        }, event, CACHE_CONTROL)
+
+    except ClientError:
+        return respond(500, {"message": "Something went wrong. Please try again."})
@@ -1,47 +1,31 @@
-import json
 import os
-import boto3
-from boto3.dynamodb.conditions import Key
 from botocore.exceptions import ClientError
+from barberq_common import aws
+from barberq_common.http import cache_control, respond, respond_cached
+from barberq_common.metrics import instrument
+from barberq_common.read_cache import load_services, log_stats, meta_version, shared_cache
 
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table(os.environ["SERVICES_TABLE"])
-ALLOWED_ORIGIN = os.environ["ALLOWED_ORIGIN"]
+SERVICES_TABLE = os.environ["SERVICES_TABLE"]
+meta_table = aws.table(os.environ["BUSINESS_META_TABLE"])
 
+CACHE_CONTROL = cache_control(60, stale_while_revalidate=600)
 
+services_cache = shared_cache("services", load_services(SERVICES_TABLE), meta_version(meta_table, "servicesVersion"))
+
+
+@instrument
 def handler(event, context):
     try:
         business_id = (event.get("pathParameters") or {}).get("businessId")
         if not business_id:
             return respond(400, {"message": "Missing businessId."})
 
-        result = table.query(
-            KeyConditionExpression=Key("businessId").eq(business_id)
-        )
-
-        services = [
-            {
-                "serviceId": item["serviceId"],
-                "name": item["name"],
-                "price": float(item["price"]),
-                "durationMinutes": int(item["durationMinutes"]),
-            }
-            for item in result.get("Items", [])
-        ]
+        services = services_cache.get(business_id)
+        log_stats(services_cache)
 
-        return respond(200, {"services": services})
+        # add_service bumps the version, so it identifies the list without hashing it
+        etag = f'"services-{services_cache.version(business_id)}"'
+        return respond_cached({"services": [s.as_dict() for s in services.values()]}, event, CACHE_CONTROL, etag=etag)
 
     except ClientError:
         return respond(500, {"message": "Something went wrong. Please try again."})
-
-
-def respond(status_code: int, body: dict) -> dict:
-    return {
-        "statusCode": status_code,
-        "headers": {
-            "Content-Type": "application/json",
-            "Access-Control-Allow-Origin": ALLOWED_ORIGIN,
-            "Access-Control-Allow-Credentials": "true",
-        },
-        "body": json.dumps(body),
-    }
@@ -0,0 +1,135 @@
+import os
+from botocore.exceptions import ClientError
+from datetime import date, timedelta
+from barberq_common import repository
+from barberq_common.auth import BUSINESS, extract_sub
+from barberq_common.booking_stats import day_key, month_key
+from barberq_common.http import respond
+from barberq_common.metrics import instrument
+from barberq_common.read_cache import log_stats, shared_schedule_cache
+from barberq_common.records import PeriodStats
+from barberq_common.slot_reads import parse_date
+
+BUSINESS_STATS_TABLE = os.environ["BUSINESS_STATS_TABLE"]
+SCHEDULES_TABLE = os.environ["SCHEDULES_TABLE"]
+
+MAX_DAYS = 92
+MAX_MONTHS = 24
+
+schedule_cache = shared_schedule_cache(SCHEDULES_TABLE)
+
+
+@instrument
+def handler(event, context):
+    """Dashboard counters per day (?granularity=day, default) or month, from one query.
+
+    from/to are dates (YYYY-MM-DD). The defaults are the current month by
+    day, or the last 12 months by month. openMinutes and utilisation use the
+    current working hours, including for past periods.
+    """
+    try:
+        business_id = extract_sub(event, BUSINESS)
+        if not business_id:
+            return respond(401, {"message": "Unauthorized."})
+
+        query_params = event.get("queryStringParameters") or {}
+        granularity = query_params.get("granularity") or "day"
+        if granularity not in ("day", "month"):
+            return respond(400, {"message": "granularity must be day or month."})
+        try:
+            first_day, last_day = resolve_range(granularity, query_params.get("from"), query_params.get("to"))
+        except ValueError as e:
+            return respond(400, {"message": str(e)})
+
+        periods = day_periods(first_day, last_day) if granularity == "day" else month_periods(first_day, last_day)
+        found = repository.period_stats(BUSINESS_STATS_TABLE, business_id, periods[0][0], periods[-1][0])
+        schedule = schedule_cache.get(business_id)
+        log_stats(schedule_cache)
+
+        rows = []
+        total = PeriodStats("total")
+        total_open = 0
+        for key, days in periods:
+            stats = found.get(key) or PeriodStats(key)
+            open_minutes = sum(schedule.open_minutes(d) for d in days)
+            rows.append(row(key.split("#", 1)[1], stats, open_minutes))
+            total.bookings += stats.bookings
+            total.booked_minutes += stats.booked_minutes
+            total.revenue_cents += stats.revenue_cents
+            total.cancelled += stats.cancelled
+            total_open += open_minutes
+
+        return respond(200, {
+            "granularity": granularity,
+            "from": first_day.strftime("%Y-%m-%d"),
+            "to": last_day.strftime("%Y-%m-%d"),
+            "periods": rows,
+            "totals": row(None, total, total_open),
+        }, event=event)
+
+    except ClientError:
+        return respond(500, {"message": "Something went wrong. Please try again."})
+
+
+def resolve_range(granularity: str, from_value, to_value):
+    """(first_day, last_day) for the request, month ranges widened to whole months."""
+    today = date.today()
+    try:
+        first_day = parse_date(from_value)
+        last_day = parse_date(to_value)
+    except ValueError:
+        raise ValueError("Invalid from or to.")
+
+    if granularity == "day":
+        first_day = first_day or today.replace(day=1)
+        last_day = last_day or month_end(first_day)
+        if last_day < first_day or (last_day - first_day).days >= MAX_DAYS:
+            raise ValueError(f"from and to must span 1 to {MAX_DAYS} days.")
+        return first_day, last_day
+
+    last_day = month_end(last_day or today)
+    first_day = (first_day or add_months(last_day, -11)).replace(day=1)
+    months = (last_day.year - first_day.year) * 12 + last_day.month - first_day.month + 1
+    if not 1 <= months <= MAX_MONTHS:
+        raise ValueError(f"from and to must span 1 to {MAX_MONTHS} months.")
+    return first_day, last_day
+
+
+def day_periods(first_day: date, last_day: date) -> list:
+    """[(period key, [day])] for each day."""
+    days = [first_day + timedelta(days=i) for i in range((last_day - first_day).days + 1)]
+    return [(day_key(d.strftime("%Y-%m-%d")), [d]) for d in days]
+
+
+def month_periods(first_day: date, last_day: date) -> list:
+    """[(period key, [days in the month])] for each month."""
+    periods = []
+    month = first_day
+    while month <= last_day:
+        end = month_end(month)
+        days = [month + timedelta(days=i) for i in range((end - month).days + 1)]
+        periods.append((month_key(month.strftime("%Y-%m-%d")), days))
+        month = end + timedelta(days=1)
+    return periods
+
+
+def row(period, stats: PeriodStats, open_minutes: int) -> dict:
+    result = {
+        "bookings": stats.bookings,
+        "bookedMinutes": stats.booked_minutes,
+        "openMinutes": open_minutes,
+        "utilisation": round(stats.booked_minutes / open_minutes, 3) if open_minutes else None,
+        "revenue": stats.revenue_cents / 100,
+        "cancelled": stats.cancelled,
+    }
+    return {"period": period, **result} if period else result
+
+
+def month_end(day: date) -> date:
+    return add_months(day.replace(day=1), 1) - timedelta(days=1)
+
+
+def add_months(day: date, months: int) -> date:
+    """The first of the month ``months`` after ``day``'s month."""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
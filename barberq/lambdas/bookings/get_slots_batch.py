@@ -0,0 +1,95 @@
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError
+from barberq_common import repository
+from barberq_common.http import cache_control, respond, respond_cached
+from barberq_common.metrics import instrument, phase, propagate
+from barberq_common.read_cache import log_stats, shared_schedule_cache
+from barberq_common.slot_engine import Horizon
+from barberq_common.slot_reads import parse_step, resolve_window
+
+SERVICES_TABLE = os.environ["SERVICES_TABLE"]
+SCHEDULES_TABLE = os.environ["SCHEDULES_TABLE"]
+BOOKINGS_TABLE = os.environ["BOOKINGS_TABLE"]
+
+MAX_PAIRS = 20
+CACHE_CONTROL = cache_control(15, stale_while_revalidate=45)
+
+schedule_cache = shared_schedule_cache(SCHEDULES_TABLE)
+
+# Reads are network-bound, so threads overlap them despite the GIL
+pool = ThreadPoolExecutor(max_workers=16)
+
+
+@instrument
+def handler(event, context):
+    try:
+        query_params = event.get("queryStringParameters") or {}
+
+        try:
+            pairs = parse_pairs(query_params.get("pairs"))
+            step = parse_step(query_params.get("step"))
+            first_day, last_day, page = resolve_window(query_params)
+        except ValueError as e:
+            return respond(400, {"message": str(e)})
+
+        if first_day > last_day:
+            results = [{"businessId": b, "serviceId": s, "slots": []} for b, s in pairs]
+            return respond_cached({"results": results, **page}, event, CACHE_CONTROL)
+
+        # Start every read at once: one batch for the services, then hours and bookings per business
+        business_ids = list(dict.fromkeys(b for b, _ in pairs))
+        services_job = pool.submit(propagate(repository.service_durations), SERVICES_TABLE, pairs)
+        schedule_jobs = {b: pool.submit(propagate(schedule_cache.get), b) for b in business_ids}
+        busy_jobs = {
+            b: pool.submit(propagate(repository.booked_intervals), BOOKINGS_TABLE, b, page["from"], page["to"])
+            for b in business_ids
+        }
+        with phase("reads"):
+            services = services_job.result()
+            schedules = {b: job.result() for b, job in schedule_jobs.items()}
+            busy = {b: job.result() for b, job in busy_jobs.items()}
+
+        # Durations wanted per business, so shared masks are built once per business
+        durations = defaultdict(set)
+        for b, s in pairs:
+            if (b, s) in services:
+                durations[b].add(services[(b, s)])
+
+        days = (last_day - first_day).days + 1
+        slots = {}
+        with phase("compute"):
+            for b in business_ids:
+                if durations[b]:
+                    schedule = schedules[b]
+                    horizon = Horizon(first_day, days, schedule.weekly, busy[b], schedule.overrides)
+                    slots[b] = horizon.slots_for(durations[b], step)
+        log_stats(schedule_cache)
+
+        results = []
+        for b, s in pairs:
+            if (b, s) not in services:
+                results.append({"businessId": b, "serviceId": s, "error": "Service not found."})
+            else:
+                results.append({"businessId": b, "serviceId": s, "slots": slots[b][services[(b, s)]]})
+
+        return respond_cached({"results": results, **page}, event, CACHE_CONTROL)
+
+    except ClientError:
+        return respond(500, {"message": "Something went wrong. Please try again."})
+
+
+def parse_pairs(value) -> list:
+    """Distinct (businessId, serviceId) pairs from "b1:s1,b2:s2", in request order."""
+    pairs = []
+    for part in (value or "").split(","):
+        business_id, sep, service_id = part.strip().partition(":")
+        if not sep or not business_id or not service_id:
+            raise ValueError("pairs must be businessId:serviceId entries separated by commas.")
+        pairs.append((business_id, service_id))
+    pairs = list(dict.fromkeys(pairs))
+    if len(pairs) > MAX_PAIRS:
+        raise ValueError(f"At most {MAX_PAIRS} pairs per request.")
+    return pairs
+
@@ -1,69 +1,52 @@
-import json
 import os
-import base64
-import boto3
-from boto3.dynamodb.conditions import Key, Attr
 from botocore.exceptions import ClientError
 from datetime import date
+from barberq_common import repository
+from barberq_common.auth import BUSINESS, extract_sub
+from barberq_common.http import decode_cursor, encode_cursor, respond
+from barberq_common.metrics import instrument
+from barberq_common.slot_reads import parse_date
 
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table(os.environ["BOOKINGS_TABLE"])
-ALLOWED_ORIGIN = os.environ["ALLOWED_ORIGIN"]
+BOOKINGS_TABLE = os.environ["BOOKINGS_TABLE"]
 
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
 
+
+@instrument
 def handler(event, context):
     try:
-        business_id = extract_sub(event)
+        business_id = extract_sub(event, BUSINESS)
         if not business_id:
             return respond(401, {"message": "Unauthorized."})
 
-        today = date.today().strftime("%Y-%m-%d")
-
-        result = table.query(
-            KeyConditionExpression=Key("businessId").eq(business_id),
-            FilterExpression=Attr("date").gte(today) & Attr("status").eq("confirmed"),
-        )
-
-        bookings = sorted(
-            [
-                {
-                    "bookingId": item["bookingId"],
-                    "date": item["date"],
-                    "startTime": item["startTime"],
-                    "endTime": item["endTime"],
-                    "serviceName": item["serviceName"],
-                    "clientId": item["clientId"],
-                }
-                for item in result.get("Items", [])
-            ],
-            key=lambda b: (b["date"], b["startTime"]),
-        )
-
-        return respond(200, {"bookings": bookings})
+        query_params = event.get("queryStringParameters") or {}
+        try:
+            first_day = parse_date(query_params.get("from")) or date.today()
+            last_day = parse_date(query_params.get("to"))
+        except ValueError:
+            return respond(400, {"message": "Invalid from or to."})
+        if last_day and last_day < first_day:
+            return respond(400, {"message": "from must not be after to."})
+        date_from = first_day.strftime("%Y-%m-%d")
+        date_to = last_day.strftime("%Y-%m-%d") if last_day else None
+        try:
+            limit = int(query_params.get("limit") or DEFAULT_LIMIT)
+            start_key = decode_cursor(query_params.get("cursor"))
+        except ValueError:
+            return respond(400, {"message": "Invalid limit or cursor."})
+        if not 1 <= limit <= MAX_LIMIT:
+            return respond(400, {"message": f"limit must be between 1 and {MAX_LIMIT}."})
+        if start_key and start_key.get("businessId") != business_id:
+            return respond(400, {"message": "Invalid cursor."})
+
+        # The index is ordered by date#startTime, so no sort is needed
+        bookings, last_key = repository.bookings_page(BOOKINGS_TABLE, business_id, date_from, date_to, limit, start_key)
+
+        return respond(200, {
+            "bookings": [b.as_dict() for b in bookings],
+            "nextCursor": encode_cursor(last_key),
+        }, event=event)
 
     except ClientError:
         return respond(500, {"message": "Something went wrong. Please try again."})
-
-
-def extract_sub(event):
-    try:
-        auth = event.get("headers", {}).get("Authorization", "")
-        token = auth.removeprefix("Bearer ")
-        payload_b64 = token.split(".")[1]
-        payload_b64 += "=" * (-len(payload_b64) % 4)
-        payload = json.loads(base64.urlsafe_b64decode(payload_b64))
-        return payload.get("sub")
-    except Exception:
-        return None
-
-
-def respond(status_code: int, body: dict) -> dict:
-    return {
-        "statusCode": status_code,
-        "headers": {
-            "Content-Type": "application/json",
-            "Access-Control-Allow-Origin": ALLOWED_ORIGIN,
-            "Access-Control-Allow-Credentials": "true",
-        },
-        "body": json.dumps(body),
-    }
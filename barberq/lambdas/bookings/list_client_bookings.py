@@ -0,0 +1,57 @@
+import os
+from botocore.exceptions import ClientError
+from datetime import date
+from barberq_common import repository
+from barberq_common.auth import CLIENTS, extract_sub
+from barberq_common.http import decode_cursor, encode_cursor, respond
+from barberq_common.metrics import instrument
+
+BOOKINGS_TABLE = os.environ["BOOKINGS_TABLE"]
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+@instrument
+def handler(event, context):
+    """The signed-in client's bookings, ?when=upcoming (default) or ?when=past.
+
+    Bookings expire BOOKING_HISTORY_DAYS after they end (the table's TTL),
+    so that is how far back past goes.
+    """
+    try:
+        client_id = extract_sub(event, CLIENTS)
+        if not client_id:
+            return respond(401, {"message": "Unauthorized."})
+
+        query_params = event.get("queryStringParameters") or {}
+        when = query_params.get("when") or "upcoming"
+        if when not in ("upcoming", "past"):
+            return respond(400, {"message": "when must be upcoming or past."})
+        try:
+            limit = int(query_params.get("limit") or DEFAULT_LIMIT)
+            start_key = decode_cursor(query_params.get("cursor"))
+        except ValueError:
+            return respond(400, {"message": "Invalid limit or cursor."})
+        if not 1 <= limit <= MAX_LIMIT:
+            return respond(400, {"message": f"limit must be between 1 and {MAX_LIMIT}."})
+        if start_key and start_key.get("clientId") != client_id:
+            return respond(400, {"message": "Invalid cursor."})
+
+        # The index is ordered by date#startTime, so today's date splits upcoming from past
+        bookings, last_key = repository.client_bookings_page(
+            BOOKINGS_TABLE,
+            client_id,
+            date.today().strftime("%Y-%m-%d"),
+            when == "upcoming",
+            limit,
+            start_key,
+        )
+
+        return respond(200, {
+            "bookings": [b.as_dict() for b in bookings],
+            "nextCursor": encode_cursor(last_key),
+        }, event=event)
+
+    except ClientError:
+        return respond(500, {"message": "Something went wrong. Please try again."})
@@ -0,0 +1,212 @@
+import os
+from boto3.dynamodb.conditions import Attr
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.exceptions import ClientError
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from barberq_common import aws, repository
+from barberq_common.slot_engine import Horizon, to_minutes
+from barberq_common.slot_reads import HORIZON_DAYS, parse_date
+
+SERVICES_TABLE = os.environ["SERVICES_TABLE"]
+SCHEDULES_TABLE = os.environ["SCHEDULES_TABLE"]
+BOOKINGS_TABLE = os.environ["BOOKINGS_TABLE"]
+services_table = aws.table(SERVICES_TABLE)
+calendar_table = aws.table(os.environ["SLOT_CALENDAR_TABLE"])
+
+deserializer = TypeDeserializer()
+
+
+def handler(event, context):
+    """Keep the slot calendar in step with the services, schedules and bookings tables.
+
+    Stream records are folded into per-business work (days to recompute and
+    services to refresh) so each business is read once per batch. Invoke with
+    {"action": "rebuild", "businessId": ...} to rewrite a business's whole
+    calendar.
+    """
+    if event.get("action") == "rebuild":
+        business_id = event["businessId"]
+        days = rebuild(business_id)
+        return {"businessId": business_id, "days": days}
+
+    work = defaultdict(lambda: {"dates": set(), "schedule": False, "services": set(), "bookings": {}})
+    for record in event.get("Records", []):
+        table_name = record["eventSourceARN"].split(":table/")[1].split("/")[0]
+        ddb = record["dynamodb"]
+        keys = unmarshal(ddb["Keys"])
+        new = unmarshal(ddb.get("NewImage"))
+        old = unmarshal(ddb.get("OldImage"))
+        business_work = work[keys["businessId"]]
+
+        if table_name == BOOKINGS_TABLE:
+            for image in (old, new):
+                if image and image.get("date"):
+                    business_work["dates"].add(image["date"])
+            # The booking index may lag the stream; carry the latest image along
+            business_work["bookings"][keys["bookingId"]] = new
+        elif table_name == SCHEDULES_TABLE:
+            # Weekly hours or overrides changed — any day in the horizon may differ
+            business_work["schedule"] = True
+        elif table_name == SERVICES_TABLE:
+            business_work["services"].add(keys["serviceId"])
+
+    for business_id, business_work in work.items():
+        apply_changes(business_id, business_work)
+
+    return {"businesses": len(work)}
+
+
+def rebuild(business_id: str) -> int:
+    """Recompute and overwrite every day of a business's calendar."""
+    first_day, last_day = horizon_bounds()
+    dates = {
+        (first_day + timedelta(days=i)).strftime("%Y-%m-%d")
+        for i in range((last_day - first_day).days + 1)
+    }
+    write_days(business_id, dates, {})
+    return len(dates)
+
+
+def apply_changes(business_id: str, business_work: dict) -> None:
+    first_day, last_day = horizon_bounds()
+    first_str, last_str = first_day.strftime("%Y-%m-%d"), last_day.strftime("%Y-%m-%d")
+
+    if business_work["schedule"]:
+        dates = {
+            (first_day + timedelta(days=i)).strftime("%Y-%m-%d")
+            for i in range((last_day - first_day).days + 1)
+        }
+    else:
+        dates = {d for d in business_work["dates"] if first_str <= d <= last_str}
+
+    if dates:
+        write_days(business_id, dates, business_work["bookings"])
+
+    # Days rewritten above already carry every service
+    for service_id in business_work["services"]:
+        refresh_service(business_id, service_id, skip_dates=dates)
+
+
+def write_days(business_id: str, dates: set, pending_bookings: dict) -> None:
+    """Recompute whole day items (all services) for the given dates."""
+    services = {
+        service_id: service.duration
+        for service_id, service in repository.services(SERVICES_TABLE, business_id).items()
+    }
+    schedule = repository.schedule(SCHEDULES_TABLE, business_id)
+    first_str, last_str = min(dates), max(dates)
+    busy = load_busy(business_id, first_str, last_str, pending_bookings)
+
+    first_day = parse_date(first_str)
+    horizon = Horizon(
+        first_day,
+        (parse_date(last_str) - first_day).days + 1,
+        schedule.weekly,
+        busy,
+        schedule.overrides,
+    )
+    starts = {
+        service_id: starts_by_date(horizon, duration)
+        for service_id, duration in services.items()
+    }
+
+    with calendar_table.batch_writer() as batch:
+        for date_str in dates:
+            batch.put_item(Item={
+                "businessId": business_id,
+                "date": date_str,
+                "services": {
+                    service_id: {
+                        "durationMinutes": services[service_id],
+                        "starts": by_date.get(date_str, []),
+                    }
+                    for service_id, by_date in starts.items()
+                },
+                "ttl": day_end_ttl(date_str),
+            })
+
+
+def refresh_service(business_id: str, service_id: str, skip_dates: set) -> None:
+    """Update (or drop) one service's entry on every materialized day."""
+    svc = services_table.get_item(
+        Key={"businessId": business_id, "serviceId": service_id}
+    ).get("Item")
+
+    first_day, last_day = horizon_bounds()
+    by_date = {}
+    if svc:
+        duration = int(svc["durationMinutes"])
+        first_str, last_str = first_day.strftime("%Y-%m-%d"), last_day.strftime("%Y-%m-%d")
+        schedule = repository.schedule(SCHEDULES_TABLE, business_id)
+        horizon = Horizon(
+            first_day,
+            (last_day - first_day).days + 1,
+            schedule.weekly,
+            load_busy(business_id, first_str, last_str, {}),
+            schedule.overrides,
+        )
+        by_date = starts_by_date(horizon, duration)
+
+    for i in range((last_day - first_day).days + 1):
+        date_str = (first_day + timedelta(days=i)).strftime("%Y-%m-%d")
+        if date_str in skip_dates:
+            continue
+        if svc:
+            update = {
+                "UpdateExpression": "SET services.#sid = :entry",
+                "ExpressionAttributeValues": {
+                    ":entry": {"durationMinutes": duration, "starts": by_date.get(date_str, [])},
+                },
+            }
+        else:
+            update = {"UpdateExpression": "REMOVE services.#sid"}
+        try:
+            calendar_table.update_item(
+                Key={"businessId": business_id, "date": date_str},
+                ExpressionAttributeNames={"#sid": service_id},
+                ConditionExpression=Attr("businessId").exists(),
+                **update,
+            )
+        except ClientError as e:
+            # Day not materialized yet — readers compute it live until a rebuild
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+
+
+def starts_by_date(horizon: Horizon, duration: int) -> dict:
+    by_date = defaultdict(list)
+    for slot in horizon.slots(duration):
+        by_date[slot["date"]].append(to_minutes(slot["startTime"]))
+    return by_date
+
+
+def load_busy(business_id: str, first_date: str, last_date: str, pending_bookings: dict) -> dict:
+    """Confirmed booking intervals by date, with stream images overriding the index."""
+    bookings = repository.confirmed_slots(BOOKINGS_TABLE, business_id, first_date, last_date)
+    for booking_id, image in pending_bookings.items():
+        if image and image.get("status") == "confirmed":
+            bookings[booking_id] = (image["date"], image["startTime"], image["endTime"])
+        else:
+            bookings.pop(booking_id, None)
+
+    busy = defaultdict(list)
+    for day, start, end in bookings.values():
+        busy[day].append((to_minutes(start), to_minutes(end)))
+    return busy
+
+
+def horizon_bounds():
+    today = date.today()
+    return today + timedelta(days=1), today + timedelta(days=HORIZON_DAYS)
+
+
+def day_end_ttl(date_str: str) -> int:
+    end = datetime.combine(parse_date(date_str) + timedelta(days=1), time.min, tzinfo=timezone.utc)
+    return int(end.timestamp())
+
+
+def unmarshal(image):
+    if not image:
+        return None
+    return {k: deserializer.deserialize(v) for k, v in image.items()}
@@ -0,0 +1 @@
+"""Code shared by the BarberQ Lambdas, shipped as a Lambda layer."""
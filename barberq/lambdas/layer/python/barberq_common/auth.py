@@ -0,0 +1,178 @@
+"""Local verification of Cognito access tokens.
+
+Tokens are checked against the user pool's JWKS (RS256, PKCS#1 v1.5), which
+is fetched once per container and refetched when a token names an unknown
+kid. Verified claims are kept in a small LRU until the token expires, so a
+returning caller costs one dict lookup. Each pool is configured with
+<POOL>_USER_POOL_ID and <POOL>_APP_CLIENT_ID (CLIENTS or BUSINESS); a
+token from the other pool or app client is rejected.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+
+from .http import header
+from .metrics import phase
+
+# DER prefix of DigestInfo for SHA-256 (RFC 8017, section 9.2)
+SHA256_DIGEST_INFO = bytes.fromhex("3031300d060960864801650304020105000420")
+
+JWKS_TIMEOUT_SECONDS = 3
+JWKS_MIN_REFRESH_SECONDS = 60
+CLAIMS_CACHE_SIZE = 1024
+
+CLIENTS = "CLIENTS"
+BUSINESS = "BUSINESS"
+
+# Set by the login handlers, read by refresh and logout; matches the app clients' refresh token validity
+REFRESH_COOKIE = "refreshToken"
+REFRESH_COOKIE_MAX_AGE = 30 * 24 * 3600
+
+
+class InvalidToken(Exception):
+    pass
+
+
+def b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def b64url_int(segment: str) -> int:
+    return int.from_bytes(b64url_decode(segment), "big")
+
+
+def rs256_valid(signing_input: bytes, signature: bytes, n: int, e: int) -> bool:
+    """RSASSA-PKCS1-v1_5 verification with SHA-256."""
+    k = (n.bit_length() + 7) // 8
+    if len(signature) != k:
+        return False
+    s = int.from_bytes(signature, "big")
+    if s >= n:
+        return False
+    encoded = pow(s, e, n).to_bytes(k, "big")
+    t = SHA256_DIGEST_INFO + hashlib.sha256(signing_input).digest()
+    if k < len(t) + 11:
+        return False
+    expected = b"\x00\x01" + b"\xff" * (k - len(t) - 3) + b"\x00" + t
+    return hmac.compare_digest(encoded, expected)
+
+
+class TokenVerifier:
+    """Verifies access tokens issued by one user pool to one app client."""
+
+    def __init__(self, region: str, user_pool_id: str, client_id: str):
+        self.issuer = f"https://cognito-idp.{region}.amazonaws.com/{user_pool_id}"
+        self.jwks_url = f"{self.issuer}/.well-known/jwks.json"
+        self.client_id = client_id
+        self.keys = {}
+        self.keys_fetched_at = 0.0
+        self.claims = OrderedDict()
+        self.lock = threading.Lock()
+
+    def verify(self, token: str) -> dict:
+        """Return the token's claims, or raise InvalidToken."""
+        now = time.time()
+        with self.lock:
+            cached = self.claims.get(token)
+            if cached is not None:
+                if cached["exp"] > now:
+                    self.claims.move_to_end(token)
+                    return cached
+                del self.claims[token]
+
+        claims = self._verify_uncached(token, now)
+
+        with self.lock:
+            self.claims[token] = claims
+            if len(self.claims) > CLAIMS_CACHE_SIZE:
+                self.claims.popitem(last=False)
+        return claims
+
+    def _verify_uncached(self, token: str, now: float) -> dict:
+        try:
+            header_b64, payload_b64, signature_b64 = token.split(".")
+            jwt_header = json.loads(b64url_decode(header_b64))
+            claims = json.loads(b64url_decode(payload_b64))
+            signature = b64url_decode(signature_b64)
+        except (ValueError, TypeError):
+            raise InvalidToken("Malformed token.")
+
+        if not isinstance(jwt_header, dict) or not isinstance(claims, dict):
+            raise InvalidToken("Malformed token.")
+        alg, kid = jwt_header.get("alg"), jwt_header.get("kid")
+        # Anything but strings here is forged; a list kid would not even hash
+        if not isinstance(alg, str) or not isinstance(kid, str):
+            raise InvalidToken("Malformed token header.")
+        if alg != "RS256":
+            raise InvalidToken("Unsupported algorithm.")
+
+        key = self._key(kid)
+        if key is None:
+            raise InvalidToken("Unknown signing key.")
+        if not rs256_valid(f"{header_b64}.{payload_b64}".encode(), signature, *key):
+            raise InvalidToken("Bad signature.")
+
+        if claims.get("iss") != self.issuer:
+            raise InvalidToken("Token is from another user pool.")
+        if claims.get("token_use") != "access":
+            raise InvalidToken("Not an access token.")
+        if claims.get("client_id") != self.client_id:
+            raise InvalidToken("Token is for another app client.")
+        if not isinstance(claims.get("exp"), (int, float)) or claims["exp"] <= now:
+            raise InvalidToken("Token has expired.")
+        if not isinstance(claims.get("sub"), str):
+            raise InvalidToken("Token has no subject.")
+        return claims
+
+    def _key(self, kid):
+        key = self.keys.get(kid)
+        if key is None and time.time() - self.keys_fetched_at >= JWKS_MIN_REFRESH_SECONDS:
+            # Pool keys rotated (or first use) — refetch, but not on every bogus kid
+            self._refresh_keys()
+            key = self.keys.get(kid)
+        return key
+
+    def _refresh_keys(self) -> None:
+        with urllib.request.urlopen(self.jwks_url, timeout=JWKS_TIMEOUT_SECONDS) as resp:
+            jwks = json.loads(resp.read())
+        keys = {
+            jwk["kid"]: (b64url_int(jwk["n"]), b64url_int(jwk["e"]))
+            for jwk in jwks.get("keys", [])
+            if jwk.get("kty") == "RSA" and jwk.get("alg", "RS256") == "RS256"
+        }
+        with self.lock:
+            self.keys = keys
+            self.keys_fetched_at = time.time()
+
+
+_verifiers = {}
+
+
+def verifier(pool: str) -> TokenVerifier:
+    v = _verifiers.get(pool)
+    if v is None:
+        v = _verifiers[pool] = TokenVerifier(
+            os.environ["AWS_REGION"],
+            os.environ[f"{pool}_USER_POOL_ID"],
+            os.environ[f"{pool}_APP_CLIENT_ID"],
+        )
+    return v
+
+
+def extract_sub(event, pool: str):
+    """Verify the bearer token from the Authorization header against a pool and return its sub claim."""
+    token = (header(event, "Authorization") or "").removeprefix("Bearer ")
+    if not token:
+        return None
+    try:
+        with phase("auth"):
+            return verifier(pool).verify(token).get("sub")
+    except (InvalidToken, OSError, ValueError, KeyError):
+        # OSError covers an unreachable JWKS endpoint; fail closed
+        return None
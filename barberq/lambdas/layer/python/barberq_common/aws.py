@@ -0,0 +1,96 @@
+"""Lazily built AWS clients and tables, shared from one botocore session.
+
+Nothing is constructed at import time: a handler that returns early (bad
+input, missing token) never loads a service model, and a handler that
+touches one of several tables only pays for that one. Low-level clients
+are thread-safe and shared; boto3 resources are not, so tables are built
+once per thread.
+"""
+import threading
+
+_session = None
+_session_hooks = []
+_clients = {}
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def session():
+    """The container's single botocore session (credentials, loaders, config)."""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                import botocore.session
+                created = botocore.session.get_session()
+                for hook in _session_hooks:
+                    hook(created)
+                _session = created
+    return _session
+
+
+def on_session(hook) -> None:
+    """Run ``hook(session)`` once the shared session exists, before any client is built from it."""
+    with _lock:
+        if _session is None:
+            _session_hooks.append(hook)
+            return
+    hook(_session)
+
+
+def client(service_name: str):
+    c = _clients.get(service_name)
+    if c is None:
+        # session() takes the lock itself, so resolve it first
+        shared = session()
+        with _lock:
+            c = _clients.get(service_name)
+            if c is None:
+                c = _clients[service_name] = shared.create_client(service_name)
+    return c
+
+
+def resource(service_name: str):
+    resources = _local.__dict__.setdefault("resources", {})
+    res = resources.get(service_name)
+    if res is None:
+        import boto3.session
+        shared = session()
+        # Creating clients on one botocore session from several threads at once is not safe
+        with _lock:
+            res = resources[service_name] = boto3.session.Session(
+                botocore_session=shared
+            ).resource(service_name)
+    return res
+
+
+class LazyClient:
+    """Stands in for a low-level client; the shared one is built on first attribute access."""
+
+    def __init__(self, service_name: str):
+        self.service_name = service_name
+
+    def __getattr__(self, attr):
+        return getattr(client(self.service_name), attr)
+
+
+def lazy_client(service_name: str) -> LazyClient:
+    return LazyClient(service_name)
+
+
+class LazyTable:
+    """Stands in for a boto3 Table; the real one is built on first attribute access."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __getattr__(self, attr):
+        tables = _local.__dict__.setdefault("tables", {})
+        table = tables.get(self.name)
+        if table is None:
+            table = tables[self.name] = resource("dynamodb").Table(self.name)
+        return getattr(table, attr)
+
+
+def table(name: str) -> LazyTable:
+    return LazyTable(name)
@@ -0,0 +1,64 @@
+"""Per-business booking counters by day and month.
+
+aggregate_booking_stats folds the bookings stream into one stats-table item
+per business and period, keyed by the appointment date:
+
+    {"businessId": ..., "period": "D#2027-03-14" or "M#2027-03",
+     "bookings": 12, "bookedMinutes": 420, "revenueCents": 31500,
+     "cancelled": 1}
+
+Only confirmed bookings count. Counters change through ADD, so a period
+costs one small item however many bookings it holds, and the dashboard reads
+a whole range of periods with one query. Each applied stream record also
+leaves a short-lived "E#<eventID>" marker under its business, which sorts
+outside every D# and M# range.
+"""
+from collections import defaultdict
+
+DAY = "D"
+MONTH = "M"
+APPLIED = "E"
+COUNTERS = ("bookings", "bookedMinutes", "revenueCents", "cancelled")
+
+
+def day_key(date_str: str) -> str:
+    return f"{DAY}#{date_str}"
+
+
+def month_key(date_str: str) -> str:
+    return f"{MONTH}#{date_str[:7]}"
+
+
+def applied_key(event_id: str) -> str:
+    return f"{APPLIED}#{event_id}"
+
+
+def counters(booking: dict) -> dict:
+    """What one confirmed booking adds to each of its periods."""
+    return {
+        "bookings": 1,
+        "bookedMinutes": int(booking.get("durationMinutes", 0)),
+        # Bookings made before prices were recorded add no revenue
+        "revenueCents": int(booking.get("priceCents", 0)),
+        "cancelled": 0,
+    }
+
+
+def changes(old, new) -> dict:
+    """{(businessId, period): counter deltas} for a booking going from ``old`` to ``new``.
+
+    Either image may be None (created, deleted). A confirmed booking that
+    stops being confirmed also counts as cancelled.
+    """
+    delta = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+    for image, sign in ((old, -1), (new, 1)):
+        if image and image.get("status") == "confirmed":
+            added = counters(image)
+            for period in (day_key(image["date"]), month_key(image["date"])):
+                totals = delta[(image["businessId"], period)]
+                for name, value in added.items():
+                    totals[name] += sign * value
+    if old and new and old.get("status") == "confirmed" and new.get("status") != "confirmed":
+        for period in (day_key(old["date"]), month_key(old["date"])):
+            delta[(old["businessId"], period)]["cancelled"] += 1
+    return {k: v for k, v in delta.items() if any(v.values())}
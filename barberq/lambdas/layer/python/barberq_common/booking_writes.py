@@ -0,0 +1,103 @@
+"""Booking items and the lock-guarded transaction writes that create them.
+
+A booking locks each LOCK_BLOCK_MINUTES block its duration touches in the
+slot-locks table. The lock puts are conditional, so the transaction itself
+is the conflict check: two bookings sharing a block cannot both commit.
+
+That is only exact if every slot starts and ends on a block boundary, or
+back-to-back bookings would share the block between them. So service
+durations, working hours and slot steps are all whole blocks.
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from .slot_engine import MINUTE_LABELS, to_minutes
+
+LOCK_BLOCK_MINUTES = 5
+MAX_TRANSACT_ITEMS = 100
+# Bookings stay this long after they end, for the client's history and the dashboard
+BOOKING_HISTORY_DAYS = 365
+
+
+def end_ttl(date: str, end_time: str) -> int:
+    """Epoch seconds at a slot's end ("24:00" included), when its locks can go."""
+    day = datetime.strptime(date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    return int((day + timedelta(minutes=to_minutes(end_time))).timestamp())
+
+
+def booking_ttl(date: str, end_time: str) -> int:
+    return end_ttl(date, end_time) + BOOKING_HISTORY_DAYS * 86400
+
+
+def lock_slots(date: str, start_minutes: int, end_minutes: int) -> list:
+    """Sort keys of every lock block overlapping [start_minutes, end_minutes)."""
+    first_block = start_minutes - start_minutes % LOCK_BLOCK_MINUTES
+    return [
+        f"{date}#{MINUTE_LABELS[t]}"
+        for t in range(first_block, end_minutes, LOCK_BLOCK_MINUTES)
+    ]
+
+
+def booking_item(business_id: str, client_id: str, service, date: str, start_minutes: int, **extra) -> dict:
+    """The booking to write for a records.Service at start_minutes on date."""
+    duration = service.duration
+    start_time = MINUTE_LABELS[start_minutes]
+    end_time = MINUTE_LABELS[start_minutes + duration]
+
+    return {
+        "businessId": business_id,
+        "bookingId": str(uuid.uuid4()),
+        "clientId": client_id,
+        "serviceId": service.service_id,
+        "serviceName": service.name,
+        "date": date,
+        "startTime": start_time,
+        "endTime": end_time,
+        "durationMinutes": duration,
+        # Priced when booked, so a later price change leaves revenue alone
+        "priceCents": round((service.price or 0) * 100),
+        "status": "confirmed",
+        "statusSlot": f"confirmed#{date}#{start_time}",
+        "slot": f"{date}#{start_time}",
+        "createdAt": datetime.now(timezone.utc).isoformat(),
+        "ttl": booking_ttl(date, end_time),
+        **extra,
+    }
+
+
+def transact_items(booking: dict, locks: list, slot_locks_table: str, bookings_table: str) -> list:
+    """TransactWriteItems entries for one booking: its locks, then the booking itself.
+
+    Plain Python values are fine here; the resource's client marshals them.
+    The locks expire when the slot ends, long before the booking does.
+    """
+    lock_ttl = end_ttl(booking["date"], booking["endTime"])
+    return [
+        {
+            "Put": {
+                "TableName": slot_locks_table,
+                "Item": {
+                    "businessId": booking["businessId"],
+                    "slot": slot,
+                    "bookingId": booking["bookingId"],
+                    "ttl": lock_ttl,
+                },
+                "ConditionExpression": "attribute_not_exists(slot)",
+            }
+        }
+        for slot in locks
+    ] + [
+        {
+            "Put": {
+                "TableName": bookings_table,
+                "Item": booking,
+                "ConditionExpression": "attribute_not_exists(bookingId)",
+            }
+        }
+    ]
+
+
+def failed_conditions(error) -> list:
+    """Indexes of the transaction items whose condition failed, from a cancelled write."""
+    reasons = error.response.get("CancellationReasons", [])
+    return [i for i, r in enumerate(reasons) if r.get("Code") == "ConditionalCheckFailed"]
@@ -0,0 +1,88 @@
+"""DynamoDB consumed capacity and read amplification, per table or index.
+
+Every DynamoDB call made through barberq_common.aws asks for
+ReturnConsumedCapacity, so no call site has to. It is free and adds a few
+bytes to each response. usage() turns a response into per-table figures:
+read and write units, and for Query/Scan the page count and the items
+scanned versus returned. A scanned/returned ratio well above 1 means a
+filter or projection is throwing paid-for reads away.
+
+DYNAMODB_RETURN_CAPACITY picks the detail level: INDEXES (default), TOTAL,
+or NONE to turn the whole thing off.
+"""
+import os
+
+from . import aws
+
+RETURN_CAPACITY = os.environ.get("DYNAMODB_RETURN_CAPACITY", "INDEXES")
+
+READS = {"GetItem", "Query", "Scan", "BatchGetItem", "TransactGetItems"}
+WRITES = {"PutItem", "UpdateItem", "DeleteItem", "BatchWriteItem", "TransactWriteItems"}
+PAGED = {"Query", "Scan"}
+TARGET_KEY = "barberq_capacity_target"
+
+
+class TableUsage:
+    __slots__ = ("rcu", "wcu", "pages", "scanned", "returned")
+
+    def __init__(self):
+        self.rcu = 0.0
+        self.wcu = 0.0
+        self.pages = 0
+        self.scanned = 0
+        self.returned = 0
+
+    def add(self, other: "TableUsage") -> None:
+        self.rcu += other.rcu
+        self.wcu += other.wcu
+        self.pages += other.pages
+        self.scanned += other.scanned
+        self.returned += other.returned
+
+    def as_dict(self) -> dict:
+        d = {"rcu": round(self.rcu, 2), "wcu": round(self.wcu, 2)}
+        if self.pages:
+            d.update(pages=self.pages, scanned=self.scanned, returned=self.returned)
+        return d
+
+
+def usage(operation: str, context: dict, parsed: dict) -> dict:
+    """{table or "table/index": TableUsage} for one DynamoDB response.
+
+    ``context`` is the botocore request context the call's target was noted in.
+    """
+    table, index = context.get(TARGET_KEY, (None, None))
+    result = {}
+    consumed = parsed.get("ConsumedCapacity") or []
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    for entry in consumed:
+        name = entry.get("TableName") or table or "?"
+        if index and name == table:
+            name = f"{table}/{index}"
+        u = result.setdefault(name, TableUsage())
+        units = float(entry.get("CapacityUnits", 0))
+        if "ReadCapacityUnits" in entry or "WriteCapacityUnits" in entry:
+            u.rcu += float(entry.get("ReadCapacityUnits", 0))
+            u.wcu += float(entry.get("WriteCapacityUnits", 0))
+        elif operation in WRITES:
+            u.wcu += units
+        else:
+            u.rcu += units
+
+    if operation in PAGED:
+        u = result.setdefault(f"{table}/{index}" if index else table or "?", TableUsage())
+        u.pages += 1
+        u.scanned += parsed.get("ScannedCount", 0)
+        u.returned += parsed.get("Count", 0)
+    return result
+
+
+def _request_capacity(params, model, context, **kwargs):
+    # The after-call hooks only see the serialized request, so note the target here
+    context[TARGET_KEY] = (params.get("TableName"), params.get("IndexName"))
+    if RETURN_CAPACITY != "NONE" and (model.name in READS or model.name in WRITES):
+        params.setdefault("ReturnConsumedCapacity", RETURN_CAPACITY)
+
+
+aws.on_session(lambda session: session.register("provide-client-params.dynamodb", _request_capacity))
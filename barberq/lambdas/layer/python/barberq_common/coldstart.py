@@ -0,0 +1,106 @@
+"""Cold-start profiler that wraps a function's real handler.
+
+With profiling on, Terraform sets the function's handler to
+barberq_common.coldstart.handler. The real handler is taken from
+BARBERQ_HANDLER (module.function) or, failing that, from the function name
+(barberq-get-barbers -> get_barbers.handler). The real module is imported
+here during init with every import statement timed, and the first
+invocation logs one JSON line with the init duration, the first
+invocation's duration (lazy clients are built there), the slowest modules
+by self time, and whether init stayed within INIT_BUDGET_MS.
+"""
+import builtins
+import importlib
+import json
+import os
+import sys
+import time
+
+_started = time.perf_counter()
+_original_import = builtins.__import__
+_timings = {}
+_stack = []
+
+TOP_IMPORTS = 15
+DEFAULT_INIT_BUDGET_MS = "500"
+
+
+def _resolve(name, globals, level):
+    package = (globals or {}).get("__package__") or ""
+    if level == 0:
+        return name
+    base = package.rsplit(".", level - 1)[0] if level > 1 else package
+    return f"{base}.{name}" if name else base
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    key = _resolve(name, globals, level)
+    if key in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    # Children add their inclusive time here so each module reports self time
+    frame = [0.0]
+    _stack.append(frame)
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - start
+        _stack.pop()
+        if _stack:
+            _stack[-1][0] += elapsed
+        _timings[key] = _timings.get(key, 0.0) + elapsed - frame[0]
+
+
+def _load(target: str):
+    module_name, function_name = target.rsplit(".", 1)
+    builtins.__import__ = _timed_import
+    start = time.perf_counter()
+    try:
+        module = importlib.import_module(module_name)
+    finally:
+        builtins.__import__ = _original_import
+    return getattr(module, function_name), time.perf_counter() - start
+
+
+def _real_handler() -> str:
+    target = os.environ.get("BARBERQ_HANDLER")
+    if target:
+        return target
+    function_name = os.environ["AWS_LAMBDA_FUNCTION_NAME"]
+    return function_name.removeprefix("barberq-").replace("-", "_") + ".handler"
+
+
+_target = _real_handler()
+_handler, _import_seconds = _load(_target)
+_init_seconds = time.perf_counter() - _started
+_reported = False
+
+
+def report(first_invoke_seconds: float) -> dict:
+    budget_ms = float(os.environ.get("INIT_BUDGET_MS", DEFAULT_INIT_BUDGET_MS))
+    init_ms = round(_init_seconds * 1000, 1)
+    slowest = sorted(_timings.items(), key=lambda kv: kv[1], reverse=True)[:TOP_IMPORTS]
+    return {
+        "function": os.environ.get("AWS_LAMBDA_FUNCTION_NAME"),
+        "handler": _target,
+        "initMs": init_ms,
+        "importMs": round(_import_seconds * 1000, 1),
+        "firstInvokeMs": round(first_invoke_seconds * 1000, 1),
+        "budgetMs": budget_ms,
+        "overBudget": init_ms > budget_ms,
+        "imports": [{"module": name, "ms": round(seconds * 1000, 2)} for name, seconds in slowest],
+    }
+
+
+def handler(event, context):
+    global _reported
+    if _reported:
+        return _handler(event, context)
+
+    _reported = True
+    start = time.perf_counter()
+    try:
+        return _handler(event, context)
+    finally:
+        print(json.dumps({"coldStart": report(time.perf_counter() - start)}))
@@ -0,0 +1,23 @@
+"""Barber directory entries, as listed by get_barbers.
+
+Written by the business pool's post-confirmation trigger and by
+tools/backfill_barber_directory.py, so the key format lives here once.
+"""
+
+# Every directory entry shares one GSI partition so names can be listed in order
+LISTING = "BARBERS"
+BARBERS_NAME_INDEX = "listing-nameKey-index"
+
+
+def directory_item(business_id: str, name: str, email: str, owner_name=None) -> dict:
+    item = {
+        "businessId": business_id,
+        "name": name,
+        "email": email,
+        "listing": LISTING,
+        # Lower-cased for case-insensitive prefix search; businessId keeps it unique
+        "nameKey": f"{name.strip().lower()}#{business_id}",
+    }
+    if owner_name:
+        item["ownerName"] = owner_name
+    return item
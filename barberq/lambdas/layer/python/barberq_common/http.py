@@ -0,0 +1,172 @@
+"""Request parsing and response building shared by every API handler.
+
+Headers are built once per container. Bodies are encoded with orjson from
+the barberq-deps layer (lambdas/deps/requirements.txt, built by Terraform),
+or with a compact stdlib encoder where it is not installed, e.g. the bench;
+both serialize DynamoDB Decimals directly. Large bodies are gzipped for
+clients that accept it. Public reads go through respond_cached, which adds
+an ETag and Cache-Control and answers a matching If-None-Match with 304.
+"""
+import base64
+import gzip
+import hashlib
+import json
+import os
+from decimal import Decimal
+
+ALLOWED_ORIGIN = os.environ.get("ALLOWED_ORIGIN", "*")
+GZIP_MIN_BYTES = int(os.environ.get("GZIP_MIN_BYTES", "4096"))
+GZIP_ETAG_SUFFIX = "-gzip"
+
+HEADERS = {
+    "Content-Type": "application/json",
+    "Access-Control-Allow-Origin": ALLOWED_ORIGIN,
+    "Access-Control-Allow-Credentials": "true",
+}
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+try:
+    import orjson
+
+    def dumps(value) -> str:
+        return orjson.dumps(value, default=_default).decode()
+
+except ImportError:
+    _encoder = json.JSONEncoder(default=_default, separators=(",", ":"))
+    dumps = _encoder.encode
+
+
+def header(event, name: str):
+    """Case-insensitive header lookup (REST and HTTP APIs differ in casing)."""
+    headers = event.get("headers") or {}
+    value = headers.get(name)
+    if value is None:
+        lower = name.lower()
+        value = next((v for k, v in headers.items() if k.lower() == lower), None)
+    return value
+
+
+def cookie(event, name: str):
+    """A request cookie's value (HTTP APIs pass cookies separately, REST APIs in the header)."""
+    cookies = event.get("cookies") or []
+    raw = header(event, "Cookie")
+    if raw:
+        cookies = [*cookies, *raw.split(";")]
+    for entry in cookies:
+        key, sep, value = entry.strip().partition("=")
+        if sep and key == name:
+            return value
+    return None
+
+
+def set_cookie(name: str, value: str, max_age: int) -> str:
+    """Set-Cookie value for a cross-site, script-invisible cookie; max_age 0 deletes it."""
+    return f"{name}={value}; HttpOnly; Secure; SameSite=None; Path=/; Max-Age={max_age}"
+
+
+def json_body(event) -> dict:
+    body = event.get("body") or "{}"
+    if event.get("isBase64Encoded"):
+        body = base64.b64decode(body)
+    return json.loads(body)
+
+
+def path_params(event) -> dict:
+    return event.get("pathParameters") or {}
+
+
+def query_params(event) -> dict:
+    return event.get("queryStringParameters") or {}
+
+
+def respond(status_code: int, body: dict, headers: dict | None = None, event=None) -> dict:
+    """API Gateway proxy response. Pass the event to allow gzip for large bodies."""
+    return _response(status_code, dumps(body), headers, event)
+
+
+def cache_control(max_age: int, stale_while_revalidate: int = 0) -> str:
+    value = f"public, max-age={max_age}"
+    if stale_while_revalidate:
+        value += f", stale-while-revalidate={stale_while_revalidate}"
+    return value
+
+
+def respond_cached(body: dict, event, cache_control: str, etag: str | None = None) -> dict:
+    """200 with validators, or 304 if the client's copy is still current.
+
+    Pass an etag derived from a data version when there is one, so a 304 never
+    encodes the body; otherwise the ETag is a hash of the encoded body.
+    """
+    text = None
+    if etag is None:
+        text = dumps(body)
+        etag = f'"{hashlib.blake2b(text.encode(), digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+
+    if etag_matches(header(event, "If-None-Match"), etag):
+        return {"statusCode": 304, "headers": {**HEADERS, **headers}, "body": ""}
+    return _response(200, text if text is not None else dumps(body), headers, event)
+
+
+def etag_matches(if_none_match, etag: str) -> bool:
+    """Weak comparison, as If-None-Match requires; the gzip variant matches too."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip().removeprefix("W/")
+        if candidate == "*" or candidate.replace(GZIP_ETAG_SUFFIX, "") == etag:
+            return True
+    return False
+
+
+def _response(status_code: int, text: str, headers: dict | None, event) -> dict:
+    response_headers = {**HEADERS, **headers} if headers else HEADERS
+
+    if (
+        event is not None
+        and len(text) >= GZIP_MIN_BYTES
+        and "gzip" in (header(event, "Accept-Encoding") or "")
+    ):
+        gzip_headers = {**response_headers, "Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+        if "ETag" in gzip_headers:
+            # A strong ETag must differ between content codings
+            gzip_headers["ETag"] = gzip_headers["ETag"][:-1] + GZIP_ETAG_SUFFIX + '"'
+        return {
+            "statusCode": status_code,
+            "headers": gzip_headers,
+            "body": base64.b64encode(gzip.compress(text.encode(), compresslevel=5)).decode(),
+            "isBase64Encoded": True,
+        }
+
+    return {
+        "statusCode": status_code,
+        "headers": response_headers,
+        "body": text,
+    }
+
+
+def encode_cursor(last_key):
+    """Opaque continuation token for a LastEvaluatedKey (all string attributes)."""
+    if not last_key:
+        return None
+    return base64.urlsafe_b64encode(json.dumps(last_key).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    if not cursor:
+        return None
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except Exception:
+        raise ValueError("Invalid cursor.")
+    if not isinstance(key, dict) or not all(isinstance(v, str) for v in key.values()):
+        raise ValueError("Invalid cursor.")
+    return key
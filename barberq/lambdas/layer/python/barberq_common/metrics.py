@@ -0,0 +1,213 @@
+"""Per-invocation timings as CloudWatch Embedded Metric Format log lines.
+
+Decorate a handler with ``@instrument`` and mark the interesting parts with
+``with phase("compute"):``. Every AWS call made through barberq_common.aws
+is timed as well, and DynamoDB calls add their consumed capacity (see
+capacity.py). A sampled invocation prints one JSON line to stdout, which
+Lambda turns into metrics and which reads just as well locally:
+
+    {"_aws": {...}, "Route": "get_barber_slots", "StatusCode": "200",
+     "ColdStart": 1, "Duration": 41.2, "AwsMs": 30.5, "AwsCalls": 3,
+     "ReadUnits": 3.5, "WriteUnits": 0, "ItemsScanned": 12, "ItemsReturned": 12,
+     "computeMs": 2.1, "aws": {"dynamodb.Query": {"calls": 2, "ms": 22.9}},
+     "tables": {"barberq-bookings/businessId-statusSlot-index": {"rcu": 1.5, ...}}, ...}
+
+METRICS_SAMPLE_RATE (0-1, default 1) picks which warm invocations are
+reported; cold starts always are. Requests is 1/rate, so its Sum still
+estimates the true request count. An unsampled invocation costs one random()
+call, and phase() and the AWS hooks return at once. annotate() adds a
+property to the line that is logged but not turned into a metric (e.g. the
+read caches' counters).
+"""
+import json
+import os
+import random
+import threading
+import time
+
+from . import aws, capacity
+
+NAMESPACE = os.environ.get("METRICS_NAMESPACE", "BarberQ")
+SAMPLE_RATE = float(os.environ.get("METRICS_SAMPLE_RATE", "1"))
+
+_local = threading.local()
+_cold = True
+
+
+class Invocation:
+    __slots__ = ("route", "cold", "phases", "calls", "tables", "properties", "lock")
+
+    def __init__(self, route: str, cold: bool):
+        self.route = route
+        self.cold = cold
+        self.phases = {}
+        self.calls = {}
+        self.tables = {}
+        self.properties = {}
+        self.lock = threading.Lock()
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        with self.lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def add_call(self, operation: str, seconds: float, tables: dict | None = None) -> None:
+        with self.lock:
+            count, total = self.calls.get(operation, (0, 0.0))
+            self.calls[operation] = (count + 1, total + seconds)
+            for name, usage in (tables or {}).items():
+                self.tables.setdefault(name, capacity.TableUsage()).add(usage)
+
+    def record(self, status, seconds: float) -> dict:
+        aws_seconds = sum(total for _, total in self.calls.values())
+        phase_metrics = {f"{name}Ms": round(s * 1000, 2) for name, s in self.phases.items()}
+        total = capacity.TableUsage()
+        for usage in self.tables.values():
+            total.add(usage)
+        metrics = {
+            "Requests": round(1 / SAMPLE_RATE, 3) if SAMPLE_RATE > 0 and not self.cold else 1,
+            "ColdStart": int(self.cold),
+            "Duration": round(seconds * 1000, 2),
+            "AwsMs": round(aws_seconds * 1000, 2),
+            "AwsCalls": sum(count for count, _ in self.calls.values()),
+            "ReadUnits": round(total.rcu, 2),
+            "WriteUnits": round(total.wcu, 2),
+            "ItemsScanned": total.scanned,
+            "ItemsReturned": total.returned,
+            **phase_metrics,
+        }
+        dimensions = {"Route": self.route}
+        dimension_sets = [["Route"]]
+        if status is not None:
+            dimensions["StatusCode"] = str(status)
+            dimension_sets.append(["Route", "StatusCode"])
+        return {
+            "_aws": {
+                "Timestamp": int(time.time() * 1000),
+                "CloudWatchMetrics": [{
+                    "Namespace": NAMESPACE,
+                    "Dimensions": dimension_sets,
+                    "Metrics": [
+                        {"Name": name, "Unit": "Milliseconds" if name == "Duration" or name.endswith("Ms") else "Count"}
+                        for name in metrics
+                    ],
+                }],
+            },
+            **dimensions,
+            **metrics,
+            "aws": {op: {"calls": count, "ms": round(total * 1000, 2)} for op, (count, total) in self.calls.items()},
+            "tables": {name: usage.as_dict() for name, usage in self.tables.items()},
+            **self.properties,
+        }
+
+
+def instrument(handler):
+    """Wrap a Lambda handler so each sampled invocation emits one EMF line."""
+    route = handler.__module__.rsplit(".", 1)[-1]
+
+    def instrumented(event, context):
+        global _cold
+        cold, _cold = _cold, False
+        if not cold and (SAMPLE_RATE <= 0 or random.random() >= SAMPLE_RATE):
+            return handler(event, context)
+
+        invocation = _local.invocation = Invocation(route, cold)
+        status = "error"
+        start = time.perf_counter()
+        try:
+            response = handler(event, context)
+            status = response.get("statusCode") if isinstance(response, dict) else None
+            return response
+        finally:
+            elapsed = time.perf_counter() - start
+            _local.invocation = None
+            print(json.dumps(invocation.record(status, elapsed)))
+
+    instrumented.__name__ = handler.__name__
+    instrumented.__doc__ = handler.__doc__
+    instrumented.__wrapped__ = handler
+    return instrumented
+
+
+class _Phase:
+    __slots__ = ("invocation", "name", "start")
+
+    def __init__(self, invocation: Invocation, name: str):
+        self.invocation = invocation
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.invocation.add_phase(self.name, time.perf_counter() - self.start)
+
+
+class _NoPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NO_PHASE = _NoPhase()
+
+
+def phase(name: str):
+    """Context manager adding its wall time to the current invocation's ``<name>Ms``."""
+    invocation = getattr(_local, "invocation", None)
+    if invocation is None:
+        return _NO_PHASE
+    return _Phase(invocation, name)
+
+
+def annotate(name: str, value) -> None:
+    """Log ``value`` as ``name`` on the current invocation's line; a no-op when unsampled."""
+    invocation = getattr(_local, "invocation", None)
+    if invocation is not None:
+        with invocation.lock:
+            invocation.properties[name] = value
+
+
+def propagate(fn):
+    """Wrap ``fn`` for a worker thread so its phases and AWS calls count towards this invocation."""
+    invocation = getattr(_local, "invocation", None)
+    if invocation is None:
+        return fn
+
+    def bound(*args, **kwargs):
+        _local.invocation = invocation
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _local.invocation = None
+    return bound
+
+
+def _before_call(model, context, **kwargs):
+    invocation = getattr(_local, "invocation", None)
+    if invocation is not None:
+        context["barberq_metrics"] = (invocation, model, time.perf_counter())
+
+
+def _after_call(context, parsed=None, **kwargs):
+    # Error responses (e.g. a failed condition) arrive here too; transport errors at after-call-error
+    started = context.pop("barberq_metrics", None)
+    if started is None:
+        return
+    invocation, model, start = started
+    elapsed = time.perf_counter() - start
+    service = model.service_model.service_name
+    tables = capacity.usage(model.name, context, parsed) if service == "dynamodb" and parsed else None
+    invocation.add_call(f"{service}.{model.name}", elapsed, tables)
+
+
+def _install(session):
+    session.register("before-call", _before_call)
+    session.register("after-call", _after_call)
+    session.register("after-call-error", _after_call)
+
+
+aws.on_session(_install)
@@ -0,0 +1,140 @@
+"""Warm-container read-through cache for per-business data that rarely changes.
+
+Caches are created once per container through shared_cache, so they survive
+across warm invocations and, under the router, are shared by every route.
+Each entry remembers the business's data version, and every read first does
+one small GetItem on the version to decide whether to reuse the entry or
+reload it. add_service bumps servicesVersion on the meta table; schedule
+items carry their own version. So a change is seen by the next request in
+every container, and the cache saves the data reads, not the version read.
+
+CACHE_TTL_SECONDS (default 0) lets an entry be served for that long without
+the version read, for a deployment that can accept that much staleness.
+
+Schedules are the exception. Their version lives on the schedule item
+itself, so reading it costs as much as reloading the schedule. The schedule
+cache has no version reader and simply reloads an entry once it is
+SCHEDULE_CACHE_TTL_SECONDS old (default 30). Hours saved by a business
+therefore reach slot reads and batch bookings within that long.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from . import metrics, repository
+
+DEFAULT_TTL_SECONDS = float(os.environ.get("CACHE_TTL_SECONDS", "0"))
+DEFAULT_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", "256"))
+SCHEDULE_TTL_SECONDS = float(os.environ.get("SCHEDULE_CACHE_TTL_SECONDS", "30"))
+
+
+class VersionedCache:
+    """LRU cache keyed by businessId, revalidated against a version counter.
+
+    With no version_of, entries are reloaded once their TTL has passed.
+    """
+
+    def __init__(self, name, loader, version_of, ttl_seconds=DEFAULT_TTL_SECONDS, max_entries=DEFAULT_MAX_ENTRIES):
+        self.name = name
+        self.loader = loader
+        self.version_of = version_of
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # Handlers may read from a thread pool; loads run outside the lock
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+    def get(self, business_id: str):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(business_id)
+            # Only with a nonzero TTL: served without reading the version
+            if entry is not None and now < entry[0]:
+                self.hits += 1
+                self._entries.move_to_end(business_id)
+                return entry[2]
+
+        # Read the version before the data, so a concurrent write can only make us reload too often
+        version = self.version_of(business_id) if self.version_of else None
+        if entry is not None and self.version_of and entry[1] == version:
+            with self._lock:
+                self.revalidations += 1
+                self._store(business_id, (now + self.ttl_seconds, version, entry[2]))
+            return entry[2]
+
+        value = self.loader(business_id)
+        with self._lock:
+            self.misses += 1
+            self._store(business_id, (now + self.ttl_seconds, version, value))
+        return value
+
+    def _store(self, business_id: str, entry: tuple) -> None:
+        self._entries[business_id] = entry
+        self._entries.move_to_end(business_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def version(self, business_id: str):
+        """Version of the cached entry, if any (used for ETags and logging)."""
+        entry = self._entries.get(business_id)
+        return entry[1] if entry is not None else None
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+        }
+
+
+_shared = {}
+
+
+def shared_cache(name, loader, version_of, **options) -> VersionedCache:
+    """The container's cache called name, created by whichever handler asks first."""
+    cache = _shared.get(name)
+    if cache is None:
+        cache = _shared[name] = VersionedCache(name, loader, version_of, **options)
+    return cache
+
+
+def meta_version(meta_table, attribute: str):
+    """Version reader for one counter on a businessId-keyed table (0 if never bumped)."""
+    def read(business_id: str) -> int:
+        item = meta_table.get_item(
+            Key={"businessId": business_id},
+            ProjectionExpression=attribute,
+        ).get("Item") or {}
+        return int(item.get(attribute, 0))
+    return read
+
+
+def load_services(services_table_name: str):
+    """Loader returning {serviceId: records.Service} for a business."""
+    def load(business_id: str) -> dict:
+        return repository.services(services_table_name, business_id)
+    return load
+
+
+def load_schedule(schedules_table_name: str):
+    """Loader returning a business's Schedule (empty if it never saved one)."""
+    def load(business_id: str):
+        return repository.schedule(schedules_table_name, business_id)
+    return load
+
+
+def shared_schedule_cache(schedules_table_name: str) -> VersionedCache:
+    """The container's schedule cache, reloaded every SCHEDULE_TTL_SECONDS without version reads."""
+    return shared_cache("schedule", load_schedule(schedules_table_name), None, ttl_seconds=SCHEDULE_TTL_SECONDS)
+
+
+def log_stats(*caches) -> None:
+    """Add each cache's counters to the invocation's metrics line, if it is sampled."""
+    metrics.annotate("cache", {c.name: c.stats() for c in caches})
@@ -0,0 +1,234 @@
+"""Compact records decoded straight from DynamoDB's wire format.
+
+The boto3 resource layer turns every number into a Decimal and every item
+into a dict of all its attributes, which the handlers then convert again.
+Here a Projection names the attributes a read needs and how to convert
+each one, so a low-level client response goes straight to ints, floats and
+strings, and the ProjectionExpression sent is the same list:
+
+    BOOKING_TIMES = Projection(date=string, startTime=string, endTime=string)
+    client.query(..., **BOOKING_TIMES.params())
+    day, start, end = BOOKING_TIMES.decode(item)
+
+Missing attributes decode to None. The records use __slots__ so a warm
+container holding many of them stays small.
+"""
+from .slot_engine import MINUTE_LABELS
+
+
+def string(value: dict) -> str:
+    return value["S"]
+
+
+def integer(value: dict) -> int:
+    return int(value["N"])
+
+
+def real(value: dict) -> float:
+    # add_service stores prices as strings, so accept either
+    return float(value["N"] if "N" in value else value["S"])
+
+
+def integers(value: dict) -> list:
+    """A list of numbers, e.g. a calendar day's start minutes."""
+    return [int(v["N"]) for v in value["L"]]
+
+
+def native(value: dict):
+    """Any attribute value, numbers as int where they are whole and float otherwise."""
+    (kind, v), = value.items()
+    if kind == "S":
+        return v
+    if kind == "N":
+        return float(v) if "." in v or "e" in v or "E" in v else int(v)
+    if kind == "M":
+        return {k: native(x) for k, x in v.items()}
+    if kind == "L":
+        return [native(x) for x in v]
+    if kind == "BOOL":
+        return v
+    if kind == "NULL":
+        return None
+    if kind in ("SS", "BS", "B"):
+        return v
+    if kind == "NS":
+        return {float(x) if "." in x else int(x) for x in v}
+    raise ValueError(f"Unknown attribute type {kind}.")
+
+
+def native_item(item: dict) -> dict:
+    return {name: native(value) for name, value in item.items()}
+
+
+def key(values: dict) -> dict:
+    """A plain {name: str} key (e.g. from a cursor) in wire format."""
+    return {name: {"S": value} for name, value in values.items()}
+
+
+def plain_key(typed: dict) -> dict:
+    """A LastEvaluatedKey of string attributes back to {name: str}."""
+    return {name: value["S"] for name, value in typed.items()}
+
+
+class Projection:
+    """The attributes to read and the converter for each."""
+
+    __slots__ = ("fields", "names")
+
+    def __init__(self, **converters):
+        self.fields = tuple(converters.items())
+        # Placeholders for every name, so reserved words (date, status, name) need no care
+        self.names = {f"#p{i}": name for i, name in enumerate(converters)}
+
+    def params(self) -> dict:
+        return {
+            "ProjectionExpression": ", ".join(self.names),
+            "ExpressionAttributeNames": dict(self.names),
+        }
+
+    def decode(self, item: dict) -> tuple:
+        return tuple(
+            convert(item[name]) if name in item else None
+            for name, convert in self.fields
+        )
+
+
+class Service:
+    __slots__ = ("service_id", "name", "price", "duration")
+
+    PROJECTION = Projection(serviceId=string, name=string, price=real, durationMinutes=integer)
+
+    def __init__(self, service_id: str, name: str, price: float, duration: int):
+        self.service_id = service_id
+        self.name = name
+        self.price = price
+        self.duration = duration
+
+    @classmethod
+    def from_item(cls, item: dict) -> "Service":
+        return cls(*cls.PROJECTION.decode(item))
+
+    def as_dict(self) -> dict:
+        return {
+            "serviceId": self.service_id,
+            "name": self.name,
+            "price": self.price,
+            "durationMinutes": self.duration,
+        }
+
+
+class AvailabilityDay:
+    """One service's row on one materialized slot-calendar day."""
+
+    __slots__ = ("date", "duration", "starts")
+
+    def __init__(self, date: str, duration: int, starts: list):
+        self.date = date
+        self.duration = duration
+        self.starts = starts
+
+    @classmethod
+    def from_item(cls, item: dict, service_id: str):
+        """None when the day has no entry for the service."""
+        entry = item.get("services", {}).get("M", {}).get(service_id)
+        if entry is None:
+            return None
+        entry = entry["M"]
+        return cls(item["date"]["S"], integer(entry["durationMinutes"]), integers(entry["starts"]))
+
+    def slots(self) -> list:
+        return [
+            {
+                "date": self.date,
+                "startTime": MINUTE_LABELS[start],
+                "endTime": MINUTE_LABELS[start + self.duration],
+            }
+            for start in self.starts
+        ]
+
+
+class Booking:
+    __slots__ = ("booking_id", "date", "start_time", "end_time", "service_name", "client_id")
+
+    PROJECTION = Projection(
+        bookingId=string, date=string, startTime=string, endTime=string,
+        serviceName=string, clientId=string,
+    )
+
+    def __init__(self, booking_id, date, start_time, end_time, service_name, client_id):
+        self.booking_id = booking_id
+        self.date = date
+        self.start_time = start_time
+        self.end_time = end_time
+        self.service_name = service_name
+        self.client_id = client_id
+
+    @classmethod
+    def from_item(cls, item: dict) -> "Booking":
+        return cls(*cls.PROJECTION.decode(item))
+
+    def as_dict(self) -> dict:
+        return {
+            "bookingId": self.booking_id,
+            "date": self.date,
+            "startTime": self.start_time,
+            "endTime": self.end_time,
+            "serviceName": self.service_name,
+            "clientId": self.client_id,
+        }
+
+
+class ClientBooking:
+    """A booking as its client sees it, from the clientId index."""
+
+    __slots__ = ("booking_id", "business_id", "service_name", "date", "start_time", "end_time", "status")
+
+    PROJECTION = Projection(
+        bookingId=string, businessId=string, serviceName=string, date=string,
+        startTime=string, endTime=string, status=string,
+    )
+
+    def __init__(self, booking_id, business_id, service_name, date, start_time, end_time, status):
+        self.booking_id = booking_id
+        self.business_id = business_id
+        self.service_name = service_name
+        self.date = date
+        self.start_time = start_time
+        self.end_time = end_time
+        self.status = status
+
+    @classmethod
+    def from_item(cls, item: dict) -> "ClientBooking":
+        return cls(*cls.PROJECTION.decode(item))
+
+    def as_dict(self) -> dict:
+        return {
+            "bookingId": self.booking_id,
+            "businessId": self.business_id,
+            "serviceName": self.service_name,
+            "date": self.date,
+            "startTime": self.start_time,
+            "endTime": self.end_time,
+            "status": self.status,
+        }
+
+
+class PeriodStats:
+    """One day's or month's booking counters (see booking_stats)."""
+
+    __slots__ = ("period", "bookings", "booked_minutes", "revenue_cents", "cancelled")
+
+    PROJECTION = Projection(
+        period=string, bookings=integer, bookedMinutes=integer, revenueCents=integer, cancelled=integer,
+    )
+
+    def __init__(self, period, bookings=0, booked_minutes=0, revenue_cents=0, cancelled=0):
+        self.period = period
+        self.bookings = bookings or 0
+        self.booked_minutes = booked_minutes or 0
+        self.revenue_cents = revenue_cents or 0
+        self.cancelled = cancelled or 0
+
+    @classmethod
+    def from_item(cls, item: dict) -> "PeriodStats":
+        return cls(*cls.PROJECTION.decode(item))
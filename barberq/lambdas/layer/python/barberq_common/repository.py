@@ -0,0 +1,217 @@
+"""Hot-path reads on the shared low-level DynamoDB client.
+
+Each read names exactly the attributes it needs (see records.Projection)
+and decodes them straight to native values, skipping the resource layer's
+Decimal round-trip. Tables are passed by name. ClientError propagates, as
+it does from the resource tables.
+"""
+import random
+import time
+from collections import defaultdict
+
+from botocore.exceptions import ClientError
+
+from . import aws
+from .records import AvailabilityDay, Booking, ClientBooking, PeriodStats, Projection, Service, integer, key, native_item, plain_key, string
+from .schedule import Schedule
+from .slot_engine import to_minutes
+
+BOOKINGS_SLOT_INDEX = "businessId-statusSlot-index"
+BOOKINGS_CLIENT_INDEX = "clientId-slot-index"
+MAX_BATCH_GET_KEYS = 100
+# Retries of a batch's unprocessed keys, with full-jitter exponential backoff
+MAX_UNPROCESSED_RETRIES = 5
+BACKOFF_BASE_SECONDS = 0.05
+
+BOOKING_TIMES = Projection(date=string, startTime=string, endTime=string)
+BOOKING_SLOT = Projection(bookingId=string, date=string, startTime=string, endTime=string)
+SERVICE_DURATION = Projection(businessId=string, serviceId=string, durationMinutes=integer)
+
+
+def query_pages(table_name: str, condition: str, values: dict, projection=None, names=None, **extra):
+    """Yield each page of a Query whose key condition uses #pk/#sk names and string :values."""
+    params = {
+        "TableName": table_name,
+        "KeyConditionExpression": condition,
+        "ExpressionAttributeValues": {k: {"S": v} for k, v in values.items()},
+        "ExpressionAttributeNames": dict(names or {}),
+        **extra,
+    }
+    if projection is not None:
+        projected = projection.params()
+        params["ProjectionExpression"] = projected["ProjectionExpression"]
+        params["ExpressionAttributeNames"].update(projected["ExpressionAttributeNames"])
+    client = aws.client("dynamodb")
+    while True:
+        page = client.query(**params)
+        yield page
+        last_key = page.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        params["ExclusiveStartKey"] = last_key
+
+
+def services(table_name: str, business_id: str) -> dict:
+    """{serviceId: Service} for a business."""
+    found = {}
+    for page in query_pages(table_name, "#pk = :b", {":b": business_id}, Service.PROJECTION, {"#pk": "businessId"}):
+        for item in page["Items"]:
+            service = Service.from_item(item)
+            found[service.service_id] = service
+    return found
+
+
+def service_durations(table_name: str, pairs: list) -> dict:
+    """{(businessId, serviceId): durationMinutes} for the pairs that exist."""
+    durations = {}
+    client = aws.client("dynamodb")
+    projected = SERVICE_DURATION.params()
+    for i in range(0, len(pairs), MAX_BATCH_GET_KEYS):
+        request = {
+            table_name: {
+                "Keys": [key({"businessId": b, "serviceId": s}) for b, s in pairs[i:i + MAX_BATCH_GET_KEYS]],
+                **projected,
+            }
+        }
+        attempt = 0
+        while request:
+            result = client.batch_get_item(RequestItems=request)
+            for item in result.get("Responses", {}).get(table_name, []):
+                business_id, service_id, duration = SERVICE_DURATION.decode(item)
+                durations[(business_id, service_id)] = duration
+            # Throttled keys come back unprocessed; ask again for just those, after a pause
+            request = result.get("UnprocessedKeys")
+            if request:
+                if attempt == MAX_UNPROCESSED_RETRIES:
+                    raise ClientError(
+                        {"Error": {"Code": "ProvisionedThroughputExceededException",
+                                   "Message": "Keys still unprocessed after retries."}},
+                        "BatchGetItem",
+                    )
+                time.sleep(random.uniform(0, BACKOFF_BASE_SECONDS * 2 ** attempt))
+                attempt += 1
+    return durations
+
+
+def schedule(table_name: str, business_id: str) -> Schedule:
+    """A business's Schedule (empty if it never saved one)."""
+    item = aws.client("dynamodb").get_item(
+        TableName=table_name, Key=key({"businessId": business_id}),
+    ).get("Item")
+    return Schedule.from_item(native_item(item) if item else None)
+
+
+def booked_intervals(table_name: str, business_id: str, first_date: str, last_date: str) -> dict:
+    """Return {date: [(start, end), ...]} in minutes for confirmed bookings in [first_date, last_date]."""
+    busy = defaultdict(list)
+    pages = query_pages(
+        table_name,
+        "#pk = :b AND #sk BETWEEN :from AND :to",
+        {":b": business_id, ":from": f"confirmed#{first_date}", ":to": f"confirmed#{last_date}#~"},
+        BOOKING_TIMES,
+        {"#pk": "businessId", "#sk": "statusSlot"},
+        IndexName=BOOKINGS_SLOT_INDEX,
+    )
+    for page in pages:
+        for item in page["Items"]:
+            day, start, end = BOOKING_TIMES.decode(item)
+            busy[day].append((to_minutes(start), to_minutes(end)))
+    return busy
+
+
+def confirmed_slots(table_name: str, business_id: str, first_date: str, last_date: str) -> dict:
+    """{bookingId: (date, startTime, endTime)} for confirmed bookings in [first_date, last_date].
+
+    Keyed by booking, so a caller holding newer stream images can replace entries.
+    """
+    found = {}
+    pages = query_pages(
+        table_name,
+        "#pk = :b AND #sk BETWEEN :from AND :to",
+        {":b": business_id, ":from": f"confirmed#{first_date}", ":to": f"confirmed#{last_date}#~"},
+        BOOKING_SLOT,
+        {"#pk": "businessId", "#sk": "statusSlot"},
+        IndexName=BOOKINGS_SLOT_INDEX,
+    )
+    for page in pages:
+        for item in page["Items"]:
+            booking_id, day, start, end = BOOKING_SLOT.decode(item)
+            found[booking_id] = (day, start, end)
+    return found
+
+
+def bookings_page(table_name: str, business_id: str, date_from: str, date_to, limit: int, start_key=None):
+    """(bookings, last key or None) for one page of confirmed bookings in date order."""
+    extra = {"IndexName": BOOKINGS_SLOT_INDEX, "Limit": limit}
+    if start_key:
+        extra["ExclusiveStartKey"] = key(start_key)
+    page = next(query_pages(
+        table_name,
+        "#pk = :b AND #sk BETWEEN :from AND :to",
+        {
+            ":b": business_id,
+            ":from": f"confirmed#{date_from}",
+            ":to": f"confirmed#{date_to}#~" if date_to else "confirmed#~",
+        },
+        Booking.PROJECTION,
+        {"#pk": "businessId", "#sk": "statusSlot"},
+        **extra,
+    ))
+    last_key = page.get("LastEvaluatedKey")
+    return [Booking.from_item(item) for item in page["Items"]], plain_key(last_key) if last_key else None
+
+
+def client_bookings_page(table_name: str, client_id: str, today: str, upcoming: bool, limit: int, start_key=None):
+    """(bookings, last key or None) for one page of a client's bookings.
+
+    Upcoming ones (from today on) come soonest first, past ones latest first.
+    """
+    if upcoming:
+        condition, values, extra = "#pk = :c AND #sk >= :today", {":today": today}, {}
+    else:
+        condition, values, extra = "#pk = :c AND #sk < :today", {":today": today}, {"ScanIndexForward": False}
+    extra.update(IndexName=BOOKINGS_CLIENT_INDEX, Limit=limit)
+    if start_key:
+        extra["ExclusiveStartKey"] = key(start_key)
+    page = next(query_pages(
+        table_name,
+        condition,
+        {":c": client_id, **values},
+        ClientBooking.PROJECTION,
+        {"#pk": "clientId", "#sk": "slot"},
+        **extra,
+    ))
+    last_key = page.get("LastEvaluatedKey")
+    return [ClientBooking.from_item(item) for item in page["Items"]], plain_key(last_key) if last_key else None
+
+
+def period_stats(table_name: str, business_id: str, first_period: str, last_period: str) -> dict:
+    """{period: PeriodStats} for a business's stats items in [first_period, last_period]."""
+    found = {}
+    pages = query_pages(
+        table_name,
+        "#pk = :b AND #sk BETWEEN :from AND :to",
+        {":b": business_id, ":from": first_period, ":to": last_period},
+        PeriodStats.PROJECTION,
+        {"#pk": "businessId", "#sk": "period"},
+    )
+    for page in pages:
+        for item in page["Items"]:
+            stats = PeriodStats.from_item(item)
+            found[stats.period] = stats
+    return found
+
+
+def availability_days(table_name: str, business_id: str, service_id: str, first_date: str, last_date: str) -> list:
+    """The service's slot-calendar rows in [first_date, last_date]; None for a day without one."""
+    days = []
+    pages = query_pages(
+        table_name,
+        "#pk = :b AND #d BETWEEN :from AND :to",
+        {":b": business_id, ":from": first_date, ":to": last_date},
+        names={"#pk": "businessId", "#d": "date", "#sid": service_id},
+        ProjectionExpression="#d, services.#sid",
+    )
+    for page in pages:
+        days.extend(AvailabilityDay.from_item(item, service_id) for item in page["Items"])
+    return days
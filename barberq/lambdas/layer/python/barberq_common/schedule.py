@@ -0,0 +1,120 @@
+"""A business's working hours as one versioned schedules-table item.
+
+The item holds minute offsets, not "HH:MM" strings, as flat
+[start, end, start, end, ...] lists so a day can have several intervals
+(a lunch break is two):
+
+    {"businessId": ..., "version": 4,
+     "weekly": {"MON": [540, 720, 780, 1080], ...},
+     "overrides": {"2027-12-25": [], "2027-12-24": [540, 780]}}
+
+A weekday missing from weekly is a day off. An override replaces the
+weekly hours for one date; an empty one closes the day. Readers get a
+Schedule with tuples of (start, end) ready for the slot engine.
+"""
+from datetime import date
+
+from .booking_writes import LOCK_BLOCK_MINUTES
+from .slot_engine import DAY_KEYS, MINUTE_LABELS, MINUTES_PER_DAY, to_minutes
+
+MAX_INTERVALS_PER_DAY = 8
+MAX_OVERRIDES = 366
+
+
+class Schedule:
+    __slots__ = ("weekly", "overrides", "version")
+
+    def __init__(self, weekly: dict, overrides: dict, version: int = 0):
+        self.weekly = weekly
+        self.overrides = overrides
+        self.version = version
+
+    @classmethod
+    def from_item(cls, item) -> "Schedule":
+        if not item:
+            return cls({}, {}, 0)
+        return cls(
+            {day: pairs(flat) for day, flat in (item.get("weekly") or {}).items()},
+            {d: pairs(flat) for d, flat in (item.get("overrides") or {}).items()},
+            int(item.get("version", 0)),
+        )
+
+    def to_item(self, business_id: str) -> dict:
+        return {
+            "businessId": business_id,
+            "version": self.version,
+            "weekly": {day: flatten(intervals) for day, intervals in self.weekly.items()},
+            "overrides": {d: flatten(intervals) for d, intervals in self.overrides.items()},
+        }
+
+    def changes_from(self, other: "Schedule") -> int:
+        """Number of weekdays and override dates whose hours differ."""
+        return sum(
+            1
+            for mine, theirs in ((self.weekly, other.weekly), (self.overrides, other.overrides))
+            for key in mine.keys() | theirs.keys()
+            if mine.get(key) != theirs.get(key)
+        )
+
+    def open_minutes(self, day: date) -> int:
+        """Working minutes on ``day``, after overrides."""
+        intervals = self.overrides.get(day.strftime("%Y-%m-%d"))
+        if intervals is None:
+            intervals = self.weekly.get(DAY_KEYS[day.weekday()]) or ()
+        return sum(end - start for start, end in intervals)
+
+    def without_past_overrides(self, today: date) -> "Schedule":
+        today_str = today.strftime("%Y-%m-%d")
+        overrides = {d: v for d, v in self.overrides.items() if d >= today_str}
+        return Schedule(self.weekly, overrides, self.version)
+
+
+def pairs(flat) -> tuple:
+    values = [int(v) for v in flat]
+    return tuple(zip(values[::2], values[1::2]))
+
+
+def flatten(intervals) -> list:
+    return [minute for interval in intervals for minute in interval]
+
+
+def parse_intervals(raw) -> tuple:
+    """[{"startTime": "09:00", "endTime": "12:00"}, ...] -> sorted (start, end) tuples.
+
+    Raises ValueError for bad times, empty or overlapping intervals.
+    """
+    if not isinstance(raw, list) or len(raw) > MAX_INTERVALS_PER_DAY:
+        raise ValueError("Invalid intervals.")
+    intervals = []
+    for entry in raw:
+        if not isinstance(entry, dict):
+            raise ValueError("Invalid interval.")
+        start, end = parse_time(entry.get("startTime")), parse_time(entry.get("endTime"))
+        if start >= end:
+            raise ValueError("Interval must end after it starts.")
+        intervals.append((start, end))
+    intervals.sort()
+    for (_, prev_end), (start, _) in zip(intervals, intervals[1:]):
+        if start < prev_end:
+            raise ValueError("Intervals overlap.")
+    return tuple(intervals)
+
+
+def parse_time(value) -> int:
+    """Strict "HH:MM" (00:00-24:00) on the LOCK_BLOCK_MINUTES grid to minutes."""
+    try:
+        minutes = to_minutes(value)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid time.")
+    if not 0 <= minutes <= MINUTES_PER_DAY or MINUTE_LABELS[minutes] != value:
+        raise ValueError("Invalid time.")
+    if minutes % LOCK_BLOCK_MINUTES:
+        raise ValueError(f"Times must be on a {LOCK_BLOCK_MINUTES}-minute boundary.")
+    return minutes
+
+
+def format_intervals(intervals) -> list:
+    return [
+        {"startTime": MINUTE_LABELS[start], "endTime": MINUTE_LABELS[end]}
+        for start, end in intervals
+    ]
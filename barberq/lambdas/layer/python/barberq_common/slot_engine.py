@@ -0,0 +1,148 @@
+"""Minute-bitmap slot engine shared by the slot read paths.
+
+A horizon of N days is held in one Python int. Each day owns DAY_STRIDE bits
+and bit ``m`` of a day is set while minute ``m`` is free. The extra guard bit
+per day is always clear, so free runs never join across midnight.
+
+Finding every start that fits a duration ``d`` is an AND of the free mask with
+itself shifted by 0..d-1, done with log2(d) shifts over the whole horizon at
+once, then masked with the allowed step positions.
+"""
+from datetime import date, timedelta
+from functools import lru_cache
+
+MINUTES_PER_DAY = 1440
+DAY_STRIDE = MINUTES_PER_DAY + 1
+
+# Indexed by date.weekday()
+DAY_KEYS = ("MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN")
+
+MINUTE_LABELS = tuple(f"{m // 60:02d}:{m % 60:02d}" for m in range(MINUTES_PER_DAY + 1))
+_LABEL_TO_MINUTE = {label: m for m, label in enumerate(MINUTE_LABELS)}
+
+
+def to_minutes(hhmm) -> int:
+    """Convert "HH:MM" to minutes past midnight."""
+    minutes = _LABEL_TO_MINUTE.get(hhmm)
+    if minutes is None:
+        h, m = map(int, str(hhmm).split(":"))
+        minutes = h * 60 + m
+    return minutes
+
+
+def run_mask(start: int, end: int) -> int:
+    """Bits [start, end) set."""
+    if end <= start:
+        return 0
+    return ((1 << (end - start)) - 1) << start
+
+
+@lru_cache(maxsize=256)
+def intervals_mask(intervals: tuple) -> int:
+    mask = 0
+    for start, end in intervals:
+        mask |= run_mask(max(start, 0), min(end, MINUTES_PER_DAY))
+    return mask
+
+
+@lru_cache(maxsize=256)
+def step_mask(intervals: tuple, step: int) -> int:
+    """Bits at every allowed slot start: each interval's start plus multiples of step."""
+    mask = 0
+    for start, end in intervals:
+        for t in range(max(start, 0), min(end, MINUTES_PER_DAY), step):
+            mask |= 1 << t
+    return mask
+
+
+class Horizon:
+    """Free-minute bitmap for ``days`` consecutive days starting at ``first_day``.
+
+    ``weekly`` maps a DAY_KEYS entry to a list of (start, end) working intervals
+    in minutes. ``busy`` maps "YYYY-MM-DD" to (start, end) intervals that are
+    already taken; they may overlap each other and the working hours freely.
+    ``overrides`` maps "YYYY-MM-DD" to intervals that replace the weekly hours
+    for that date (empty for a day off).
+    """
+
+    def __init__(self, first_day: date, days: int, weekly: dict, busy: dict | None = None,
+                 overrides: dict | None = None):
+        busy = busy or {}
+        overrides = overrides or {}
+        self.first_day = first_day
+        self.days = days
+        self.dates = []
+        self._day_intervals = []
+        free = 0
+        for i in range(days):
+            d = first_day + timedelta(days=i)
+            date_str = d.strftime("%Y-%m-%d")
+            if date_str in overrides:
+                intervals = tuple(sorted(overrides[date_str]))
+            else:
+                intervals = tuple(sorted(weekly.get(DAY_KEYS[d.weekday()]) or ()))
+            self.dates.append(date_str)
+            self._day_intervals.append(intervals)
+            if not intervals:
+                continue
+            day_free = intervals_mask(intervals)
+            for start, end in busy.get(date_str, ()):
+                day_free &= ~run_mask(max(start, 0), min(end, MINUTES_PER_DAY))
+            free |= day_free << (i * DAY_STRIDE)
+        self.free = free
+        self._runs = [free]
+        self._steps = {}
+
+    def fit_mask(self, duration: int) -> int:
+        """Bits at every minute that starts a free run of at least ``duration`` minutes."""
+        result = -1
+        offset = 0
+        k = 0
+        while duration >> k:
+            while len(self._runs) <= k:
+                prev = self._runs[-1]
+                self._runs.append(prev & (prev >> (1 << (len(self._runs) - 1))))
+            if duration >> k & 1:
+                result &= self._runs[k] >> offset
+                offset += 1 << k
+            k += 1
+        return result & self.free
+
+    def fits(self, day: date, start: int, duration: int) -> bool:
+        """Whether [start, start + duration) on ``day`` is entirely free."""
+        i = (day - self.first_day).days
+        if not 0 <= i < self.days or duration <= 0 or start < 0 or start + duration > MINUTES_PER_DAY:
+            return False
+        return bool(self.fit_mask(duration) >> (i * DAY_STRIDE + start) & 1)
+
+    def starts_mask(self, step: int) -> int:
+        mask = self._steps.get(step)
+        if mask is None:
+            mask = 0
+            for i, intervals in enumerate(self._day_intervals):
+                if intervals:
+                    mask |= step_mask(intervals, step) << (i * DAY_STRIDE)
+            self._steps[step] = mask
+        return mask
+
+    def slots(self, duration: int, step: int | None = None) -> list:
+        """Every slot of ``duration`` minutes on the step grid that is entirely free."""
+        if duration <= 0:
+            return []
+        candidates = self.fit_mask(duration) & self.starts_mask(step or duration)
+        bits = bin(candidates)[:1:-1]
+        slots = []
+        pos = bits.find("1")
+        while pos != -1:
+            day, minute = divmod(pos, DAY_STRIDE)
+            slots.append({
+                "date": self.dates[day],
+                "startTime": MINUTE_LABELS[minute],
+                "endTime": MINUTE_LABELS[minute + duration],
+            })
+            pos = bits.find("1", pos + 1)
+        return slots
+
+    def slots_for(self, durations, step: int | None = None) -> dict:
+        """Slots per duration; shifted free masks are shared between durations."""
+        return {d: self.slots(d, step) for d in set(durations)}
@@ -0,0 +1,64 @@
+"""Request window parsing shared by the slot endpoints."""
+from datetime import date, timedelta
+
+from .booking_writes import LOCK_BLOCK_MINUTES
+from .slot_engine import MINUTES_PER_DAY
+
+HORIZON_DAYS = 90
+DEFAULT_WINDOW_DAYS = 7
+MAX_WINDOW_DAYS = 31
+MIN_STEP_MINUTES = LOCK_BLOCK_MINUTES
+
+
+def parse_step(value):
+    """Optional start-time grid in minutes; None means the service duration."""
+    if value is None:
+        return None
+    if not str(value).isdigit() or not MIN_STEP_MINUTES <= int(value) <= MINUTES_PER_DAY:
+        raise ValueError("Invalid step.")
+    if int(value) % LOCK_BLOCK_MINUTES:
+        raise ValueError(f"step must be a multiple of {LOCK_BLOCK_MINUTES}.")
+    return int(value)
+
+
+def resolve_window(query_params: dict):
+    """(first_day, last_day, page) for from/days, clamped to the booking horizon.
+
+    first_day > last_day when the window lies entirely outside the horizon.
+    Raises ValueError with a client-facing message.
+    """
+    today = date.today()
+    horizon_start = today + timedelta(days=1)
+    horizon_end = today + timedelta(days=HORIZON_DAYS)
+    try:
+        first_day = parse_date(query_params.get("from")) or horizon_start
+        days = int(query_params.get("days") or DEFAULT_WINDOW_DAYS)
+    except ValueError:
+        raise ValueError("Invalid from or days.")
+    if not 1 <= days <= MAX_WINDOW_DAYS:
+        raise ValueError(f"days must be between 1 and {MAX_WINDOW_DAYS}.")
+    first_day = max(first_day, horizon_start)
+    last_day = min(first_day + timedelta(days=days - 1), horizon_end)
+    next_from = last_day + timedelta(days=1)
+    page = {
+        "from": first_day.strftime("%Y-%m-%d"),
+        "to": last_day.strftime("%Y-%m-%d"),
+        "nextFrom": next_from.strftime("%Y-%m-%d") if next_from <= horizon_end else None,
+    }
+    return first_day, last_day, page
+
+
+def parse_date(value):
+    """A zero-padded "YYYY-MM-DD" string to a date, None when missing.
+
+    Dates go into sort keys, so "2027-1-5" (which strptime accepts) must not
+    get through. Raises ValueError for anything else.
+    """
+    if not value:
+        return None
+    if not isinstance(value, str):
+        raise ValueError("Invalid date.")
+    day = date.fromisoformat(value)
+    if day.isoformat() != value:
+        raise ValueError("Invalid date.")
+    return day
@@ -0,0 +1,97 @@
+import importlib
+import os
+import re
+from barberq_common.http import respond
+
+# Method, path template, handler module. Templates use API Gateway's {param} syntax.
+ROUTES = [
+    ("POST", "/auth/register", "register_client"),
+    ("POST", "/auth/login", "login_client"),
+    ("POST", "/auth/refresh", "refresh_client"),
+    ("POST", "/auth/logout", "logout_client"),
+    ("POST", "/auth/business/register", "register_business"),
+    ("POST", "/auth/business/login", "login_business"),
+    ("POST", "/auth/business/refresh", "refresh_business"),
+    ("POST", "/auth/business/logout", "logout_business"),
+    ("GET", "/services", "list_services"),
+    ("POST", "/services", "add_service"),
+    ("GET", "/availability", "get_availability"),
+    ("PUT", "/availability", "set_availability"),
+    ("GET", "/barbers", "get_barbers"),
+    ("GET", "/barbers/{businessId}/services", "get_business_services"),
+    ("GET", "/barbers/{businessId}/slots", "get_barber_slots"),
+    ("GET", "/slots", "get_slots_batch"),
+    ("POST", "/bookings", "create_booking"),
+    ("POST", "/bookings/batch", "create_bookings_batch"),
+    ("GET", "/bookings/business", "list_business_bookings"),
+    ("GET", "/bookings/business/stats", "get_business_stats"),
+    ("GET", "/bookings/client", "list_client_bookings"),
+]
+
+# Stripped from the request path before matching, e.g. "/api"; set by Terraform's route_prefix
+ROUTE_PREFIX = os.environ.get("ROUTE_PREFIX", "").rstrip("/")
+
+
+def compile_template(template: str):
+    pattern = re.sub(r"\\\{(\w+)\\\}", r"(?P<\1>[^/]+)", re.escape(template))
+    return re.compile(f"^{pattern}/?$")
+
+
+compiled_routes = [(method, compile_template(template), module) for method, template, module in ROUTES]
+handlers = {}
+
+
+def resolve(method: str, path: str):
+    """Return (handler module, path params) for a request, or (None, 404 or 405)."""
+    path_matched = False
+    for route_method, pattern, module in compiled_routes:
+        match = pattern.match(path)
+        if not match:
+            continue
+        path_matched = True
+        if route_method == method:
+            return module, match.groupdict()
+    return None, 405 if path_matched else 404
+
+
+def strip_prefix(path: str, prefix: str) -> str:
+    """``path`` without a leading ``prefix`` path segment (or segments)."""
+    if prefix and (path == prefix or path.startswith(prefix + "/")):
+        return path[len(prefix):] or "/"
+    return path
+
+
+def request_line(event):
+    """(method, path to match) for an HTTP API (payload 2.0) or REST API event."""
+    request_context = event.get("requestContext") or {}
+    http = request_context.get("http")
+    if http:
+        # rawPath keeps a named stage ("/prod/api/..."); only $default has none
+        method = http["method"]
+        path = strip_prefix(event.get("rawPath", ""), "/" + request_context.get("stage", "$default"))
+    else:
+        # A REST API's path already excludes the stage
+        method, path = event.get("httpMethod", ""), event.get("path", "")
+    return method, strip_prefix(path, ROUTE_PREFIX)
+
+
+def handler(event, context):
+    """Single entry point for every API route, for the router deployment mode.
+
+    Each route's module is imported on first use and then kept, so clients,
+    caches and verified tokens are shared by every route this container serves.
+    """
+    method, path = request_line(event)
+    module, params = resolve(method.upper(), path)
+    if module is None:
+        if params == 405:
+            return respond(405, {"message": "Method not allowed."})
+        return respond(404, {"message": "Not found."})
+
+    route_handler = handlers.get(module)
+    if route_handler is None:
+        route_handler = handlers[module] = importlib.import_module(module).handler
+
+    if params:
+        event = {**event, "pathParameters": {**(event.get("pathParameters") or {}), **params}}
+    return route_handler(event, context)
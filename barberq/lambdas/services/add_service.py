@@ -1,22 +1,24 @@
-import json
 import os
 import uuid
-import base64
-import boto3
 from botocore.exceptions import ClientError
+from barberq_common import aws
+from barberq_common.auth import BUSINESS, extract_sub
+from barberq_common.booking_writes import LOCK_BLOCK_MINUTES
+from barberq_common.http import json_body, respond
+from barberq_common.metrics import instrument
 
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table(os.environ["SERVICES_TABLE"])
-ALLOWED_ORIGIN = os.environ["ALLOWED_ORIGIN"]
+table = aws.table(os.environ["SERVICES_TABLE"])
+meta_table = aws.table(os.environ["BUSINESS_META_TABLE"])
 
 
+@instrument
 def handler(event, context):
     try:
-        business_id = extract_sub(event)
+        business_id = extract_sub(event, BUSINESS)
         if not business_id:
             return respond(401, {"message": "Unauthorized."})
 
-        body = json.loads(event.get("body", "{}"))
+        body = json_body(event)
         name = body.get("name")
         price = body.get("price")
         duration = body.get("durationMinutes")
@@ -24,6 +26,14 @@ def handler(event, context):
         if not all([name, price is not None, duration]):
             return respond(400, {"message": "Missing required fields."})
 
+        # Slots are locked in whole blocks, so durations must be whole blocks too
+        try:
+            duration = int(duration)
+        except (TypeError, ValueError):
+            return respond(400, {"message": "Invalid durationMinutes."})
+        if duration <= 0 or duration % LOCK_BLOCK_MINUTES:
+            return respond(400, {"message": f"durationMinutes must be a multiple of {LOCK_BLOCK_MINUTES}."})
+
         service_id = str(uuid.uuid4())
 
         table.put_item(Item={
@@ -31,37 +41,21 @@ def handler(event, context):
             "serviceId": service_id,
             "name": name,
             "price": str(price),  # DynamoDB Decimal-safe
-            "durationMinutes": int(duration),
+            "durationMinutes": duration,
         })
 
+        # Invalidates warm read caches for this business
+        bump_version(business_id)
+
         return respond(201, {"serviceId": service_id, "message": "Service added."})
 
     except ClientError:
         return respond(500, {"message": "Something went wrong. Please try again."})
 
 
-def extract_sub(event):
-    """Decode the JWT from the Authorization header and return the sub claim."""
-    try:
-        auth = event.get("headers", {}).get("Authorization", "")
-        token = auth.removeprefix("Bearer ")
-        # JWT is three base64url segments — payload is the middle one
-        payload_b64 = token.split(".")[1]
-        # Add padding if needed
-        payload_b64 += "=" * (-len(payload_b64) % 4)
-        payload = json.loads(base64.urlsafe_b64decode(payload_b64))
-        return payload.get("sub")
-    except Exception:
-        return None
-
-
-def respond(status_code: int, body: dict) -> dict:
-    return {
-        "statusCode": status_code,
-        "headers": {
-            "Content-Type": "application/json",
-            "Access-Control-Allow-Origin": ALLOWED_ORIGIN,
-            "Access-Control-Allow-Credentials": "true",
-        },
-        "body": json.dumps(body),
-    }
+def bump_version(business_id: str) -> None:
+    meta_table.update_item(
+        Key={"businessId": business_id},
+        UpdateExpression="ADD servicesVersion :one",
+        ExpressionAttributeValues={":one": 1},
+    )
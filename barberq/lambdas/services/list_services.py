@@ -1,61 +1,23 @@
-import json
 import os
-import base64
-import boto3
-from boto3.dynamodb.conditions import Key
 from botocore.exceptions import ClientError
+from barberq_common import repository
+from barberq_common.auth import BUSINESS, extract_sub
+from barberq_common.http import respond
+from barberq_common.metrics import instrument
 
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table(os.environ["SERVICES_TABLE"])
-ALLOWED_ORIGIN = os.environ["ALLOWED_ORIGIN"]
+SERVICES_TABLE = os.environ["SERVICES_TABLE"]
 
 
+@instrument
 def handler(event, context):
     try:
-        business_id = extract_sub(event)
+        business_id = extract_sub(event, BUSINESS)
         if not business_id:
             return respond(401, {"message": "Unauthorized."})
 
-        result = table.query(
-            KeyConditionExpression=Key("businessId").eq(business_id)
-        )
+        services = repository.services(SERVICES_TABLE, business_id)
 
-        services = [
-            {
-                "serviceId": item["serviceId"],
-                "name": item["name"],
-                "price": float(item["price"]),
-                "durationMinutes": int(item["durationMinutes"]),
-            }
-            for item in result.get("Items", [])
-        ]
-
-        return respond(200, {"services": services})
+        return respond(200, {"services": [s.as_dict() for s in services.values()]})
 
     except ClientError:
         return respond(500, {"message": "Something went wrong. Please try again."})
-
-
-def extract_sub(event):
-    """Decode the JWT from the Authorization header and return the sub claim."""
-    try:
-        auth = event.get("headers", {}).get("Authorization", "")
-        token = auth.removeprefix("Bearer ")
-        payload_b64 = token.split(".")[1]
-        payload_b64 += "=" * (-len(payload_b64) % 4)
-        payload = json.loads(base64.urlsafe_b64decode(payload_b64))
-        return payload.get("sub")
-    except Exception:
-        return None
-
-
-def respond(status_code: int, body: dict) -> dict:
-    return {
-        "statusCode": status_code,
-        "headers": {
-            "Content-Type": "application/json",
-            "Access-Control-Allow-Origin": ALLOWED_ORIGIN,
-            "Access-Control-Allow-Credentials": "true",
-        },
-        "body": json.dumps(body),
-    }
@@ -43,7 +43,7 @@ function LoginForm({ type }: LoginFormProps) {
         return
       }
 
-      login(data.accessToken)
+      login(data.accessToken, type, data.expiresIn)
       navigate(isClient ? '/barberq/barbers' : '/barberq/dashboard/business')
     } catch {
       setError(t('common.somethingWentWrong'))
@@ -3,7 +3,7 @@ import type { ReactNode } from 'react'
 import { useAuth } from '../context/AuthContext'
 
 export default function ProtectedRoute({ children }: { children: ReactNode }) {
-  const { accessToken } = useAuth()
-  if (!accessToken) return <Navigate to="/barberq/login/client" replace />
+  const { accessToken, accountType } = useAuth()
+  if (!accessToken) return <Navigate to={`/barberq/login/${accountType}`} replace />
   return <>{children}</>
 }
@@ -1,31 +1,119 @@
-import { createContext, useContext, useState } from 'react'
+import { createContext, useCallback, useContext, useEffect, useRef, useState } from 'react'
 import type { ReactNode } from 'react'
 
+export type AccountType = 'client' | 'business'
+
 interface AuthContextValue {
   accessToken: string | null
-  login: (token: string) => void
-  logout: () => void
+  accountType: AccountType
+  login: (token: string, type: AccountType, expiresIn?: number) => void
+  logout: () => Promise<void>
+  authFetch: (url: string, init?: RequestInit) => Promise<Response>
+}
+
+const TOKEN_KEY = 'barberq_access_token'
+const TYPE_KEY = 'barberq_account_type'
+const EXPIRES_KEY = 'barberq_access_token_expires_at'
+
+// The refresh-token cookie is HttpOnly, so each pool's endpoints read it server-side
+const AUTH_PATHS: Record<AccountType, string> = {
+  client: '/api/auth',
+  business: '/api/auth/business',
 }
 
+// Renew this long before the access token runs out
+const REFRESH_MARGIN_MS = 60_000
+
 const AuthContext = createContext<AuthContextValue | null>(null)
 
 export function AuthProvider({ children }: { children: ReactNode }) {
   const [accessToken, setAccessToken] = useState<string | null>(
-    () => localStorage.getItem('barberq_access_token')
+    () => localStorage.getItem(TOKEN_KEY)
+  )
+  const [accountType, setAccountType] = useState<AccountType>(
+    () => (localStorage.getItem(TYPE_KEY) === 'business' ? 'business' : 'client')
   )
+  const [expiresAt, setExpiresAt] = useState<number | null>(
+    () => Number(localStorage.getItem(EXPIRES_KEY)) || null
+  )
+  const refreshing = useRef<Promise<string | null> | null>(null)
 
-  function login(token: string) {
-    localStorage.setItem('barberq_access_token', token)
+  const login = useCallback((token: string, type: AccountType, expiresIn?: number) => {
+    localStorage.setItem(TOKEN_KEY, token)
+    localStorage.setItem(TYPE_KEY, type)
     setAccessToken(token)
-  }
+    setAccountType(type)
+    if (expiresIn) {
+      const at = Date.now() + expiresIn * 1000
+      localStorage.setItem(EXPIRES_KEY, String(at))
+      setExpiresAt(at)
+    } else {
+      localStorage.removeItem(EXPIRES_KEY)
+      setExpiresAt(null)
+    }
+  }, [])
 
-  function logout() {
-    localStorage.removeItem('barberq_access_token')
+  const clear = useCallback(() => {
+    localStorage.removeItem(TOKEN_KEY)
+    localStorage.removeItem(EXPIRES_KEY)
     setAccessToken(null)
-  }
+    setExpiresAt(null)
+  }, [])
+
+  // Concurrent callers share one refresh request
+  const refresh = useCallback((): Promise<string | null> => {
+    if (!refreshing.current) {
+      refreshing.current = fetch(`${AUTH_PATHS[accountType]}/refresh`, {
+        method: 'POST',
+        credentials: 'include',
+      })
+        .then(async (res) => {
+          if (!res.ok) {
+            clear()
+            return null
+          }
+          const data = await res.json()
+          login(data.accessToken, accountType, data.expiresIn)
+          return data.accessToken as string
+        })
+        .catch(() => null)
+        .finally(() => { refreshing.current = null })
+    }
+    return refreshing.current
+  }, [accountType, clear, login])
+
+  // Silent refresh shortly before expiry, so an open page never sees a 401
+  useEffect(() => {
+    if (!accessToken || !expiresAt) return
+    const timer = setTimeout(refresh, Math.max(expiresAt - Date.now() - REFRESH_MARGIN_MS, 0))
+    return () => clearTimeout(timer)
+  }, [accessToken, expiresAt, refresh])
+
+  // Sends the access token; on a 401 refreshes once and retries
+  const authFetch = useCallback(async (url: string, init: RequestInit = {}) => {
+    const send = (token: string | null) => {
+      const headers = new Headers(init.headers)
+      if (token) headers.set('Authorization', `Bearer ${token}`)
+      return fetch(url, { ...init, headers, credentials: 'include' })
+    }
+    const res = await send(localStorage.getItem(TOKEN_KEY))
+    if (res.status !== 401) return res
+    const token = await refresh()
+    return token ? send(token) : res
+  }, [refresh])
+
+  const logout = useCallback(async () => {
+    try {
+      // Revokes the refresh token and clears its cookie
+      await fetch(`${AUTH_PATHS[accountType]}/logout`, { method: 'POST', credentials: 'include' })
+    } catch {
+      // Signed out locally either way
+    }
+    clear()
+  }, [accountType, clear])
 
   return (
-    <AuthContext.Provider value={{ accessToken, login, logout }}>
+    <AuthContext.Provider value={{ accessToken, accountType, login, logout, authFetch }}>
       {children}
     </AuthContext.Provider>
   )
@@ -6,7 +6,7 @@ import { useTranslation } from 'react-i18next'
 
 function AddService() {
   const navigate = useNavigate()
-  const { accessToken } = useAuth()
+  const { authFetch } = useAuth()
   const [name, setName] = useState('')
   const [price, setPrice] = useState('')
   const [duration, setDuration] = useState('')
@@ -20,13 +20,9 @@ function AddService() {
     setLoading(true)
 
     try {
-      const res = await fetch('/api/services', {
+      const res = await authFetch('/api/services', {
         method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-          'Authorization': `Bearer ${accessToken}`,
-        },
-        credentials: 'include',
+        headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ name, price: Number(price), durationMinutes: Number(duration) }),
       })
 
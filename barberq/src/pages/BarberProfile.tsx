@@ -1,4 +1,4 @@
-import { useEffect, useState } from 'react'
+import { useEffect, useRef, useState } from 'react'
 import { Link, useNavigate, useParams } from 'react-router-dom'
 import { useAuth } from '../context/AuthContext'
 import { useTranslation } from 'react-i18next'
@@ -35,10 +35,12 @@ function Calendar({
   availableDates,
   selectedDate,
   onSelectDate,
+  onViewMonth,
 }: {
   availableDates: Set<string>
   selectedDate: string | null
   onSelectDate: (date: string) => void
+  onViewMonth: (year: number, month: number) => void
 }) {
   const { i18n } = useTranslation('barberq')
   const locale = i18n.language === 'pl' ? 'pl-PL' : 'en-GB'
@@ -67,13 +69,18 @@ function Calendar({
 
   const monthLabel = new Date(viewYear, viewMonth, 1).toLocaleDateString(locale, { month: 'long', year: 'numeric' })
 
+  function showMonth(year: number, month: number) {
+    setViewYear(year)
+    setViewMonth(month)
+    onViewMonth(year, month)
+  }
   function prevMonth() {
-    if (viewMonth === 0) { setViewMonth(11); setViewYear(y => y - 1) }
-    else setViewMonth(m => m - 1)
+    if (viewMonth === 0) showMonth(viewYear - 1, 11)
+    else showMonth(viewYear, viewMonth - 1)
   }
   function nextMonth() {
-    if (viewMonth === 11) { setViewMonth(0); setViewYear(y => y + 1) }
-    else setViewMonth(m => m + 1)
+    if (viewMonth === 11) showMonth(viewYear + 1, 0)
+    else showMonth(viewYear, viewMonth + 1)
   }
 
   return (
@@ -141,7 +148,7 @@ function Calendar({
 
 export default function BarberProfile() {
   const { businessId } = useParams<{ businessId: string }>()
-  const { logout, accessToken } = useAuth()
+  const { logout, authFetch } = useAuth()
   const navigate = useNavigate()
   const { t, i18n } = useTranslation('barberq')
   const locale = i18n.language === 'pl' ? 'pl-PL' : 'en-GB'
@@ -153,6 +160,7 @@ export default function BarberProfile() {
 
   const [slotsByDate, setSlotsByDate] = useState<Map<string, Slot[]>>(new Map())
   const [loadingSlots, setLoadingSlots] = useState(false)
+  const loadedMonths = useRef<Set<string>>(new Set())
   const [selectedDate, setSelectedDate] = useState<string | null>(null)
   const [selectedSlot, setSelectedSlot] = useState<Slot | null>(null)
 
@@ -169,26 +177,57 @@ export default function BarberProfile() {
       .finally(() => setLoadingServices(false))
   }, [businessId])
 
+  // Slots are fetched one calendar month at a time, as the month is viewed
+  function loadMonth(svc: Service, year: number, month: number, revalidate = false) {
+    const key = `${svc.serviceId}:${year}-${month}`
+    if (loadedMonths.current.has(key)) return Promise.resolve()
+    loadedMonths.current.add(key)
+
+    const tomorrow = new Date()
+    tomorrow.setHours(0, 0, 0, 0)
+    tomorrow.setDate(tomorrow.getDate() + 1)
+    const firstOfMonth = new Date(year, month, 1)
+    const start = firstOfMonth < tomorrow ? tomorrow : firstOfMonth
+    const lastOfMonth = new Date(year, month + 1, 0)
+    const days = Math.round((lastOfMonth.getTime() - start.getTime()) / 86400000) + 1
+    if (days <= 0) return Promise.resolve()
+
+    const url = `/api/barbers/${businessId}/slots?serviceId=${svc.serviceId}&from=${toDateStr(start)}&days=${days}`
+    return fetch(url, revalidate ? { cache: 'no-cache' } : undefined)
+      .then((res) => res.json())
+      .then((data) => {
+        const slots: Slot[] = data.slots ?? []
+        setSlotsByDate((prev) => {
+          const map = new Map(prev)
+          for (const slot of slots) {
+            const existing = map.get(slot.date) ?? []
+            existing.push(slot)
+            map.set(slot.date, existing)
+          }
+          return map
+        })
+      })
+      .catch(() => { loadedMonths.current.delete(key) })
+  }
+
+  // A 409 means our copy of the month is stale; drop it and revalidate past the browser cache
+  function reloadMonth(svc: Service, dateStr: string) {
+    const [year, month] = dateStr.split('-').map(Number)
+    loadedMonths.current.delete(`${svc.serviceId}:${year}-${month - 1}`)
+    setSlotsByDate((prev) => new Map([...prev].filter(([date]) => !date.startsWith(dateStr.slice(0, 7)))))
+    return loadMonth(svc, year, month - 1, true)
+  }
+
   function handleSelectService(svc: Service) {
     setSelectedService(svc)
     setSlotsByDate(new Map())
+    loadedMonths.current = new Set()
     setSelectedDate(null)
     setSelectedSlot(null)
     setStep('slots')
     setLoadingSlots(true)
-    fetch(`/api/barbers/${businessId}/slots?serviceId=${svc.serviceId}`)
-      .then((res) => res.json())
-      .then((data) => {
-        const slots: Slot[] = data.slots ?? []
-        const map = new Map<string, Slot[]>()
-        for (const slot of slots) {
-          const existing = map.get(slot.date) ?? []
-          existing.push(slot)
-          map.set(slot.date, existing)
-        }
-        setSlotsByDate(map)
-      })
-      .catch(() => {})
+    const today = new Date()
+    loadMonth(svc, today.getFullYear(), today.getMonth())
       .finally(() => setLoadingSlots(false))
   }
 
@@ -203,13 +242,9 @@ export default function BarberProfile() {
     setBooking(true)
     setBookingError('')
     try {
-      const res = await fetch('/api/bookings', {
+      const res = await authFetch('/api/bookings', {
         method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-          Authorization: `Bearer ${accessToken}`,
-        },
-        credentials: 'include',
+        headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
           businessId,
           serviceId: selectedService.serviceId,
@@ -221,6 +256,7 @@ export default function BarberProfile() {
       const data = await res.json()
       if (!res.ok) {
         setBookingError(data.message || t('common.somethingWentWrong'))
+        if (res.status === 409) reloadMonth(selectedService, selectedSlot.date)
         return
       }
       setBookingId(data.bookingId)
@@ -321,16 +357,19 @@ export default function BarberProfile() {
             {step === 'slots' ? (
               loadingSlots ? (
                 <p className="text-zinc-500 text-sm">{t('barberProfile.loadingSlots')}</p>
-              ) : availableDates.size === 0 ? (
-                <p className="text-zinc-500 text-sm">{t('barberProfile.noSlots')}</p>
               ) : (
                 <div className="space-y-4">
                   <Calendar
                     availableDates={availableDates}
                     selectedDate={selectedDate}
                     onSelectDate={(d) => { setSelectedDate(d); setSelectedSlot(null) }}
+                    onViewMonth={(year, month) => selectedService && loadMonth(selectedService, year, month)}
                   />
 
+                  {availableDates.size === 0 && (
+                    <p className="text-zinc-500 text-sm">{t('barberProfile.noSlots')}</p>
+                  )}
+
                   {selectedDate && (
                     <div>
                       <p className="text-sm text-zinc-400 mb-3">
@@ -13,15 +13,43 @@ export default function Barbers() {
   const navigate = useNavigate()
   const [barbers, setBarbers] = useState<Barber[]>([])
   const [loading, setLoading] = useState(true)
+  const [search, setSearch] = useState('')
+  const [cursor, setCursor] = useState<string | null>(null)
+  const [loadingMore, setLoadingMore] = useState(false)
   const { t } = useTranslation('barberq')
 
+  function fetchBarbers(q: string, after: string | null) {
+    const params = new URLSearchParams()
+    if (q) params.set('q', q)
+    if (after) params.set('cursor', after)
+    return fetch(`/api/barbers?${params}`).then((res) => res.json())
+  }
+
+  // Debounced prefix search; the first page is replaced on every change
   useEffect(() => {
-    fetch('/api/barbers')
-      .then((res) => res.json())
-      .then((data) => setBarbers(data.barbers ?? []))
+    const timer = setTimeout(() => {
+      fetchBarbers(search.trim(), null)
+        .then((data) => {
+          setBarbers(data.barbers ?? [])
+          setCursor(data.nextCursor ?? null)
+        })
+        .catch(() => {})
+        .finally(() => setLoading(false))
+    }, 250)
+    return () => clearTimeout(timer)
+  }, [search])
+
+  function loadMore() {
+    if (!cursor) return
+    setLoadingMore(true)
+    fetchBarbers(search.trim(), cursor)
+      .then((data) => {
+        setBarbers((prev) => [...prev, ...(data.barbers ?? [])])
+        setCursor(data.nextCursor ?? null)
+      })
       .catch(() => {})
-      .finally(() => setLoading(false))
-  }, [])
+      .finally(() => setLoadingMore(false))
+  }
 
   return (
     <div className="min-h-screen px-6 py-12 max-w-3xl mx-auto">
@@ -38,7 +66,15 @@ export default function Barbers() {
       </div>
 
       <h1 className="text-3xl font-black text-white mb-2">{t('barbers.title')}</h1>
-      <p className="text-zinc-400 text-sm mb-10">{t('barbers.subtitle')}</p>
+      <p className="text-zinc-400 text-sm mb-6">{t('barbers.subtitle')}</p>
+
+      <input
+        type="search"
+        value={search}
+        onChange={(e) => setSearch(e.target.value)}
+        placeholder={t('barbers.search', 'Search by name')}
+        className="w-full bg-zinc-900 border border-zinc-800 focus:border-[#c9a84c] rounded-xl px-4 py-3 text-sm text-white placeholder-zinc-600 outline-none mb-10 transition-colors"
+      />
 
       {loading ? (
         <p className="text-zinc-500 text-sm">{t('barbers.loading')}</p>
@@ -65,6 +101,16 @@ export default function Barbers() {
           ))}
         </ul>
       )}
+
+      {cursor && (
+        <button
+          onClick={loadMore}
+          disabled={loadingMore}
+          className="mt-6 text-sm text-zinc-400 hover:text-white disabled:opacity-50 transition-colors"
+        >
+          {loadingMore ? t('barbers.loading') : t('barbers.loadMore', 'Load more')}
+        </button>
+      )}
     </div>
   )
 }
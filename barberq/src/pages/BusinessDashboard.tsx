@@ -26,45 +26,70 @@ interface Booking {
   clientId: string
 }
 
+interface PeriodTotals {
+  bookings: number
+  bookedMinutes: number
+  openMinutes: number
+  utilisation: number | null
+  revenue: number
+  cancelled: number
+}
+
 const DAY_ORDER = ['MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN']
 
 function BusinessDashboard() {
-  const { logout, accessToken } = useAuth()
+  const { logout, authFetch } = useAuth()
   const navigate = useNavigate()
   const [services, setServices] = useState<Service[]>([])
   const [loadingServices, setLoadingServices] = useState(true)
   const [availability, setAvailability] = useState<DaySchedule[]>([])
   const [bookings, setBookings] = useState<Booking[]>([])
   const [loadingBookings, setLoadingBookings] = useState(true)
+  const [bookingsCursor, setBookingsCursor] = useState<string | null>(null)
+  const [loadingMore, setLoadingMore] = useState(false)
+  const [monthTotals, setMonthTotals] = useState<PeriodTotals | null>(null)
   const { t } = useTranslation('barberq')
 
   useEffect(() => {
-    fetch('/api/services', {
-      headers: { Authorization: `Bearer ${accessToken}` },
-      credentials: 'include',
-    })
+    authFetch('/api/services')
       .then((res) => res.json())
       .then((data) => setServices(data.services ?? []))
       .catch(() => {})
       .finally(() => setLoadingServices(false))
 
-    fetch('/api/availability', {
-      headers: { Authorization: `Bearer ${accessToken}` },
-      credentials: 'include',
-    })
+    authFetch('/api/availability')
       .then((res) => res.json())
       .then((data) => setAvailability(data.schedule ?? []))
       .catch(() => {})
 
-    fetch('/api/bookings/business', {
-      headers: { Authorization: `Bearer ${accessToken}` },
-      credentials: 'include',
-    })
+    authFetch('/api/bookings/business')
       .then((res) => res.json())
-      .then((data) => setBookings(data.bookings ?? []))
+      .then((data) => {
+        setBookings(data.bookings ?? [])
+        setBookingsCursor(data.nextCursor ?? null)
+      })
       .catch(() => {})
       .finally(() => setLoadingBookings(false))
-  }, [accessToken])
+
+    // Defaults to the current month by day; only the totals are shown
+    authFetch('/api/bookings/business/stats')
+      .then((res) => (res.ok ? res.json() : null))
+      .then((data) => setMonthTotals(data?.totals ?? null))
+      .catch(() => {})
+  }, [authFetch])
+
+  function loadMoreBookings() {
+    if (!bookingsCursor) return
+    setLoadingMore(true)
+    authFetch(`/api/bookings/business?cursor=${encodeURIComponent(bookingsCursor)}`)
+      .then((res) => res.json())
+      .then((data) => {
+        setBookings((prev) => [...prev, ...(data.bookings ?? [])])
+        setBookingsCursor(data.nextCursor ?? null)
+      })
+      .catch(() => {})
+      .finally(() => setLoadingMore(false))
+  }
 
   return (
     <div className="min-h-screen bg-zinc-950 text-white">
@@ -85,6 +110,29 @@ function BusinessDashboard() {
       <main className="max-w-4xl mx-auto px-6 py-12 space-y-10">
         <h1 className="text-3xl font-black">{t('dashboard.title')}</h1>
 
+        {/* This month's stats section */}
+        {monthTotals && (
+          <section className="bg-zinc-900 border border-zinc-800 rounded-2xl p-8">
+            <h2 className="text-xl font-bold mb-6">{t('dashboard.thisMonth', 'This month')}</h2>
+            <dl className="grid grid-cols-2 sm:grid-cols-4 gap-6">
+              {[
+                [t('dashboard.statsBookings', 'Bookings'), String(monthTotals.bookings)],
+                [
+                  t('dashboard.statsUtilisation', 'Booked hours'),
+                  monthTotals.utilisation === null ? '–' : `${Math.round(monthTotals.utilisation * 100)}%`,
+                ],
+                [t('dashboard.statsRevenue', 'Revenue'), `€${monthTotals.revenue.toFixed(2)}`],
+                [t('dashboard.statsCancelled', 'Cancelled'), String(monthTotals.cancelled)],
+              ].map(([label, value]) => (
+                <div key={label}>
+                  <dt className="text-zinc-500 text-sm">{label}</dt>
+                  <dd className="text-2xl font-bold text-[#c9a84c]">{value}</dd>
+                </div>
+              ))}
+            </dl>
+          </section>
+        )}
+
         {/* Services section */}
         <section className="bg-zinc-900 border border-zinc-800 rounded-2xl p-8">
           <div className="flex items-center justify-between mb-6">
@@ -138,6 +186,16 @@ function BusinessDashboard() {
               ))}
             </ul>
           )}
+
+          {bookingsCursor && (
+            <button
+              onClick={loadMoreBookings}
+              disabled={loadingMore}
+              className="mt-4 text-sm text-zinc-400 hover:text-white disabled:opacity-50 transition-colors"
+            >
+              {loadingMore ? t('dashboard.loading') : t('dashboard.loadMore', 'Load more')}
+            </button>
+          )}
         </section>
 
         {/* Availability section */}
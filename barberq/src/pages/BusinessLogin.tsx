@@ -26,7 +26,7 @@ export default function BusinessLogin() {
       })
       const data = await res.json()
       if (!res.ok) { setError(data.message ?? t('common.somethingWentWrong')); return }
-      login(data.accessToken)
+      login(data.accessToken, 'business', data.expiresIn)
       navigate('/barberq/dashboard/business')
     } catch {
       setError(t('common.somethingWentWrong'))
@@ -35,17 +35,14 @@ const TIME_OPTIONS = generateTimeOptions()
 
 function SetAvailability() {
   const navigate = useNavigate()
-  const { accessToken } = useAuth()
+  const { authFetch } = useAuth()
   const [schedule, setSchedule] = useState<DaySchedule[]>(DEFAULT_DAYS)
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState('')
   const { t } = useTranslation('barberq')
 
   useEffect(() => {
-    fetch('/api/availability', {
-      headers: { Authorization: `Bearer ${accessToken}` },
-      credentials: 'include',
-    })
+    authFetch('/api/availability')
       .then((res) => res.json())
       .then((data) => {
         const saved: { day: string; startTime: string; endTime: string; isAvailable: boolean }[] =
@@ -59,7 +56,7 @@ function SetAvailability() {
         )
       })
       .catch(() => {})
-  }, [accessToken])
+  }, [authFetch])
 
   const updateDay = (index: number, patch: Partial<DaySchedule>) => {
     setSchedule((prev) => prev.map((d, i) => (i === index ? { ...d, ...patch } : d)))
@@ -69,13 +66,9 @@ function SetAvailability() {
     setError('')
     setLoading(true)
     try {
-      const res = await fetch('/api/availability', {
+      const res = await authFetch('/api/availability', {
         method: 'PUT',
-        headers: {
-          'Content-Type': 'application/json',
-          Authorization: `Bearer ${accessToken}`,
-        },
-        credentials: 'include',
+        headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
           schedule: schedule.map(({ day, startTime, endTime, isAvailable }) => ({
             day,
@@ -0,0 +1,138 @@
+import base64
+import json
+import time
+
+import pytest
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+from barberq_common import auth
+
+REGION = "eu-north-1"
+POOL_ID = "eu-north-1_pool"
+CLIENT_ID = "app-client"
+ISSUER = f"https://cognito-idp.{REGION}.amazonaws.com/{POOL_ID}"
+
+KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+OTHER_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def make_token(kid="k1", alg="RS256", key=KEY, **claims) -> str:
+    payload = {
+        "sub": "user-1",
+        "iss": ISSUER,
+        "token_use": "access",
+        "client_id": CLIENT_ID,
+        "exp": time.time() + 3600,
+        **claims,
+    }
+    header = b64url(json.dumps({"alg": alg, "kid": kid}).encode())
+    body = b64url(json.dumps(payload).encode())
+    signature = key.sign(f"{header}.{body}".encode(), padding.PKCS1v15(), hashes.SHA256())
+    return f"{header}.{body}.{b64url(signature)}"
+
+
+@pytest.fixture
+def verifier(monkeypatch):
+    v = auth.TokenVerifier(REGION, POOL_ID, CLIENT_ID)
+    numbers = KEY.public_key().public_numbers()
+    v.keys = {"k1": (numbers.n, numbers.e)}
+    v.keys_fetched_at = time.time()
+
+    def no_jwks_fetch():
+        raise AssertionError("JWKS fetched")
+
+    # Recently fetched keys are not refetched for an unknown kid
+    monkeypatch.setattr(v, "_refresh_keys", no_jwks_fetch)
+    return v
+
+
+def test_valid_token_returns_its_claims(verifier):
+    claims = verifier.verify(make_token())
+    assert claims["sub"] == "user-1"
+    assert claims["client_id"] == CLIENT_ID
+
+
+def test_verified_claims_are_cached(verifier):
+    token = make_token()
+    assert verifier.verify(token) is verifier.verify(token)
+
+
+def test_expired_token_is_rejected(verifier):
+    with pytest.raises(auth.InvalidToken, match="expired"):
+        verifier.verify(make_token(exp=time.time() - 1))
+
+
+def test_cached_token_is_rejected_once_expired(verifier, monkeypatch):
+    token = make_token(exp=time.time() + 60)
+    verifier.verify(token)
+    later = time.time() + 120
+    monkeypatch.setattr(auth.time, "time", lambda: later)
+    with pytest.raises(auth.InvalidToken, match="expired"):
+        verifier.verify(token)
+
+
+def test_unknown_kid_is_rejected(verifier):
+    with pytest.raises(auth.InvalidToken, match="Unknown signing key"):
+        verifier.verify(make_token(kid="k2"))
+
+
+@pytest.mark.parametrize("alg", ["HS256", "none", "RS512"])
+def test_other_algorithms_are_rejected(verifier, alg):
+    with pytest.raises(auth.InvalidToken, match="Unsupported algorithm"):
+        verifier.verify(make_token(alg=alg))
+
+
+@pytest.mark.parametrize("kid, alg", [(["k1"], "RS256"), ("k1", ["RS256"]), (None, "RS256")])
+def test_non_string_header_fields_are_rejected(verifier, kid, alg):
+    with pytest.raises(auth.InvalidToken, match="Malformed token header"):
+        verifier.verify(make_token(kid=kid, alg=alg))
+
+
+def test_wrong_issuer_is_rejected(verifier):
+    with pytest.raises(auth.InvalidToken, match="another user pool"):
+        verifier.verify(make_token(iss=f"https://cognito-idp.{REGION}.amazonaws.com/eu-north-1_other"))
+
+
+def test_wrong_client_id_is_rejected(verifier):
+    with pytest.raises(auth.InvalidToken, match="another app client"):
+        verifier.verify(make_token(client_id="other-client"))
+
+
+def test_id_token_is_rejected(verifier):
+    with pytest.raises(auth.InvalidToken, match="Not an access token"):
+        verifier.verify(make_token(token_use="id"))
+
+
+def test_tampered_payload_is_rejected(verifier):
+    header, _, signature = make_token().split(".")
+    forged = b64url(json.dumps({
+        "sub": "someone-else", "iss": ISSUER, "token_use": "access",
+        "client_id": CLIENT_ID, "exp": time.time() + 3600,
+    }).encode())
+    with pytest.raises(auth.InvalidToken, match="Bad signature"):
+        verifier.verify(f"{header}.{forged}.{signature}")
+
+
+def test_signature_from_another_key_is_rejected(verifier):
+    with pytest.raises(auth.InvalidToken, match="Bad signature"):
+        verifier.verify(make_token(key=OTHER_KEY))
+
+
+@pytest.mark.parametrize("token", ["", "abc", "a.b", "a.b.c", "e30.e30.", "W10.e30.AA"])
+def test_malformed_tokens_are_rejected(verifier, token):
+    with pytest.raises(auth.InvalidToken):
+        verifier.verify(token)
+
+
+def test_extract_sub_fails_closed(monkeypatch, verifier):
+    monkeypatch.setitem(auth._verifiers, auth.BUSINESS, verifier)
+    good = {"headers": {"Authorization": f"Bearer {make_token()}"}}
+    forged = {"headers": {"Authorization": f"Bearer {make_token(key=OTHER_KEY)}"}}
+    assert auth.extract_sub(good, auth.BUSINESS) == "user-1"
+    assert auth.extract_sub(forged, auth.BUSINESS) is None
+    assert auth.extract_sub({"headers": {}}, auth.BUSINESS) is None
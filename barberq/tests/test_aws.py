@@ -0,0 +1,42 @@
+import threading
+
+import pytest
+
+from barberq_common import aws
+
+
+@pytest.fixture
+def cold_session(monkeypatch):
+    monkeypatch.setattr(aws, "_session", None)
+    monkeypatch.setattr(aws, "_session_hooks", [])
+    monkeypatch.setattr(aws, "_clients", {})
+    monkeypatch.setattr(aws, "_lock", threading.Lock())
+
+
+def run_with_timeout(fn, seconds=10):
+    result = {}
+    worker = threading.Thread(target=lambda: result.setdefault("value", fn()), daemon=True)
+    worker.start()
+    worker.join(seconds)
+    assert not worker.is_alive(), "call did not return; aws._lock is probably held re-entrantly"
+    return result["value"]
+
+
+def test_client_builds_session_on_first_use(cold_session):
+    # The first client of a container also creates the session, which takes the same lock
+    c = run_with_timeout(lambda: aws.client("dynamodb"))
+    assert c is aws.client("dynamodb")
+    assert aws._session is not None
+
+
+def test_lazy_client_builds_nothing_until_used(cold_session):
+    lazy = aws.lazy_client("cognito-idp")
+    assert aws._session is None
+    assert run_with_timeout(lambda: lazy.meta).service_model.service_name == "cognito-idp"
+
+
+def test_session_hooks_run_before_clients(cold_session):
+    seen = []
+    aws.on_session(lambda s: seen.append(s))
+    run_with_timeout(lambda: aws.client("dynamodb"))
+    assert seen == [aws._session]
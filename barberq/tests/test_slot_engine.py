@@ -0,0 +1,116 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from barberq_common.slot_engine import DAY_KEYS, MINUTES_PER_DAY, Horizon, to_minutes
+
+MONDAY = date(2027, 3, 1)
+
+
+def brute_force_slots(first_day, days, weekly, busy, overrides, duration, step):
+    """Every slot, checked minute by minute against the working and busy intervals."""
+    slots = []
+    for i in range(days):
+        day = first_day + timedelta(days=i)
+        date_str = day.strftime("%Y-%m-%d")
+        intervals = overrides[date_str] if date_str in overrides else weekly.get(DAY_KEYS[day.weekday()], [])
+        working = set()
+        for start, end in intervals:
+            working.update(range(start, end))
+        for start, end in busy.get(date_str, []):
+            working.difference_update(range(start, end))
+        starts = sorted({t for start, end in intervals for t in range(start, end, step)})
+        for t in starts:
+            if t + duration <= MINUTES_PER_DAY and all(m in working for m in range(t, t + duration)):
+                slots.append((date_str, t, t + duration))
+    return slots
+
+
+def engine_slots(first_day, days, weekly, busy, overrides, duration, step):
+    horizon = Horizon(first_day, days, weekly, busy, overrides)
+    return [
+        (s["date"], to_minutes(s["startTime"]), to_minutes(s["endTime"]))
+        for s in horizon.slots(duration, step)
+    ]
+
+
+def random_intervals(rng, count, grid=5):
+    """Sorted, possibly touching (never overlapping) intervals on the grid."""
+    cuts = sorted(rng.sample(range(0, MINUTES_PER_DAY // grid + 1), count * 2))
+    return [(cuts[i] * grid, cuts[i + 1] * grid) for i in range(0, len(cuts), 2)]
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    days = rng.randint(1, 9)
+    weekly = {day: random_intervals(rng, rng.randint(0, 3)) for day in DAY_KEYS if rng.random() < 0.8}
+    busy, overrides = {}, {}
+    for i in range(days):
+        date_str = (MONDAY + timedelta(days=i)).strftime("%Y-%m-%d")
+        if rng.random() < 0.3:
+            overrides[date_str] = random_intervals(rng, rng.randint(0, 2))
+        # Busy intervals may overlap each other and stick out of the working hours
+        busy[date_str] = [
+            (start, min(start + rng.choice((5, 15, 30, 60, 90)), MINUTES_PER_DAY))
+            for start in (rng.randrange(0, MINUTES_PER_DAY, 5) for _ in range(rng.randint(0, 6)))
+        ]
+    duration = rng.choice((5, 15, 30, 45, 60, 90, 240))
+    step = rng.choice((None, 5, 15, 30))
+
+    expected = brute_force_slots(MONDAY, days, weekly, busy, overrides, duration, step or duration)
+    assert engine_slots(MONDAY, days, weekly, busy, overrides, duration, step) == expected
+
+
+def test_bookings_touching_a_slot_leave_it_free():
+    weekly = {"MON": [(540, 720)]}
+    busy = {"2027-03-01": [(540, 600), (660, 720)]}
+    assert engine_slots(MONDAY, 1, weekly, busy, {}, 60, None) == [("2027-03-01", 600, 660)]
+
+
+def test_touching_working_intervals_form_one_run():
+    weekly = {"MON": [(540, 600), (600, 660)]}
+    assert engine_slots(MONDAY, 1, weekly, {}, {}, 120, None) == [("2027-03-01", 540, 660)]
+
+
+def test_slot_can_end_at_midnight_but_not_cross_it():
+    weekly = {"MON": [(1380, MINUTES_PER_DAY)], "TUE": [(0, 60)]}
+    assert engine_slots(MONDAY, 2, weekly, {}, {}, 60, None) == [
+        ("2027-03-01", 1380, 1440),
+        ("2027-03-02", 0, 60),
+    ]
+    assert engine_slots(MONDAY, 2, weekly, {}, {}, 90, 30) == []
+    horizon = Horizon(MONDAY, 2, weekly)
+    assert horizon.slots(60)[0]["endTime"] == "24:00"
+
+
+def test_busy_interval_past_midnight_leaves_the_next_day_alone():
+    weekly = {"MON": [(1320, MINUTES_PER_DAY)], "TUE": [(0, 120)]}
+    busy = {"2027-03-01": [(1410, 1500)]}
+    assert engine_slots(MONDAY, 2, weekly, busy, {}, 30, None) == [
+        ("2027-03-01", 1320, 1350),
+        ("2027-03-01", 1350, 1380),
+        ("2027-03-01", 1380, 1410),
+        ("2027-03-02", 0, 30),
+        ("2027-03-02", 30, 60),
+        ("2027-03-02", 60, 90),
+        ("2027-03-02", 90, 120),
+    ]
+
+
+def test_overrides_replace_weekly_hours():
+    weekly = {"MON": [(540, 1020)], "TUE": [(540, 1020)]}
+    overrides = {"2027-03-01": [(600, 660)], "2027-03-02": []}
+    assert engine_slots(MONDAY, 2, weekly, {}, overrides, 60, None) == [("2027-03-01", 600, 660)]
+
+
+def test_fits_agrees_with_slots():
+    weekly = {"MON": [(540, 720)]}
+    busy = {"2027-03-01": [(600, 630)]}
+    horizon = Horizon(MONDAY, 1, weekly, busy)
+    assert horizon.fits(MONDAY, 540, 60)
+    assert not horizon.fits(MONDAY, 570, 60)
+    assert horizon.fits(MONDAY, 630, 90)
+    assert not horizon.fits(MONDAY, 630, 95)
+    assert not horizon.fits(MONDAY + timedelta(days=1), 540, 30)
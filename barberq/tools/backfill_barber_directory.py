@@ -0,0 +1,50 @@
+"""Copy existing business users from Cognito into the barber directory table.
+
+New businesses are added by the post-confirmation trigger; run this once for
+accounts confirmed before the trigger existed:
+
+    python tools/backfill_barber_directory.py --pool-id eu-north-1_XXXX --table barberq-barbers
+"""
+import argparse
+import os
+import sys
+
+import boto3
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lambdas", "layer", "python"))
+
+from barberq_common.directory import directory_item  # noqa: E402
+
+
+def user_item(user: dict) -> dict:
+    attributes = {a["Name"]: a["Value"] for a in user["Attributes"]}
+    business_id = user["Username"]
+    email = attributes.get("email", business_id)
+    name = attributes.get("custom:business_name") or email
+    return directory_item(business_id, name, email, attributes.get("name"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pool-id", required=True, help="business user pool ID")
+    parser.add_argument("--table", default="barberq-barbers")
+    args = parser.parse_args()
+
+    cognito = boto3.client("cognito-idp")
+    table = boto3.resource("dynamodb").Table(args.table)
+
+    count = 0
+    paginator = cognito.get_paginator("list_users")
+    with table.batch_writer() as batch:
+        for page in paginator.paginate(UserPoolId=args.pool_id):
+            for user in page["Users"]:
+                if user.get("UserStatus") != "CONFIRMED":
+                    continue
+                batch.put_item(Item=user_item(user))
+                count += 1
+
+    print(f"wrote {count} directory entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Backfill the index keys on existing bookings with a parallel segmented scan.
+
+Every booking needs statusSlot = "<status>#<date>#<startTime>" to show up in
+businessId-statusSlot-index, and slot = "<date>#<startTime>" to show up in
+clientId-slot-index. Bookings written when they expired at their end time
+also get the later TTL that keeps them BOOKING_HISTORY_DAYS for the
+client's history. Each scan segment runs on its own thread and records its
+LastEvaluatedKey in a checkpoint file after every page, so an interrupted
+run picks up where it stopped:
+
+    python tools/backfill_booking_keys.py --table barberq-bookings --segments 16
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+import boto3
+from botocore.exceptions import ClientError
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lambdas", "layer", "python"))
+
+from barberq_common.booking_writes import booking_ttl  # noqa: E402
+
+DONE = "done"
+
+
+class Checkpoint:
+    """Per-segment scan positions, persisted after each page."""
+
+    def __init__(self, path: str, total_segments: int):
+        self.path = path
+        self.lock = threading.Lock()
+        self.state = {"totalSegments": total_segments, "segments": {}}
+        if os.path.exists(path):
+            with open(path) as f:
+                saved = json.load(f)
+            if saved["totalSegments"] != total_segments:
+                raise SystemExit(
+                    f"{path} was written with --segments {saved['totalSegments']}; "
+                    "resume with the same value or delete the checkpoint."
+                )
+            self.state = saved
+
+    def position(self, segment: int):
+        return self.state["segments"].get(str(segment))
+
+    def save(self, segment: int, position) -> None:
+        with self.lock:
+            self.state["segments"][str(segment)] = position
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.state, f, default=lambda v: int(v) if isinstance(v, Decimal) else str(v))
+            os.replace(tmp, self.path)
+
+
+def status_slot(item: dict) -> str:
+    return f"{item['status']}#{item['date']}#{item['startTime']}"
+
+
+def slot(item: dict) -> str:
+    return f"{item['date']}#{item['startTime']}"
+
+
+def backfill_segment(table_name: str, segment: int, total: int, checkpoint: Checkpoint, dry_run: bool) -> dict:
+    # Resources are not thread-safe, so each worker builds its own
+    table = boto3.session.Session().resource("dynamodb").Table(table_name)
+    stats = {"scanned": 0, "updated": 0, "changed": 0}
+
+    start_key = checkpoint.position(segment)
+    if start_key == DONE:
+        return stats
+
+    kwargs = {
+        "Segment": segment,
+        "TotalSegments": total,
+        "ProjectionExpression": "businessId, bookingId, #d, startTime, endTime, #s, statusSlot, slot, #t",
+        "ExpressionAttributeNames": {"#d": "date", "#s": "status", "#t": "ttl"},
+    }
+    if start_key:
+        kwargs["ExclusiveStartKey"] = start_key
+
+    while True:
+        page = table.scan(**kwargs)
+        for item in page.get("Items", []):
+            stats["scanned"] += 1
+            if not all(k in item for k in ("status", "date", "startTime")):
+                continue
+            expected = status_slot(item)
+            expected_slot = slot(item)
+            ttl = booking_ttl(item["date"], item["endTime"]) if "endTime" in item else None
+            extend_ttl = ttl is not None and "ttl" in item and item["ttl"] < ttl
+            if item.get("statusSlot") == expected and item.get("slot") == expected_slot and not extend_ttl:
+                continue
+            stats["updated"] += 1
+            if dry_run:
+                continue
+            update = "SET statusSlot = :status_slot, slot = :slot"
+            names = {"#s": "status", "#d": "date"}
+            values = {
+                ":status_slot": expected,
+                ":slot": expected_slot,
+                ":status": item["status"],
+                ":date": item["date"],
+                ":start_time": item["startTime"],
+            }
+            if extend_ttl:
+                update += ", #t = :ttl"
+                names["#t"] = "ttl"
+                values[":ttl"] = ttl
+            try:
+                table.update_item(
+                    Key={"businessId": item["businessId"], "bookingId": item["bookingId"]},
+                    UpdateExpression=update,
+                    # The keys are built from what the scan read, so only write them if it still holds
+                    ConditionExpression="#s = :status AND #d = :date AND startTime = :start_time",
+                    ExpressionAttributeNames=names,
+                    ExpressionAttributeValues=values,
+                )
+            except ClientError as e:
+                # Deleted, expired or changed since the scan read it
+                if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                    raise
+                stats["updated"] -= 1
+                stats["changed"] += 1
+
+        last_key = page.get("LastEvaluatedKey")
+        if not dry_run:
+            checkpoint.save(segment, last_key or DONE)
+        if not last_key:
+            return stats
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--table", default="barberq-bookings")
+    parser.add_argument("--segments", type=int, default=8)
+    parser.add_argument("--checkpoint", default="backfill_booking_keys.checkpoint.json")
+    parser.add_argument("--dry-run", action="store_true", help="count items that need updating without writing")
+    args = parser.parse_args()
+
+    checkpoint = Checkpoint(args.checkpoint, args.segments)
+    with ThreadPoolExecutor(max_workers=args.segments) as pool:
+        futures = [
+            pool.submit(backfill_segment, args.table, segment, args.segments, checkpoint, args.dry_run)
+            for segment in range(args.segments)
+        ]
+        results = [f.result() for f in futures]
+
+    scanned = sum(r["scanned"] for r in results)
+    updated = sum(r["updated"] for r in results)
+    changed = sum(r["changed"] for r in results)
+    verb = "would update" if args.dry_run else "updated"
+    print(f"scanned {scanned} bookings, {verb} {updated}")
+    if changed:
+        print(f"skipped {changed} that changed mid-run; delete the checkpoint and re-run to cover them")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Write slot-lock items for confirmed bookings made before the locks existed.
+
+create_booking's lock transaction is its only overlap check, so upcoming
+bookings without locks can be double-booked. Run this once after the deploy
+that adds barberq-slot-locks, before taking bookings on it:
+
+    python tools/backfill_slot_locks.py --bookings barberq-bookings --locks barberq-slot-locks --segments 16
+
+Each lock put only succeeds if the block is free or already held by the same
+booking, so re-running is safe. A block held by a different booking means
+two existing bookings overlap; those are printed and left for a person to
+resolve. Scan positions are checkpointed per segment, as in
+backfill_booking_keys.py.
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import boto3
+from botocore.exceptions import ClientError
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lambdas", "layer", "python"))
+
+from backfill_booking_keys import DONE, Checkpoint  # noqa: E402
+from barberq_common.booking_writes import end_ttl, lock_slots  # noqa: E402
+from barberq_common.slot_engine import to_minutes  # noqa: E402
+
+
+def backfill_segment(bookings_name: str, locks_name: str, segment: int, total: int,
+                     checkpoint: Checkpoint, dry_run: bool) -> dict:
+    # Resources are not thread-safe, so each worker builds its own
+    dynamodb = boto3.session.Session().resource("dynamodb")
+    bookings = dynamodb.Table(bookings_name)
+    locks = dynamodb.Table(locks_name)
+    stats = {"bookings": 0, "locks": 0, "clashes": []}
+
+    start_key = checkpoint.position(segment)
+    if start_key == DONE:
+        return stats
+
+    kwargs = {
+        "Segment": segment,
+        "TotalSegments": total,
+        "ProjectionExpression": "businessId, bookingId, #d, startTime, endTime",
+        "FilterExpression": "#s = :confirmed AND #d >= :today",
+        "ExpressionAttributeNames": {"#d": "date", "#s": "status"},
+        "ExpressionAttributeValues": {":confirmed": "confirmed", ":today": date.today().isoformat()},
+    }
+    if start_key:
+        kwargs["ExclusiveStartKey"] = start_key
+
+    while True:
+        page = bookings.scan(**kwargs)
+        for item in page.get("Items", []):
+            stats["bookings"] += 1
+            for slot in lock_slots(item["date"], to_minutes(item["startTime"]), to_minutes(item["endTime"])):
+                if dry_run:
+                    stats["locks"] += 1
+                    continue
+                try:
+                    locks.put_item(
+                        Item={
+                            "businessId": item["businessId"],
+                            "slot": slot,
+                            "bookingId": item["bookingId"],
+                            "ttl": end_ttl(item["date"], item["endTime"]),
+                        },
+                        ConditionExpression="attribute_not_exists(slot) OR bookingId = :booking_id",
+                        ExpressionAttributeValues={":booking_id": item["bookingId"]},
+                    )
+                except ClientError as e:
+                    if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                        raise
+                    stats["clashes"].append((item["businessId"], slot, item["bookingId"]))
+                    continue
+                stats["locks"] += 1
+
+        last_key = page.get("LastEvaluatedKey")
+        if not dry_run:
+            checkpoint.save(segment, last_key or DONE)
+        if not last_key:
+            return stats
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bookings", default="barberq-bookings")
+    parser.add_argument("--locks", default="barberq-slot-locks")
+    parser.add_argument("--segments", type=int, default=8)
+    parser.add_argument("--checkpoint", default="backfill_slot_locks.checkpoint.json")
+    parser.add_argument("--dry-run", action="store_true", help="count bookings and locks without writing")
+    args = parser.parse_args()
+
+    checkpoint = Checkpoint(args.checkpoint, args.segments)
+    with ThreadPoolExecutor(max_workers=args.segments) as pool:
+        futures = [
+            pool.submit(backfill_segment, args.bookings, args.locks, segment, args.segments, checkpoint, args.dry_run)
+            for segment in range(args.segments)
+        ]
+        results = [f.result() for f in futures]
+
+    for r in results:
+        for business_id, slot, booking_id in r["clashes"]:
+            print(f"clash: {business_id} {slot} is held by another booking than {booking_id}")
+    bookings = sum(r["bookings"] for r in results)
+    locks = sum(r["locks"] for r in results)
+    verb = "would write" if args.dry_run else "wrote"
+    print(f"{bookings} upcoming bookings, {verb} {locks} locks")
+
+
+if __name__ == "__main__":
+    main()
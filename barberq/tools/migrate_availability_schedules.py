@@ -0,0 +1,97 @@
+"""Copy per-weekday availability rows into one schedules item per business.
+
+Each business's working days become its weekly hours (one interval per
+day, as minute offsets) with no date overrides. Businesses that already
+saved a schedule are left alone, so the script can be re-run safely:
+
+    python tools/migrate_availability_schedules.py --source barberq-availability --target barberq-schedules
+
+Slot locks need hours on the LOCK_BLOCK_MINUTES grid. A business with any
+working day off that grid, or with an unreadable time, is not migrated; it
+is printed so its hours can be fixed before a re-run.
+"""
+import argparse
+import os
+import sys
+from collections import defaultdict
+
+import boto3
+from botocore.exceptions import ClientError
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lambdas", "layer", "python"))
+
+from barberq_common.booking_writes import LOCK_BLOCK_MINUTES  # noqa: E402
+from barberq_common.slot_engine import MINUTES_PER_DAY, to_minutes  # noqa: E402
+
+
+def schedule_item(business_id: str, rows: list) -> dict:
+    """The schedules item for a business's rows; raises ValueError naming a day that is off the grid."""
+    weekly = {}
+    for row in rows:
+        if not row.get("isAvailable"):
+            continue
+        try:
+            start, end = to_minutes(row["startTime"]), to_minutes(row["endTime"])
+        except (KeyError, ValueError):
+            raise ValueError(f"{row['day']} has unreadable hours")
+        if not 0 <= start <= MINUTES_PER_DAY or not 0 <= end <= MINUTES_PER_DAY:
+            raise ValueError(f"{row['day']} has unreadable hours")
+        if start % LOCK_BLOCK_MINUTES or end % LOCK_BLOCK_MINUTES:
+            raise ValueError(f"{row['day']} {row['startTime']}-{row['endTime']} is off the {LOCK_BLOCK_MINUTES}-minute grid")
+        if start < end:
+            weekly[row["day"]] = [start, end]
+    return {"businessId": business_id, "version": 1, "weekly": weekly, "overrides": {}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", default="barberq-availability")
+    parser.add_argument("--target", default="barberq-schedules")
+    parser.add_argument("--dry-run", action="store_true", help="count businesses without writing")
+    args = parser.parse_args()
+
+    dynamodb = boto3.resource("dynamodb")
+    source = dynamodb.Table(args.source)
+    target = dynamodb.Table(args.target)
+
+    rows = defaultdict(list)
+    kwargs = {}
+    while True:
+        page = source.scan(**kwargs)
+        for row in page.get("Items", []):
+            rows[row["businessId"]].append(row)
+        if "LastEvaluatedKey" not in page:
+            break
+        kwargs["ExclusiveStartKey"] = page["LastEvaluatedKey"]
+
+    written = skipped = 0
+    rejected = []
+    for business_id, business_rows in rows.items():
+        try:
+            item = schedule_item(business_id, business_rows)
+        except ValueError as e:
+            rejected.append((business_id, str(e)))
+            continue
+        if args.dry_run:
+            continue
+        try:
+            target.put_item(
+                Item=item,
+                ConditionExpression="attribute_not_exists(businessId)",
+            )
+            written += 1
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+            skipped += 1
+
+    for business_id, reason in rejected:
+        print(f"not migrated: {business_id}: {reason}")
+    if args.dry_run:
+        print(f"would migrate {len(rows) - len(rejected)} businesses, {len(rejected)} need their hours fixed")
+    else:
+        print(f"migrated {written} businesses, {skipped} already had a schedule, {len(rejected)} need their hours fixed")
+
+
+if __name__ == "__main__":
+    main()